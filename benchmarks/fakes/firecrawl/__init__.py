@@ -0,0 +1,168 @@
+"""stand-in for the firecrawl SDK used by benchmarks/pipeline.py
+
+put benchmarks/fakes first on PYTHONPATH and `from firecrawl import Firecrawl`
+returns this client. every URL gets its own deterministic posting (so postings
+are not near-duplicates of each other) wrapped in the navigation and legal
+boilerplate a real job board adds. FAKE_FIRECRAWL_MS sets the scrape latency;
+batch scrapes run FAKE_FIRECRAWL_BATCH_CONCURRENCY postings at a time, and
+status responses hold FAKE_FIRECRAWL_PAGE_SIZE postings with the rest behind
+`next`, as the real endpoint pages large results
+"""
+
+import hashlib
+import itertools
+import os
+import random
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlsplit
+
+WORDS = (
+    "design build ship maintain scalable backend services python go kubernetes "
+    "postgres kafka redis mentor review code write tests deploy monitor incidents "
+    "customers product roadmap features reliability latency data pipelines apis "
+    "graphql security documentation collaborate stakeholders frontend react "
+    "typescript cloud aws infrastructure observability experiments analytics"
+).split()
+
+HEADER = """[Jobs](https://board.example/jobs) | [Companies](https://board.example/c) | [Sign in](https://board.example/login)
+
+![logo](https://board.example/logo.png)
+
+Apply now
+Share this job
+"""
+
+FOOTER = """
+## Benefits
+
+- Health, dental and vision
+- Flexible time off
+- Learning stipend
+
+## Equal Opportunity
+
+We are an equal opportunity employer and consider applicants without regard to race, sex, age or any other protected characteristic. Reasonable accommodation is available on request.
+
+[Privacy policy](https://board.example/privacy) | [Terms of use](https://board.example/terms) | [Cookie settings](https://board.example/cookies)
+"""
+
+
+def posting(url: str) -> str:
+    seed = int(hashlib.md5(url.encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+
+    def bullet() -> str:
+        return "- " + " ".join(rng.choice(WORDS) for _ in range(14)).capitalize()
+
+    team = rng.choice(["Platform", "Payments", "Search", "Data", "Growth"])
+    sections = [f"# Software Engineer Intern, {team}", f"Posting {seed:08x}"]
+    for heading in ("About the role", "Responsibilities", "Requirements"):
+        sections.append(f"## {heading}")
+        sections.extend(bullet() for _ in range(8))
+    sections.append("## Nice to have")
+    sections.extend(bullet() for _ in range(4))
+    return HEADER + "\n" + "\n".join(sections) + "\n" + FOOTER
+
+
+API_URL = "https://api.firecrawl.dev"
+
+
+def _doc(url: str) -> dict:
+    return {"markdown": posting(url), "metadata": {"sourceURL": url}}
+
+
+class _Response:
+    def __init__(self, body: dict) -> None:
+        self.ok = True
+        self.status_code = 200
+        self._body = body
+
+    def json(self) -> dict:
+        return self._body
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _HttpClient:
+    """the one raw GET the app makes: `next` pages of a batch status"""
+
+    def __init__(self, client: "Firecrawl") -> None:
+        self.client = client
+        self.api_url = API_URL
+
+    def get(self, endpoint, **kwargs):
+        parts = urlsplit(endpoint)
+        job_id = parts.path.rsplit("/", 1)[-1]
+        skip = int(dict(parse_qsl(parts.query)).get("skip", 0))
+        done, more = self.client._page(job_id, skip)
+        return _Response(
+            {"success": True, "data": [_doc(url) for url in done], "next": more}
+        )
+
+
+class Firecrawl:
+    def __init__(self, api_key=None, **kwargs) -> None:
+        self.api_key = api_key
+        # like the real SDK, the raw HTTP client is only on the v2 proxy
+        self.v2 = SimpleNamespace(http_client=_HttpClient(self))
+
+    def scrape(self, url, formats=None, only_main_content=True, **kwargs):
+        time.sleep(float(os.environ.get("FAKE_FIRECRAWL_MS", "100")) / 1000)
+        return SimpleNamespace(markdown=posting(url), metadata={"sourceURL": url})
+
+    # batch scrape: postings finish in waves of the batch concurrency and show
+    # up in status polls once done, like the real endpoint
+
+    _ids = itertools.count(1)
+    _jobs: dict = {}
+
+    def start_batch_scrape(self, urls, formats=None, only_main_content=True, **kwargs):
+        job_id = f"batch-{next(self._ids)}"
+        self._jobs[job_id] = (time.monotonic(), list(urls))
+        return SimpleNamespace(id=job_id, url=None, invalid_urls=[])
+
+    def _finished(self, job_id):
+        started, urls = self._jobs[job_id]
+        latency = float(os.environ.get("FAKE_FIRECRAWL_MS", "100")) / 1000
+        waves = int(os.environ.get("FAKE_FIRECRAWL_BATCH_CONCURRENCY", "10"))
+        elapsed = time.monotonic() - started
+        return [
+            url for i, url in enumerate(urls) if elapsed >= (i // waves + 1) * latency
+        ]
+
+    def _page(self, job_id, skip):
+        """finished urls from `skip` on, one page of them, and the next link"""
+        size = int(os.environ.get("FAKE_FIRECRAWL_PAGE_SIZE", "8"))
+        done = self._finished(job_id)
+        more = None
+        if len(done) > skip + size:
+            more = f"{API_URL}/v2/batch/scrape/{job_id}?skip={skip + size}"
+        return done[skip : skip + size], more
+
+    def get_batch_scrape_status(self, job_id):
+        _, urls = self._jobs[job_id]
+        completed = len(self._finished(job_id))
+        page, more = self._page(job_id, 0)
+        return SimpleNamespace(
+            status="completed" if completed == len(urls) else "scraping",
+            completed=completed,
+            total=len(urls),
+            next=more,
+            data=[SimpleNamespace(**_doc(url)) for url in page],
+        )
+
+    def cancel_batch_scrape(self, job_id):
+        return self._jobs.pop(job_id, None) is not None
+
+    def batch_scrape(self, urls, poll_interval=2, **kwargs):
+        job = self.start_batch_scrape(urls, **kwargs)
+        while True:
+            status = self.get_batch_scrape_status(job.id)
+            if status.status == "completed":
+                # the SDK's waiter collects every page
+                status.data = [SimpleNamespace(**_doc(url)) for url in urls]
+                status.next = None
+                return status
+            time.sleep(min(poll_interval, 0.05))
@@ -0,0 +1,407 @@
+"""local stand-in for the OpenAI API used by benchmarks/pipeline.py
+
+speaks enough of /v1/chat/completions (plain, JSON mode and streaming) and
+/v1/responses (streaming) for swe-szn. every response waits `ttft_ms` before
+its first token and then emits `tokens_per_s`; streamed answers are split into
+word tokens. with `rate_limit_every` every Nth request gets a 429 (with
+retry-after-ms) instead, to exercise services.ratelimit
+
+/v1/files and /v1/batches run Batch API jobs: a batch completes `batch_ms`
+after it is created, with an output file and, when `batch_error_every` sends
+every Nth request line to it, an error file
+
+    python benchmarks/fakes/openai_stub.py --port 8765 --ttft-ms 150
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+
+ANALYSIS = {
+    "job": {
+        "title": "Software Engineer Intern",
+        "company": "Benchmark Co",
+        "location": "Remote",
+        "season": {"time": "Summer 2026"},
+    },
+    "summary": "Strong backend fit; light on infrastructure experience.",
+    "match_score": 72,
+    "scores": {
+        "skills_match": 75,
+        "experience_alignment": 64,
+        "keyword_coverage": 70,
+    },
+    "strong_matches": ["Python services in production", "SQL and data modeling"],
+    "gaps": ["No Kubernetes experience", "Little on-call exposure"],
+    "keywords": {
+        "matched": ["Python", "PostgreSQL", "REST APIs"],
+        "missing": [
+            {"token": "Kubernetes", "priority": "must_have"},
+            {"token": "Terraform", "priority": "preferred"},
+        ],
+        "quick_wins": ["Mention the Docker setup from the capstone project"],
+    },
+}
+
+ANSWER_WORDS = (
+    "Lead with the **payments service** you built: it maps directly to their "
+    "backend requirements. Quantify the latency win, then name the stack "
+    "(Python, PostgreSQL, Redis) so the keyword screen sees it.\n\n- Tailor the "
+    "second bullet to their data pipeline work\n- Move coursework below "
+    "projects\n"
+).split(" ")
+
+
+@dataclass
+class StubConfig:
+    ttft_ms: float = 150.0
+    tokens_per_s: float = 500.0
+    answer_tokens: int = 60
+    rate_limit_every: int = 0
+    batch_ms: float = 200.0
+    batch_error_every: int = 0
+
+
+def _prompt_tokens(body: dict) -> int:
+    return max(1, len(json.dumps(body.get("messages") or body.get("input"))) // 4)
+
+
+def _answer(n: int) -> List[str]:
+    return [w + " " for w in itertools.islice(itertools.cycle(ANSWER_WORDS), n)]
+
+
+def _completion(cid: str, body: dict) -> dict:
+    """a non-streamed chat completion: the analysis in JSON mode, else prose"""
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    content = json.dumps(ANALYSIS) if json_mode else "".join(_answer(40))
+    prompt_tokens = _prompt_tokens(body)
+    out_tokens = max(1, len(content) // 4)
+    return {
+        "id": cid,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": out_tokens,
+            "total_tokens": prompt_tokens + out_tokens,
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    config = StubConfig()
+    _ids = itertools.count(1)
+    _ids_lock = threading.Lock()
+    # Batch API state: file id -> (filename, purpose, bytes), batch id -> batch
+    _files: Dict[str, Tuple[str, str, bytes]] = {}
+    _batches: Dict[str, Dict[str, Any]] = {}
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _json(self, status: int, payload: dict, **headers: str) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _sse(self, events: Iterator[Tuple[str, dict]]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for name, payload in events:
+            head = f"event: {name}\n" if name else ""
+            self.wfile.write(f"{head}data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+        if self.path.endswith("/chat/completions"):
+            self.wfile.write(b"data: [DONE]\n\n")
+
+    def _tokens(self, tokens: List[str]) -> Iterator[str]:
+        """yield tokens at the configured pace, after the first-token delay"""
+        time.sleep(self.config.ttft_ms / 1000)
+        gap = 1 / self.config.tokens_per_s if self.config.tokens_per_s else 0
+        for token in tokens:
+            yield token
+            time.sleep(gap)
+
+    def _next_id(self) -> int:
+        with self._ids_lock:
+            return next(self._ids)
+
+    def do_POST(self) -> None:
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path.endswith("/files"):
+            self._upload(raw)
+            return
+        if self.path.endswith("/batches"):
+            self._create_batch(json.loads(raw))
+            return
+        body = json.loads(raw)
+        model = body.get("model", "gpt-4o-mini")
+        prompt_tokens = _prompt_tokens(body)
+        n = self._next_id()
+
+        every = self.config.rate_limit_every
+        if every and n % every == 0:
+            self._json(
+                429,
+                {
+                    "error": {
+                        "message": "Rate limit reached (stub)",
+                        "type": "requests",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+                retry_after_ms="200",
+            )
+        elif self.path.endswith("/responses"):
+            tokens = _answer(self.config.answer_tokens)
+            self._sse(self._responses(f"resp_{n}", model, prompt_tokens, tokens))
+        elif not self.path.endswith("/chat/completions"):
+            self._json(404, {"error": {"message": f"no route {self.path}"}})
+        elif body.get("stream"):
+            tokens = _answer(self.config.answer_tokens)
+            self._sse(self._chunks(f"chatcmpl_{n}", model, prompt_tokens, tokens))
+        else:
+            payload = _completion(f"chatcmpl_{n}", body)
+            # a non-streamed reply arrives once every token is generated
+            for _ in self._tokens([""] * payload["usage"]["completion_tokens"]):
+                pass
+            self._json(200, payload)
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if parts[-3:-2] == ["files"] and parts[-1] == "content":
+            file = self._files.get(parts[-2])
+            if file is None:
+                self._json(404, {"error": {"message": f"no file {parts[-2]}"}})
+                return
+            data = file[2]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif parts[-2:-1] == ["batches"] and parts[-1] in self._batches:
+            self._json(200, self._batch_status(parts[-1]))
+        else:
+            self._json(404, {"error": {"message": f"no route {self.path}"}})
+
+    # --- Batch API ---
+
+    def _store_file(self, filename: str, purpose: str, data: bytes) -> dict:
+        file_id = f"file-{self._next_id()}"
+        self._files[file_id] = (filename, purpose, data)
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def _upload(self, raw: bytes) -> None:
+        head = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+        form = BytesParser(policy=HTTP).parsebytes(head + raw)
+        fields = {
+            part.get_param("name", header="content-disposition"): part
+            for part in form.iter_parts()
+        }
+        file = fields["file"]
+        purpose = fields["purpose"].get_payload(decode=True).decode()
+        data = file.get_payload(decode=True)
+        self._json(200, self._store_file(file.get_filename(), purpose, data))
+
+    def _create_batch(self, body: dict) -> None:
+        n = self._next_id()
+        _, _, data = self._files[body["input_file_id"]]
+        every = self.config.batch_error_every
+        output: List[dict] = []
+        errors: List[dict] = []
+        lines = [json.loads(line) for line in data.decode().splitlines() if line]
+        for i, req in enumerate(lines, 1):
+            row = {"id": f"batch_req_{n}_{i}", "custom_id": req["custom_id"]}
+            if every and i % every == 0:
+                error = {"message": "Invalid request (stub)", "type": "invalid_request"}
+                row["response"] = {"status_code": 400, "body": {"error": error}}
+                errors.append(row)
+            else:
+                completion = _completion(f"chatcmpl_{n}_{i}", req["body"])
+                row["response"] = {"status_code": 200, "body": completion}
+                output.append(row)
+            row["error"] = None
+
+        def jsonl(rows: List[dict]) -> bytes:
+            return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+        batch_id = f"batch_{n}"
+        self._batches[batch_id] = {
+            "batch": {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": body["endpoint"],
+                "input_file_id": body["input_file_id"],
+                "completion_window": body["completion_window"],
+                "status": "in_progress",
+                "created_at": int(time.time()),
+                "metadata": body.get("metadata"),
+                "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+            },
+            "ready": time.monotonic() + self.config.batch_ms / 1000,
+            "output": self._store_file(
+                f"{batch_id}_output.jsonl", "batch_output", jsonl(output)
+            )["id"],
+            "errors": (
+                self._store_file(
+                    f"{batch_id}_error.jsonl", "batch_output", jsonl(errors)
+                )["id"]
+                if errors
+                else None
+            ),
+            "counts": (len(output), len(errors)),
+        }
+        self._json(200, self._batches[batch_id]["batch"])
+
+    def _batch_status(self, batch_id: str) -> dict:
+        job = self._batches[batch_id]
+        batch = job["batch"]
+        if batch["status"] == "in_progress" and time.monotonic() >= job["ready"]:
+            completed, failed = job["counts"]
+            batch.update(
+                status="completed",
+                completed_at=int(time.time()),
+                output_file_id=job["output"],
+                error_file_id=job["errors"],
+                request_counts={
+                    "total": completed + failed,
+                    "completed": completed,
+                    "failed": failed,
+                },
+            )
+        return batch
+
+    def _chunks(self, cid, model, prompt_tokens, tokens):
+        def chunk(choices, **extra):
+            return {
+                "id": cid,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+
+        for token in self._tokens(tokens):
+            delta = {"index": 0, "delta": {"content": token}, "finish_reason": None}
+            yield "", chunk([delta])
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        yield "", chunk([], usage=usage)
+
+    def _responses(self, rid, model, prompt_tokens, tokens):
+        response = {
+            "id": rid,
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": model,
+            "status": "in_progress",
+            "output": [],
+        }
+        yield "response.created", {
+            "type": "response.created",
+            "sequence_number": 0,
+            "response": response,
+        }
+        for i, token in enumerate(self._tokens(tokens), 1):
+            yield "response.output_text.delta", {
+                "type": "response.output_text.delta",
+                "sequence_number": i,
+                "item_id": "msg_0",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": token,
+                "logprobs": [],
+            }
+        usage = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        }
+        yield "response.completed", {
+            "type": "response.completed",
+            "sequence_number": len(tokens) + 1,
+            "response": dict(response, status="completed", usage=usage),
+        }
+
+
+def serve(
+    config: StubConfig, host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """start the stub on a daemon thread; base url is http://host:port/v1"""
+    handler = type("Handler", (_Handler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft-ms", type=float, default=StubConfig.ttft_ms)
+    parser.add_argument("--tps", type=float, default=StubConfig.tokens_per_s)
+    parser.add_argument("--answer-tokens", type=int, default=StubConfig.answer_tokens)
+    parser.add_argument(
+        "--rate-limit-every", type=int, default=0, help="429 every Nth request"
+    )
+    parser.add_argument("--batch-ms", type=float, default=StubConfig.batch_ms)
+    parser.add_argument(
+        "--batch-error-every",
+        type=int,
+        default=0,
+        help="send every Nth batch request line to the error file",
+    )
+    args = parser.parse_args()
+    server = serve(
+        StubConfig(
+            args.ttft_ms,
+            args.tps,
+            args.answer_tokens,
+            args.rate_limit_every,
+            args.batch_ms,
+            args.batch_error_every,
+        ),
+        port=args.port,
+    )
+    print(f"OPENAI_BASE_URL=http://127.0.0.1:{server.server_address[1]}/v1")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
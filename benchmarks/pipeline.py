@@ -0,0 +1,360 @@
+"""offline end-to-end benchmark for the swe-szn pipeline
+
+runs the real analyze, chat, batch and Batch API code against local
+stand-ins: an HTTP stub speaking the OpenAI protocol (benchmarks/fakes/openai_stub.py), a fake
+firecrawl SDK (benchmarks/fakes/firecrawl) and a fake `codex` binary
+(benchmarks/fakes/bin/codex). each scenario runs in a fresh interpreter with
+its own cache and reports p50/p95 latency, time to first token and
+throughput, checked against benchmarks/baselines/pipeline.json. exits
+non-zero when a scenario got slower than its baseline beyond the tolerance
+
+    python benchmarks/pipeline.py                  # compare against the baseline
+    python benchmarks/pipeline.py --update         # record a new baseline
+    python benchmarks/pipeline.py --only "chat responses" --runs 20
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+BASELINE = HERE / "baselines" / "pipeline.json"
+FAKES = HERE / "fakes"
+
+# metrics compared against the baseline; first_ms is too noisy and only shown
+CHECKED = ("p50_ms", "p95_ms", "ttft_p50_ms", "ttft_p95_ms", "jobs_per_s")
+
+RESUME = """Jane Doe - Software Engineering Student
+Experience: built a payments service in Python and PostgreSQL serving 2k rps,
+cut p95 latency 40% with Redis caching; data pipelines on Kafka; REST APIs.
+Projects: React dashboard in TypeScript; Docker-based CI on GitHub Actions.
+Skills: Python, Go, SQL, PostgreSQL, Redis, Kafka, Docker, AWS, React.
+"""
+
+
+def percentile(values: List[float], p: float) -> float:
+    """nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _summary(
+    latencies: List[float],
+    ttfts: Optional[List[float]] = None,
+    *,
+    cold_first: bool = True,
+) -> Dict:
+    """p50/p95 of the requests; with `cold_first` the first request (which
+    imports the SDKs and builds the client) is reported on its own as
+    first_ms and left out of the percentiles, which it would otherwise swamp"""
+    out = {}
+    if cold_first and len(latencies) > 1:
+        out["first_ms"] = round(latencies[0], 1)
+        latencies = latencies[1:]
+        ttfts = ttfts[1:] if ttfts else ttfts
+    out["p50_ms"] = round(percentile(latencies, 50), 1)
+    out["p95_ms"] = round(percentile(latencies, 95), 1)
+    if ttfts:
+        out["ttft_p50_ms"] = round(percentile(ttfts, 50), 1)
+        out["ttft_p95_ms"] = round(percentile(ttfts, 95), 1)
+    return out
+
+
+# --- scenarios, run inside the child interpreter ---
+
+
+def _analyze(url: str, resume_path: str) -> float:
+    from swe_szn import analyze
+
+    start = time.perf_counter()
+    analyze.run(
+        url=url,
+        resume_path=resume_path,
+        prompt_name="swe_intern",
+        model=None,
+        force=False,
+        chat_after=False,
+        no_scrape=False,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def analyze_cold(runs: int, resume_path: str) -> Dict:
+    """scrape, clean, parse and analyze postings never seen before"""
+    return _summary(
+        [_analyze(f"https://jobs.bench/cold/{i}", resume_path) for i in range(runs)]
+    )
+
+
+def analyze_cached(runs: int, resume_path: str) -> Dict:
+    """the same posting again: every stage is a cache hit"""
+    url = "https://jobs.bench/cached"
+    _analyze(url, resume_path)
+    return _summary([_analyze(url, resume_path) for _ in range(runs)], cold_first=False)
+
+
+def _chat(runs: int, resume_path: str) -> Dict:
+    from firecrawl import posting  # the fake, benchmarks/fakes is on PYTHONPATH
+
+    from swe_szn.services.openai import chat_about_job_stream
+
+    jd = posting("https://jobs.bench/chat")
+    resume = Path(resume_path).read_text(encoding="utf-8")
+    history = None
+    latencies, ttfts = [], []
+    for i in range(runs):
+        start = time.perf_counter()
+        first = None
+        gen = chat_about_job_stream(
+            f"question {i}: how should I tailor my resume?",
+            jd_markdown=jd,
+            resume_text=resume,
+            history=history,
+        )
+        try:
+            while True:
+                next(gen)
+                if first is None:
+                    first = time.perf_counter()
+        except StopIteration as done:
+            history = (done.value or {}).get("history")
+        end = time.perf_counter()
+        latencies.append((end - start) * 1000)
+        ttfts.append(((first or end) - start) * 1000)
+    return _summary(latencies, ttfts)
+
+
+def batch_throughput(runs: int, resume_path: str) -> Dict:
+    """analyze-jobs over fresh postings with 4 workers"""
+    from swe_szn import batch
+
+    jobs = max(8, runs * 2)
+    out = Path(os.environ["SWE_SZN_CACHE_DIR"]) / "batch.jsonl"
+    start = time.perf_counter()
+    batch.run(
+        [f"https://jobs.bench/batch/{i}" for i in range(jobs)],
+        [resume_path],
+        prompt_name="swe_intern",
+        model=None,
+        force=False,
+        concurrency=4,
+        output_path=str(out),
+    )
+    wall = time.perf_counter() - start
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    failed = [r for r in records if "error" in r]
+    if failed:
+        raise RuntimeError(f"batch job failed: {failed[0]['error']}")
+    return {
+        # jobs overlap, so the import stall is shared by the first few
+        **_summary([r["elapsed"] for r in records], cold_first=False),
+        "jobs_per_s": round(jobs / wall, 2),
+    }
+
+
+def batch_api(runs: int, resume_path: str) -> Dict:
+    """analyze-jobs --batch-api: scrape on the pool, then submit, wait for and
+    collect one Batch API job against the stub's /files and /batches"""
+    from swe_szn import batch
+
+    jobs = max(8, runs * 2)
+    out = Path(os.environ["SWE_SZN_CACHE_DIR"]) / "batch-api.jsonl"
+    start = time.perf_counter()
+    batch.run(
+        [f"https://jobs.bench/batch-api/{i}" for i in range(jobs)],
+        [resume_path],
+        prompt_name="swe_intern",
+        model=None,
+        force=False,
+        concurrency=4,
+        output_path=str(out),
+        batch_api=True,
+        poll_interval=0.05,
+    )
+    wall = time.perf_counter() - start
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    failed = [r for r in records if "error" in r]
+    if failed or len(records) != jobs:
+        raise RuntimeError(f"batch api run incomplete: {failed[:1] or len(records)}")
+    return {
+        **_summary([r["elapsed"] for r in records], cold_first=False),
+        "jobs_per_s": round(jobs / wall, 2),
+    }
+
+
+# name -> (scenario, env overrides)
+SCENARIOS: Dict[str, Tuple[Callable[[int, str], Dict], Dict[str, str]]] = {
+    "analyze cold": (analyze_cold, {}),
+    "analyze cached": (analyze_cached, {}),
+    "chat responses": (_chat, {"SWE_SZN_CHAT_BACKEND": "responses"}),
+    "chat completions": (_chat, {"SWE_SZN_CHAT_BACKEND": "completions"}),
+    "codex chat pooled": (
+        _chat,
+        {"SWE_SZN_AI_PROVIDER": "codex", "SWE_SZN_CODEX_WORKERS": "2"},
+    ),
+    "codex chat exec": (
+        _chat,
+        {"SWE_SZN_AI_PROVIDER": "codex", "SWE_SZN_CODEX_WORKERS": "0"},
+    ),
+    "batch throughput": (batch_throughput, {}),
+    "batch api": (batch_api, {}),
+}
+
+
+def _child(name: str, runs: int, resume_path: str, out: str) -> None:
+    fn, _ = SCENARIOS[name]
+    result = fn(runs, resume_path)
+    Path(out).write_text(json.dumps(result))
+
+
+# --- parent ---
+
+
+def _env(name: str, workdir: Path, base_url: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    # the fake firecrawl package shadows the real SDK, the fake codex is first
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(FAKES), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    env["PATH"] = os.pathsep.join([str(FAKES / "bin"), env.get("PATH", "")])
+    env.update(
+        {
+            "OPENAI_API_KEY": "sk-bench",
+            "OPENAI_BASE_URL": base_url,
+            "FIRECRAWL_API_KEY": "fc-bench",
+            "SWE_SZN_AI_PROVIDER": "openai",
+            "SWE_SZN_CACHE_DIR": str(workdir / name.replace(" ", "-")),
+            "COLUMNS": "100",
+            # the fakes have no rate limits; a budget would time the throttle
+            # (the limiter itself still runs)
+            "OPENAI_RPM": "0",
+            "OPENAI_TPM": "0",
+            "FIRECRAWL_RPM": "0",
+            # the fake scrapes in 100ms waves; poll on that scale, not every 2s
+            "SWE_SZN_FIRECRAWL_POLL_INTERVAL": "0.1",
+        }
+    )
+    env.update(SCENARIOS[name][1])
+    return env
+
+
+def run_scenario(name: str, runs: int, workdir: Path, base_url: str) -> Dict:
+    out = workdir / f"{name.replace(' ', '-')}.json"
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", name, "--runs", str(runs)]
+        + ["--resume", str(workdir / "resume.txt"), "--out", str(out)],
+        cwd=workdir,  # no .env from the checkout
+        env=_env(name, workdir, base_url),
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(out.read_text())
+
+
+def _regressions(
+    result: Dict, base: Dict, tolerance: float, slack_ms: float
+) -> List[str]:
+    found = []
+    for metric, value in result.items():
+        old = base.get(metric)
+        if old is None or metric not in CHECKED:
+            continue
+        if metric.endswith("_ms") and value > old * (1 + tolerance) + slack_ms:
+            found.append(f"{metric} {value}ms > {old}ms baseline")
+        elif metric.endswith("_per_s") and value < old * (1 - tolerance):
+            found.append(f"{metric} {value} < {old} baseline")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="requests per scenario")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown over the baseline (fraction)",
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=25.0,
+        help="absolute noise allowance on top of the tolerance",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="write the results as the new baseline"
+    )
+    parser.add_argument(
+        "--only", action="append", default=[], help="only run this scenario"
+    )
+    parser.add_argument("--ttft-ms", type=float, default=150.0, help="stub latency")
+    parser.add_argument("--tps", type=float, default=500.0, help="stub tokens/s")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--resume", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.runs, args.resume, args.out)
+        return 0
+
+    sys.path.insert(0, str(FAKES))
+    from openai_stub import StubConfig, serve
+
+    server = serve(StubConfig(ttft_ms=args.ttft_ms, tokens_per_s=args.tps))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    names = args.only or list(SCENARIOS)
+    results: Dict[str, Dict] = {}
+    failures: List[str] = []
+
+    with tempfile.TemporaryDirectory(prefix="swe-szn-pipeline-") as tmp:
+        workdir = Path(tmp)
+        (workdir / "resume.txt").write_text(RESUME, encoding="utf-8")
+        for name in names:
+            res = run_scenario(name, args.runs, workdir, base_url)
+            results[name] = res
+            found = _regressions(
+                res, baseline.get(name, {}), args.tolerance, args.slack_ms
+            )
+            failures.extend(f"{name}: {f}" for f in found)
+
+            ttft = (
+                f"  ttft p50 {res['ttft_p50_ms']:>7.1f}ms p95 {res['ttft_p95_ms']:>7.1f}ms"
+                if "ttft_p50_ms" in res
+                else ""
+            )
+            rate = f"  {res['jobs_per_s']:>5.2f} jobs/s" if "jobs_per_s" in res else ""
+            first = f"  first {res['first_ms']:>7.1f}ms" if "first_ms" in res else ""
+            print(
+                f"{name:<18} p50 {res['p50_ms']:>7.1f}ms  p95 {res['p95_ms']:>7.1f}ms"
+                f"{ttft}{rate}{first}  {'FAIL' if found else 'ok'}"
+            )
+
+    server.shutdown()
+
+    if args.update:
+        BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        merged = {**baseline, **results}
+        BASELINE.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"wrote {BASELINE}")
+        return 0
+
+    for failure in failures:
+        print(f"regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""startup-time benchmark for the swe-szn CLI
+
+runs each tracked command in a fresh interpreter under `python -X importtime`,
+sums the import cost and checks it against benchmarks/baselines/startup.json.
+exits non-zero when a command got slower than its baseline (beyond the
+tolerance) or imported a module it should never need
+
+    python benchmarks/startup.py            # compare against the baseline
+    python benchmarks/startup.py --update   # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "startup.json"
+
+# SDKs that only the commands doing real work may load
+HEAVY = ["openai", "httpx", "firecrawl", "pypdf"]
+
+
+def _cli(*argv: str) -> str:
+    return (
+        f"import sys; sys.argv = ['swe-szn', *{list(argv)!r}]\n"
+        "from swe_szn.cli import app\n"
+        "app()"
+    )
+
+
+# name -> (python code to run, modules that must not be imported)
+COMMANDS: Dict[str, Tuple[str, List[str]]] = {
+    "--help": (_cli("--help"), HEAVY + ["dotenv", "yaml", "swe_szn.services"]),
+    "config check": (_cli("config", "check"), HEAVY + ["yaml"]),
+    "cache stats": (_cli("cache", "stats"), HEAVY + ["yaml"]),
+    "analyze-job --help": (_cli("analyze-job", "--help"), HEAVY + ["dotenv"]),
+    "analyze-jobs --help": (_cli("analyze-jobs", "--help"), HEAVY + ["dotenv"]),
+    "resume bench --help": (_cli("resume", "bench", "--help"), HEAVY + ["dotenv"]),
+    # the analyze pipeline itself, which cached runs load and nothing more
+    "import swe_szn.analyze": ("import swe_szn.analyze", HEAVY),
+}
+
+
+def _parse(stderr: str) -> Tuple[float, Set[str]]:
+    """total import time (ms) and the imported module names from -X importtime"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        total_us += int(parts[0])
+        modules.add(parts[2].strip())
+    return total_us / 1000.0, modules
+
+
+def measure(code: str, runs: int, workdir: str) -> Dict[str, object]:
+    env = dict(os.environ)
+    env["SWE_SZN_CACHE_DIR"] = os.path.join(workdir, "cache")
+    env["COLUMNS"] = "100"
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+
+    import_ms: List[float] = []
+    wall_ms: List[float] = []
+    modules: Set[str] = set()
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=workdir,  # no .env from the checkout
+            env=env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        wall_ms.append((time.perf_counter() - start) * 1000.0)
+        if proc.returncode not in (0, 2):  # 2 is a click usage error
+            raise RuntimeError(f"`{code}` failed:\n{proc.stderr[-2000:]}")
+        total, mods = _parse(proc.stderr)
+        import_ms.append(total)
+        modules |= mods
+
+    return {
+        "import_ms": round(statistics.median(import_ms), 1),
+        "wall_ms": round(statistics.median(wall_ms), 1),
+        "modules": len(modules),
+        "_modules": modules,
+    }
+
+
+def _forbidden(modules: Set[str], banned: List[str]) -> List[str]:
+    return sorted(
+        m for m in modules if any(m == b or m.startswith(b + ".") for b in banned)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="runs per command")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown over the baseline (fraction)",
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=15.0,
+        help="absolute noise allowance on top of the tolerance",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="write the results as the new baseline"
+    )
+    parser.add_argument(
+        "--only", action="append", default=[], help="only run this command"
+    )
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    names = args.only or list(COMMANDS)
+    results: Dict[str, Dict[str, object]] = {}
+    failures: List[str] = []
+
+    with tempfile.TemporaryDirectory(prefix="swe-szn-startup-") as workdir:
+        for name in names:
+            code, banned = COMMANDS[name]
+            res = measure(code, args.runs, workdir)
+            leaked = _forbidden(res.pop("_modules"), banned)
+            results[name] = res
+
+            base = baseline.get(name, {}).get("import_ms")
+            limit = (
+                base * (1 + args.tolerance) + args.slack_ms
+                if base is not None
+                else None
+            )
+            status = "ok"
+            if leaked:
+                status = "FAIL"
+                failures.append(f"{name}: imported {', '.join(leaked[:5])}")
+            if limit is not None and res["import_ms"] > limit:
+                status = "FAIL"
+                failures.append(
+                    f"{name}: {res['import_ms']}ms import time > {limit:.1f}ms"
+                    f" (baseline {base}ms)"
+                )
+            print(
+                f"{name:<26} import {res['import_ms']:>7.1f}ms"
+                f"  wall {res['wall_ms']:>7.1f}ms"
+                f"  modules {res['modules']:>4}"
+                f"  baseline {'-' if base is None else f'{base:.1f}ms':>9}"
+                f"  {status}"
+            )
+
+    if args.update:
+        BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        merged = {**baseline, **results}
+        BASELINE.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"wrote {BASELINE}")
+        return 0
+
+    for failure in failures:
+        print(f"regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
+from typing import Optional
+
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
-from swe_szn.config import settings
-from swe_szn.services import firecrawl, resume
+from swe_szn import trace
+from swe_szn.pipeline import Stage, run_graph
+from swe_szn.services import firecrawl, ratelimit, resume, triage
 from swe_szn.services.openai import compare_jd_vs_resume
 
 
@@ -14,6 +17,7 @@ def run(
     force: bool,
     chat_after: bool,
     no_scrape: bool,
+    triage_min: Optional[int] = None,
 ) -> dict:
     with Progress(
         SpinnerColumn(),
@@ -22,47 +26,87 @@ def run(
         transient=True,
         expand=True,
     ) as progress:
-        scrape_task = progress.add_task(
-            "[yellow]swe-eping the job posting...", total=None
-        )
-        if not no_scrape:
-            jd_markdown = firecrawl.scrape_job(url)
-        else:
-            progress.update(
-                scrape_task,
-                description="[yellow]waiting for job posting input...",
-                completed=1,
-                total=1,
+
+        def done(task, description: Optional[str] = None) -> None:
+            progress.update(task, completed=1, total=1)
+            if description:
+                progress.update(task, description=description)
+
+        def waits(task, doing: str):
+            """show rate-limit waits and retries on the task's line"""
+            return ratelimit.listen(
+                lambda info: progress.update(
+                    task, description=f"[yellow]{doing} ({info['message']})"
+                )
             )
-            jd_markdown = input("Paste the job posting here: ")
-        progress.update(
-            scrape_task,
-            description="[green]swe-eped the job posting",
-            completed=1,
-            total=1,
-        )
 
-        parse_task = progress.add_task("[yellow]swe-eping the resume...", total=None)
-        resume_text = resume.parse_resume(resume_path)
-        progress.update(
-            parse_task,
-            description="[green]swe-eped the resume",
-            completed=1,
-            total=1,
-        )
+        def scrape() -> str:
+            task = progress.add_task("[yellow]swe-eping the job posting...", total=None)
+            if not no_scrape:
+                with waits(task, "swe-eping the job posting..."):
+                    jd = firecrawl.scrape_job(url)
+            else:
+                progress.update(
+                    task, description="[yellow]waiting for job posting input..."
+                )
+                jd = input("Paste the job posting here: ")
+            done(task, "[green]swe-eped the job posting")
+            return jd
+
+        # deterministic boilerplate cleanup before anything is sent to a model
+        def clean(scrape: str) -> tuple:
+            task = progress.add_task("[yellow]swe-eping the boilerplate...", total=None)
+            cleaned, report = firecrawl.clean_job(None if no_scrape else url, scrape)
+            saved = 1 - report["chars_after"] / max(1, report["chars_before"])
+            done(task, f"[green]swe-eped the boilerplate ({saved:.0%} smaller)")
+            return cleaned, report
+
+        def parse() -> str:
+            task = progress.add_task("[yellow]swe-eping the resume...", total=None)
+            text = resume.parse_resume(resume_path)
+            done(task, "[green]swe-eped the resume")
+            return text
+
+        # AI analysis starts as soon as both inputs are ready
+        def analyze(clean: tuple, parse: str) -> dict:
+            checked = None
+            if triage_min is not None:
+                with trace.span("triage") as span:
+                    pre = triage.score(parse, clean[0])
+                    span.set(score=pre["match_score"])
+                checked = triage.outcome(pre, triage_min)
+                if checked["skipped"]:
+                    pre["_meta"]["triage"] = checked
+                    return pre
+            task = progress.add_task("[cyan]summoning the swe-eeper...", total=None)
+            with waits(task, "summoning the swe-eeper..."):
+                res = compare_jd_vs_resume(
+                    jd_markdown=clean[0],
+                    resume_text=parse,
+                    model=model,
+                    job_url=url,
+                    force=force,
+                    prompt_name=prompt_name,
+                )
+            done(task)
+            if checked is not None:
+                res.setdefault("_meta", {})["triage"] = checked
+            return res
+
+        with trace.span("analyze.run"):
+            outputs = run_graph(
+                [
+                    Stage("scrape", scrape),
+                    Stage("clean", clean, deps=("scrape",)),
+                    Stage("parse", parse),
+                    Stage("analyze", analyze, deps=("clean", "parse")),
+                ]
+            )
 
-        # AI analysis
-        ai_task = progress.add_task("[cyan]summoning the swe-eeper...", total=None)
-        result = compare_jd_vs_resume(
-            jd_markdown=jd_markdown,
-            resume_text=resume_text,
-            model=model,
-            job_url=url,
-            cache_dir=settings().cache_dir("openai"),
-            force=force,
-            prompt_name=prompt_name,
-        )
-        progress.update(ai_task, completed=1, total=1)
+    jd_markdown, clean_report = outputs["clean"]
+    resume_text = outputs["parse"]
+    result = outputs["analyze"]
+    result.setdefault("_meta", {})["jd_clean"] = clean_report
 
     # attach context for optional chat follow-up
     if chat_after:
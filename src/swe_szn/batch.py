@@ -0,0 +1,427 @@
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rich.console import Group
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+from swe_szn.config import settings
+from swe_szn.services import firecrawl, ratelimit, resume, triage
+from swe_szn.services.openai import compare_jd_vs_resume
+from swe_szn.ui import rich
+
+# --- constants ---
+STATUS_STYLES = {
+    "queued": "dim",
+    "scraping": "yellow",
+    "analyzing": "cyan",
+    "batched": "blue",
+    "scraped": "blue",
+    "submitted": "magenta",
+    "done": "green",
+    "skipped": "yellow",
+    "error": "red",
+}
+ACTIVE_STATUSES = {"scraping", "analyzing", "submitted"}
+
+
+def read_urls(path: str) -> List[str]:
+    """read job urls from a file, one per line (blank lines and # comments skipped)"""
+    seen = set()
+    urls = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        url = line.strip()
+        if not url or url.startswith("#") or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
+
+
+class _Job:
+    def __init__(self, index: int, url: str, resume_path: str) -> None:
+        self.index = index
+        self.url = url
+        self.resume_path = resume_path
+        self.status = "queued"
+        self.score: Optional[int] = None
+        self.error: Optional[str] = None
+        self.jd_clean: Optional[dict] = None
+        # url (or cache key) of the near-duplicate posting whose analysis was reused
+        self.reused_from: Optional[str] = None
+        # local --triage outcome, see services/triage.outcome
+        self.triage: Optional[dict] = None
+        # latest rate-limit wait or retry of a call still running
+        self.wait: Optional[str] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class _Board:
+    """live table of per-job status with throughput and ETA"""
+
+    def __init__(self, jobs: List[_Job], concurrency: int) -> None:
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.started = time.perf_counter()
+        self.note = ""
+
+    def _visible(self, limit: int) -> List[_Job]:
+        # running jobs first, then the most recently finished, then the queue
+        active = [j for j in self.jobs if j.status in ACTIVE_STATUSES]
+        finished = sorted(
+            (j for j in self.jobs if j.finished is not None),
+            key=lambda j: j.finished,
+            reverse=True,
+        )
+        queued = [j for j in self.jobs if j.status in {"queued", "batched", "scraped"}]
+        rows = (active + finished + queued)[:limit]
+        return sorted(rows, key=lambda j: j.index)
+
+    def _footer(self) -> Text:
+        total = len(self.jobs)
+        done = sum(1 for j in self.jobs if j.finished is not None)
+        failed = sum(1 for j in self.jobs if j.status == "error")
+        wall = time.perf_counter() - self.started
+        rate = done / wall if wall > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        eta_text = f"{eta:.0f}s" if eta is not None else "--"
+        footer = Text.from_markup(
+            f"[bold]{done}/{total}[/bold] done"
+            f" • [red]{failed} failed[/red]"
+            f" • [cyan]{rate * 60:.1f} jobs/min[/cyan]"
+            f" • ETA [blue]{eta_text}[/blue]"
+            f" • {wall:.0f}s elapsed"
+            f" • {self.concurrency} workers"
+        )
+        # in-flight caps shrink on 429s and grow back, see services.ratelimit
+        for provider, (active, limit) in ratelimit.in_flight().items():
+            footer.append(f" • {provider} {active}/{limit} in flight", style="dim")
+        if self.note:
+            footer.append(f"\n{self.note}", style="magenta")
+        return footer
+
+    def __rich__(self) -> Group:
+        limit = max(5, rich.console.size.height - 8)
+        table = Table(expand=True, title="swe-eeping job postings")
+        table.add_column("#", justify="right", style="dim", no_wrap=True)
+        table.add_column("Job", overflow="ellipsis", no_wrap=True, ratio=3)
+        table.add_column("Resume", overflow="ellipsis", no_wrap=True, ratio=1)
+        table.add_column("Status", no_wrap=True)
+        table.add_column("Score", justify="right", no_wrap=True)
+        table.add_column("Time", justify="right", no_wrap=True)
+        for job in self._visible(limit):
+            style = STATUS_STYLES.get(job.status, "")
+            status = job.status if not job.error else f"error: {job.error}"
+            if job.wait and job.status in ACTIVE_STATUSES:
+                status = f"{status} ({job.wait})"
+            table.add_row(
+                str(job.index + 1),
+                job.url,
+                Path(job.resume_path).name,
+                Text(status, style=style, overflow="ellipsis"),
+                "" if job.score is None else f"{job.score}/100",
+                f"{job.elapsed():.1f}s" if job.started else "",
+            )
+        return Group(table, self._footer())
+
+
+class _Once:
+    """run each keyed callable once and share the result across threads"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    def get(self, key: str, fn):
+        with self._lock:
+            fut = self._futures.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._futures[key] = Future()
+        if owner:
+            try:
+                fut.set_result(fn())
+            except BaseException as exc:
+                fut.set_exception(exc)
+        return fut.result()
+
+
+class _Prefetch:
+    """the postings of a run as one Firecrawl batch scrape on a background
+    thread; workers wait for their posting instead of scraping it themselves"""
+
+    def __init__(self, urls: List[str]) -> None:
+        self._ready = {url: threading.Event() for url in urls}
+        self._markdown: Dict[str, str] = {}
+        threading.Thread(
+            target=self._run, args=(urls,), name="swe-szn-scrape", daemon=True
+        ).start()
+
+    def _run(self, urls: List[str]) -> None:
+        def arrived(url: str, markdown: str) -> None:
+            self._markdown[url] = markdown
+            self._ready[url].set()
+
+        try:
+            firecrawl.scrape_jobs(urls, on_scraped=arrived)
+        except Exception as e:
+            # the workers scrape what is missing one by one, but say why
+            rich.console.print(
+                f"[yellow]Batch scrape failed ({type(e).__name__}: {e});"
+                " scraping one by one[/yellow]"
+            )
+        finally:
+            for ready in self._ready.values():
+                ready.set()
+
+    def get(self, url: str) -> Optional[str]:
+        """the posting's markdown once the batch returned it, None if it did not"""
+        ready = self._ready.get(url)
+        if ready is None:
+            return None
+        ready.wait()
+        return self._markdown.get(url)
+
+
+def _record(job: _Job, result: Optional[dict], error: Optional[str]) -> dict:
+    record = {"url": job.url, "resume": job.resume_path}
+    if job.jd_clean is not None:
+        record["jd_clean"] = job.jd_clean
+    if error is None:
+        job.status = "done"
+        job.score = (result or {}).get("match_score")
+        if job.triage is not None and result is not None:
+            result.setdefault("_meta", {})["triage"] = job.triage
+            if job.triage["skipped"]:
+                job.status = "skipped"
+        near = ((result or {}).get("_meta") or {}).get("near_duplicate")
+        job.reused_from = (near.get("job_url") or near.get("key")) if near else None
+        record["result"] = result
+    else:
+        job.status = "error"
+        job.error = error
+        record["error"] = error
+    job.finished = time.perf_counter()
+    record["elapsed"] = int(job.elapsed() * 1000)
+    return record
+
+
+def _write(fh, record: dict) -> None:
+    # one line per finished job so partial runs are still usable
+    fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    fh.flush()
+
+
+def _triage(
+    jobs: List[_Job],
+    scraped: Dict[int, str],
+    resume_texts: Dict[str, str],
+    min_score: int,
+    fh,
+) -> Dict[int, str]:
+    """score scraped postings locally, write out the weak matches and return
+    the postings that still need an LLM analysis"""
+    survivors: Dict[int, str] = {}
+    for path, text in resume_texts.items():
+        group = [j for j in jobs if j.index in scraped and j.resume_path == path]
+        # one call per resume so idf is computed over every posting at once
+        results = triage.score_many(text, [scraped[j.index] for j in group])
+        for job, pre in zip(group, results):
+            job.triage = triage.outcome(pre, min_score)
+            if job.triage["skipped"]:
+                _write(fh, _record(job, pre, None))
+            else:
+                survivors[job.index] = scraped[job.index]
+    return survivors
+
+
+def run(
+    urls: List[str],
+    resume_paths: List[str],
+    *,
+    prompt_name: str,
+    model: Optional[str],
+    force: bool,
+    concurrency: int,
+    output_path: str,
+    batch_api: bool = False,
+    poll_interval: float = 30.0,
+    triage_min: Optional[int] = None,
+) -> dict:
+    """analyze every url against every resume with a bounded worker pool
+
+    with `batch_api`, postings are still scraped on the pool but every analysis
+    is submitted as one OpenAI Batch API job and polled until it completes.
+    with `triage_min`, every posting is scraped and scored locally first and
+    only those scoring at least `triage_min` are sent to the LLM
+    """
+    # parse each resume once, every job reuses the text
+    resume_texts = {p: resume.parse_resume(p) for p in resume_paths}
+
+    jobs = [
+        _Job(i, url, rp)
+        for i, (url, rp) in enumerate((u, r) for u in urls for r in resume_paths)
+    ]
+    board = _Board(jobs, concurrency)
+    scrapes = _Once()
+    prefetch: Optional[_Prefetch] = None
+
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    def fetch(url: str) -> tuple:
+        markdown = prefetch.get(url) if prefetch is not None else None
+        if markdown is None:
+            markdown = firecrawl.scrape_job(url)
+        return firecrawl.clean_job(url, markdown)
+
+    def scrape(job: _Job) -> str:
+        job.started = time.perf_counter()
+        job.status = "scraping"
+        with ratelimit.listen(lambda info: setattr(job, "wait", info["message"])):
+            cleaned, job.jd_clean = scrapes.get(job.url, lambda: fetch(job.url))
+        job.wait = None
+        return cleaned
+
+    def analyze(job: _Job, jd_markdown: str) -> dict:
+        job.status = "analyzing"
+        with ratelimit.listen(lambda info: setattr(job, "wait", info["message"])):
+            result = compare_jd_vs_resume(
+                jd_markdown=jd_markdown,
+                resume_text=resume_texts[job.resume_path],
+                model=model,
+                job_url=job.url,
+                force=force,
+                prompt_name=prompt_name,
+            )
+        job.wait = None
+        return result
+
+    def work(job: _Job) -> dict:
+        return analyze(job, scrape(job))
+
+    def drain(futures: Dict[Future, _Job], scraped: Dict[int, str]) -> None:
+        for fut in as_completed(futures):
+            job = futures[fut]
+            try:
+                value = fut.result()
+            except Exception as exc:
+                _write(fh, _record(job, None, str(exc) or exc.__class__.__name__))
+                continue
+            if job.status == "scraping":
+                job.status = "batched" if batch_api else "scraped"
+                scraped[job.index] = value
+            else:
+                _write(fh, _record(job, value, None))
+
+    # scrape everything first when the analyses need the whole set
+    two_phase = batch_api or triage_min is not None
+    with (
+        open(out, "w", encoding="utf-8") as fh,
+        Live(board, console=rich.console, refresh_per_second=4),
+        ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool,
+    ):
+        unique = list(dict.fromkeys(urls))
+        batch_min = settings().firecrawl_batch_min
+        if batch_min and len(unique) >= batch_min:
+            prefetch = _Prefetch(unique)
+
+        fn = scrape if two_phase else work
+        scraped: Dict[int, str] = {}
+        drain({pool.submit(fn, job): job for job in jobs}, scraped)
+
+        if triage_min is not None and scraped:
+            scraped = _triage(jobs, scraped, resume_texts, triage_min, fh)
+
+        if not batch_api and scraped:
+            drain(
+                {
+                    pool.submit(analyze, job, scraped[job.index]): job
+                    for job in jobs
+                    if job.index in scraped
+                },
+                {},
+            )
+        elif batch_api and scraped:
+            _run_batch_api(
+                [j for j in jobs if j.index in scraped],
+                scraped,
+                resume_texts,
+                board,
+                fh,
+                model=model,
+                prompt_name=prompt_name,
+                force=force,
+                poll_interval=poll_interval,
+            )
+
+    failed = sum(1 for j in jobs if j.status == "error")
+    reports = {j.url: j.jd_clean for j in jobs if j.jd_clean is not None}
+    return {
+        "total": len(jobs),
+        "jd_chars_before": sum(r["chars_before"] for r in reports.values()),
+        "jd_chars_after": sum(r["chars_after"] for r in reports.values()),
+        "reused": sum(1 for j in jobs if j.reused_from is not None),
+        "skipped": sum(1 for j in jobs if j.status == "skipped"),
+        "succeeded": len(jobs) - failed,
+        "failed": failed,
+        "elapsed": int((time.perf_counter() - board.started) * 1000),
+        "output": str(out),
+    }
+
+
+def _run_batch_api(
+    jobs: List[_Job],
+    scraped: Dict[int, str],
+    resume_texts: Dict[str, str],
+    board: _Board,
+    fh,
+    *,
+    model: Optional[str],
+    prompt_name: str,
+    force: bool,
+    poll_interval: float,
+) -> None:
+    from swe_szn.services.openai import batch as batch_api
+
+    items = [
+        {
+            "jd_markdown": scraped[job.index],
+            "resume_text": resume_texts[job.resume_path],
+            "job_url": job.url,
+        }
+        for job in jobs
+    ]
+
+    def on_status(b) -> None:
+        counts = b.request_counts
+        progress = f" {counts.completed}/{counts.total}" if counts else ""
+        board.note = f"batch {b.id}: {b.status}{progress}"
+        for job in jobs:
+            job.status = "submitted"
+
+    try:
+        outcomes = batch_api.run(
+            items,
+            model=model,
+            prompt_name=prompt_name,
+            force=force,
+            poll_interval=poll_interval,
+            on_status=on_status,
+        )
+    except Exception as exc:
+        outcomes = [{"error": str(exc) or exc.__class__.__name__}] * len(jobs)
+
+    for job, outcome in zip(jobs, outcomes):
+        _write(fh, _record(job, outcome.get("result"), outcome.get("error")))
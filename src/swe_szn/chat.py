@@ -5,11 +5,12 @@ import typer
 from rich.align import Align
 from rich.console import Group
 from rich.live import Live
-from rich.markdown import Markdown
 from rich.panel import Panel
 
+from swe_szn import trace
 from swe_szn.services.openai import chat_about_job_stream
 from swe_szn.ui import rich
+from swe_szn.ui.stream import StreamingMarkdown
 
 _ANSI_SEQ_RE = re.compile(
     r"(?:\x1b\[[0-?]*[ -/]*[@-~]|\x1b[@-Z\\-_]|\x1b\][0-?]*.*?(?:\x07|\x1b\\)|\x1b[P^_].*?\x1b\\|\^\[[0-?]*[ -/]*[@-~])",
@@ -34,7 +35,29 @@ def validate_input(input: str) -> Optional[str]:
     return cleaned
 
 
-def run(result, model, prompt):
+def _footer(meta: dict) -> str:
+    """per-turn cost, input/output tokens and time under an answer"""
+    lines = []
+    cost = meta.get("total_cost_usd")
+    if cost:
+        lines.append(f"[dim]~ [cyan]${cost:.4f}[/cyan][/dim]")
+    if meta.get("input_tokens"):
+        tokens = (
+            f"[dim]~ [magenta]{meta['input_tokens']:,}[/magenta] in → "
+            f"{meta.get('output_tokens', 0):,} out tokens"
+        )
+        if meta.get("backend") == "responses":
+            tokens += f" • ~{meta.get('sent_tokens', 0):,} sent"
+        if meta.get("summarized"):
+            tokens += " • older turns summarized"
+        lines.append(tokens + "[/dim]")
+    if lines:
+        elapsed = meta.get("elapsed", 0) / 1000.0
+        lines.append(f"[dim]~ [blue]{elapsed:.2f}s[/blue][/dim]")
+    return "\n\n" + "\n".join(lines) if lines else ""
+
+
+def run(result, model, prompt, profile: bool = False):
     ctx = result.get("_context") or {}
     jd: str = ctx.get("jd_markdown", "")
     resume: str = ctx.get("resume_text", "")
@@ -58,6 +81,8 @@ def run(result, model, prompt):
         if q.strip().lower() in {"exit", "quit", "q"}:
             break
 
+        recording = trace.current() if profile else None
+        seen = len(recording.spans) if recording is not None else 0
         gen = chat_about_job_stream(
             q,
             jd_markdown=jd,
@@ -78,28 +103,32 @@ def run(result, model, prompt):
         )
         centered_panel = Align.center(panel)  # center the panel
 
-        chunks = []
-        current_text = ""
-        # stream the answer using Rich live
+        answer = StreamingMarkdown()
+        panel.renderable = answer
+        # stream the answer using Rich live; chunks only land in the buffer,
+        # rendering happens on the refresh ticks
         with Live(centered_panel, refresh_per_second=10):
             while True:
                 try:
-                    chunk = next(gen)
-                    chunks.append(chunk)
-                    current_text = "".join(chunks)
-                    markdown_text = Markdown(current_text)
-                    panel.renderable = markdown_text
+                    answer.feed(next(gen))
                 except StopIteration as e:
+                    answer.finish()
                     res = e.value or {}
                     conversation_history = res.get("history")
-                    cost = (res.get("_meta") or {}).get("total_cost_usd")
-                    elapsed = ((res.get("_meta") or {}).get("elapsed", 0)) / 1000.0
-                    if cost:
-                        # add cost before ending the live
-                        cost_text = (
-                            f"\n\n[dim]~ [cyan]${cost:.4f}[/cyan][/dim]\n"
-                            f"[dim]~ [blue]{elapsed:.2f}s[/blue][/dim]"
-                        )
-                        markdown_text = Markdown(current_text)
-                        panel.renderable = Group(markdown_text, cost_text)
+                    footer = _footer(res.get("_meta") or {})
+                    if footer:
+                        # add the footer before ending the live
+                        panel.renderable = Group(answer, footer)
+                    break
+                except KeyboardInterrupt:
+                    # stop this answer (and the codex child) but keep chatting;
+                    # the unanswered question stays out of the history
+                    gen.close()
+                    answer.finish()
+                    panel.renderable = Group(answer, "\n\n[dim]~ cancelled[/dim]")
                     break
+
+        if recording is not None:
+            from swe_szn.ui.trace import print_waterfall
+
+            print_waterfall(recording.spans[seen:], title="Chat turn profile")
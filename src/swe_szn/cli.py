@@ -1,17 +1,30 @@
 import json
 from pathlib import Path
+from typing import List, Optional
 
 import typer
 
-from swe_szn.config import apply as config_apply
-from swe_szn.config import snapshot
-from swe_szn.ui import markdown, rich
-from swe_szn.ui.config import check as config_check
-from swe_szn.ui.config import setup as config_setup
+# commands import what they need when they run, so `--help` and the light
+# commands never pay for the SDKs (see benchmarks/startup.py)
 
 app = typer.Typer(help="swe-szn CLI: analyze resumes vs job listings")
 config_app = typer.Typer(help="configuration commands")
 app.add_typer(config_app, name="config")
+cache_app = typer.Typer(help="cache management commands")
+app.add_typer(cache_app, name="cache")
+resume_app = typer.Typer(help="resume parsing commands")
+app.add_typer(resume_app, name="resume")
+jd_app = typer.Typer(help="job description commands")
+app.add_typer(jd_app, name="jd")
+
+
+def _triage_min(triage: bool, triage_min: Optional[int]) -> Optional[int]:
+    """the --triage threshold, or None when triage is off"""
+    from swe_szn.config import settings
+
+    if not triage and triage_min is None:
+        return None
+    return settings().triage_min_score if triage_min is None else triage_min
 
 
 @app.command()
@@ -45,8 +58,41 @@ def analyze_job(
         "-ns",
         help="Don't scrape the job posting, instead paste into CLI",
     ),
+    triage: bool = typer.Option(
+        False,
+        "--triage",
+        help="Score postings locally first and skip the LLM for weak matches",
+    ),
+    triage_min: Optional[int] = typer.Option(
+        None,
+        "--triage-min",
+        help="Minimum local score to run the LLM (default SWE_SZN_TRIAGE_MIN_SCORE)",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print where the time went, stage by stage"
+    ),
+    profile_out: Path = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write the trace as JSON (implies --profile)",
+    ),
+    profile_format: str = typer.Option(
+        "chrome",
+        "--profile-format",
+        help="chrome (chrome://tracing, Perfetto) | otlp (OpenTelemetry)",
+    ),
 ):
-    from swe_szn import analyze, chat
+    from swe_szn import analyze, chat, trace
+    from swe_szn.ui import markdown, rich
+
+    if profile_format not in trace.EXPORT_FORMATS:
+        rich.console.print(
+            f"[red]--profile-format must be one of {', '.join(trace.EXPORT_FORMATS)}"
+            "[/red]"
+        )
+        raise typer.Exit(1)
+    profile = profile or profile_out is not None
+    recording = trace.start() if profile else None
 
     # prompt for job url
     if not url and not no_scrape:
@@ -60,9 +106,16 @@ def analyze_job(
         force=force,
         chat_after=chat_after,
         no_scrape=no_scrape,
+        triage_min=_triage_min(triage, triage_min),
     )
 
     rich.print_overview(result)
+    pre = result["_meta"].get("triage") or {}
+    if pre.get("skipped"):
+        rich.console.print(
+            f"[yellow]Local triage score {pre['score']} is below {pre['min_score']},"
+            " skipped the LLM analysis (run without --triage to analyze anyway)[/yellow]"
+        )
 
     if export == "json":
         json_string = json.dumps(result, indent=2)
@@ -74,12 +127,221 @@ def analyze_job(
         out_path.write_text(md, encoding="utf-8")
         rich.console.print(f"[blue]Exported Markdown to {out_path}[/blue]")
 
+    if recording is not None:
+        from swe_szn.ui.trace import print_waterfall
+
+        print_waterfall(recording.spans, title="Analysis profile")
+
     if chat_after:
-        chat.run(result, model, chat_prompt)
+        chat.run(result, model, chat_prompt, profile=profile)
+
+    if recording is not None:
+        trace.stop()
+        if profile_out is not None:
+            path = recording.write(profile_out, profile_format)
+            rich.console.print(f"[blue]Wrote {profile_format} trace to {path}[/blue]")
+
+
+@app.command()
+def analyze_jobs(
+    urls_file: Path = typer.Argument(help="File with one job posting URL per line"),
+    resume_paths: List[Path] = typer.Argument(help="One or more resumes to analyze"),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-j", help="Number of jobs to run at the same time"
+    ),
+    output: Path = typer.Option(
+        Path("outputs") / "analyses.jsonl",
+        "--output",
+        "-o",
+        help="JSONL file to write one result per line",
+    ),
+    prompt: str = typer.Option(
+        "swe_intern", "--prompt", "-p", help="Prompt template to use"
+    ),
+    model: str = typer.Option(None, "--model", "-m", help="OpenAI model override"),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Force re-run, ignore cache"
+    ),
+    batch_api: bool = typer.Option(
+        False,
+        "--batch-api",
+        help="Submit analyses through the OpenAI Batch API (cheaper, slower)",
+    ),
+    poll_interval: float = typer.Option(
+        30.0, "--poll-interval", help="Seconds between Batch API status checks"
+    ),
+    triage: bool = typer.Option(
+        False,
+        "--triage",
+        help="Score postings locally first and skip the LLM for weak matches",
+    ),
+    triage_min: Optional[int] = typer.Option(
+        None,
+        "--triage-min",
+        help="Minimum local score to run the LLM (default SWE_SZN_TRIAGE_MIN_SCORE)",
+    ),
+):
+    from swe_szn import batch
+    from swe_szn.ui import rich
+
+    urls = batch.read_urls(str(urls_file))
+    if not urls:
+        rich.console.print(f"[red]No job URLs found in {urls_file}[/red]")
+        raise typer.Exit(1)
+
+    summary = batch.run(
+        urls,
+        [str(p) for p in resume_paths],
+        prompt_name=prompt,
+        model=model,
+        force=force,
+        concurrency=concurrency,
+        output_path=str(output),
+        batch_api=batch_api,
+        poll_interval=poll_interval,
+        triage_min=_triage_min(triage, triage_min),
+    )
+
+    rich.console.print(
+        f"[green]✓ {summary['succeeded']}/{summary['total']} jobs analyzed[/green]"
+        f" in {summary['elapsed'] / 1000.0:.1f}s"
+        + (f" [red]({summary['failed']} failed)[/red]" if summary["failed"] else "")
+    )
+    if summary["jd_chars_before"]:
+        saved = 1 - summary["jd_chars_after"] / summary["jd_chars_before"]
+        rich.console.print(f"[dim]boilerplate removed: {saved:.0%} of JD text[/dim]")
+    if summary["skipped"]:
+        rich.console.print(
+            f"[dim]{summary['skipped']} skipped by local triage"
+            " (score below the --triage-min threshold)[/dim]"
+        )
+    if summary["reused"]:
+        rich.console.print(
+            f"[dim]{summary['reused']} reused from near-duplicate postings"
+            " (--force to re-run)[/dim]"
+        )
+    rich.console.print(f"[blue]Wrote results to {summary['output']}[/blue]")
+
+
+@app.command()
+def rank(
+    resume_path: Path = typer.Argument(
+        None, help="Only rank analyses of this resume (default: every analysis)"
+    ),
+    top: int = typer.Option(20, "--top", "-k", help="Number of jobs to show"),
+    sort: str = typer.Option(
+        "match_score",
+        "--sort",
+        "-s",
+        help="match_score|skills_match|experience_alignment|keyword_coverage|created_at",
+    ),
+    min_score: int = typer.Option(None, "--min-score", help="Minimum match score"),
+    title: str = typer.Option(None, "--title", help="Role title contains"),
+    company: str = typer.Option(None, "--company", help="Company contains"),
+    location: str = typer.Option(None, "--location", help="Location contains"),
+    season: str = typer.Option(None, "--season", help="Season contains"),
+    as_json: bool = typer.Option(False, "--json", help="Print rows as JSON"),
+):
+    from swe_szn.services.cache import open_store
+    from swe_szn.services.rank import SORT_FIELDS, open_index, resume_digest
+    from swe_szn.ui import rich
+
+    if sort not in SORT_FIELDS:
+        rich.console.print(f"[red]--sort must be one of {', '.join(SORT_FIELDS)}[/red]")
+        raise typer.Exit(1)
+
+    digest = None
+    if resume_path is not None:
+        from swe_szn.services.resume import parse_resume
+
+        digest = resume_digest(parse_resume(str(resume_path)))
+
+    index = open_index()
+    # picks up analyses cached before the index existed and drops evicted ones
+    index.sync(open_store())
+    rows = index.query(
+        resume_digest=digest,
+        filters={
+            "title": title,
+            "company": company,
+            "location": location,
+            "season": season,
+        },
+        min_score=min_score,
+        sort=sort,
+        limit=top,
+    )
+
+    if as_json:
+        rich.console.print_json(json.dumps(rows))
+    elif not rows:
+        rich.console.print("[dim]no cached analyses match[/dim]")
+    else:
+        from swe_szn.ui.rank import print_ranking
+
+        print_ranking(rows, sort=sort)
+    missing = index.undigested() if digest is not None and not as_json else 0
+    if missing:
+        rich.console.print(
+            f"[dim]{missing} analyses cached before resume digests were recorded"
+            " are never matched to a resume; run `rank` without one to include"
+            " them[/dim]"
+        )
+
+
+@app.command()
+def usage(
+    by: List[str] = typer.Option(
+        ["day"],
+        "--by",
+        "-b",
+        help="Group by day|model|prompt|provider|kind|cache (repeatable)",
+    ),
+    days: int = typer.Option(
+        30, "--days", "-d", help="Only the last N days (0 for everything)"
+    ),
+    kind: str = typer.Option(
+        None,
+        "--kind",
+        "-k",
+        help="Only analysis|batch|chat|chat_summary|scrape calls",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print rows as JSON"),
+):
+    import time
+
+    from swe_szn.services import ledger
+    from swe_szn.ui import rich
+
+    bad = [f for f in by if f not in ledger.GROUP_FIELDS]
+    if bad:
+        rich.console.print(
+            f"[red]--by must be one of {', '.join(ledger.GROUP_FIELDS)}[/red]"
+        )
+        raise typer.Exit(1)
+
+    since = time.time() - days * 24 * 60 * 60 if days > 0 else None
+    entries = (e for e in ledger.read(since) if kind is None or e.get("kind") == kind)
+    rows = ledger.aggregate(entries, by)
+
+    if as_json:
+        rich.console.print_json(json.dumps(rows))
+    elif not rows:
+        rich.console.print(f"[dim]no usage recorded in {ledger.ledger_path()}[/dim]")
+    else:
+        from swe_szn.ui.usage import print_usage
+
+        span = f"last {days} days" if days > 0 else "all time"
+        print_usage(rows, by=by, title=f"Usage by {', '.join(by)} ({span})")
 
 
 @config_app.command("setup")
 def setup_config():
+    from swe_szn.config import apply as config_apply
+    from swe_szn.config import snapshot
+    from swe_szn.ui.config import check as config_check
+    from swe_szn.ui.config import setup as config_setup
+
     st = snapshot()
     updates = config_setup(st)
     if updates:
@@ -89,6 +351,9 @@ def setup_config():
 
 @config_app.command("check")
 def check_config():
+    from swe_szn.config import snapshot
+    from swe_szn.ui.config import check as config_check
+
     config_check(snapshot())
 
 
@@ -97,9 +362,128 @@ def set_config(
     key: str = typer.Argument(help="Configuration key (e.g., OPENAI_API_KEY)"),
     value: str = typer.Argument(help="Configuration value"),
 ):
+    from swe_szn.config import apply as config_apply
+    from swe_szn.config import snapshot
+    from swe_szn.ui.config import check as config_check
+
     config_apply({key: value})
     config_check(snapshot())
 
 
+@cache_app.command("stats")
+def cache_stats():
+    from swe_szn.services.cache import open_store
+    from swe_szn.ui.cache import print_stats
+
+    print_stats(open_store().stats())
+
+
+@cache_app.command("prune")
+def cache_prune(
+    namespace: str = typer.Option(
+        None, "--namespace", "-n", help="Only prune this namespace (e.g. firecrawl)"
+    ),
+):
+    from swe_szn.services.cache import open_store
+    from swe_szn.ui import rich
+
+    removed = open_store().prune(namespace)
+    for ns, count in sorted(removed.items()):
+        rich.console.print(f"[green]✓ pruned {count} entries from {ns}[/green]")
+    if not removed:
+        rich.console.print("[dim]nothing to prune[/dim]")
+
+
+@cache_app.command("clear")
+def cache_clear(
+    namespace: str = typer.Option(
+        None, "--namespace", "-n", help="Only clear this namespace (e.g. openai)"
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
+):
+    from swe_szn.services.cache import open_store
+    from swe_szn.ui import rich
+
+    target = namespace or "all namespaces"
+    if not yes and not typer.confirm(f"Delete every cache entry in {target}?"):
+        raise typer.Abort()
+    count = open_store().clear(namespace)
+    rich.console.print(f"[green]✓ cleared {count} entries from {target}[/green]")
+
+
+@resume_app.command("bench")
+def resume_bench(
+    corpus: Path = typer.Argument(help="A PDF or a directory of sample resume PDFs"),
+    extractors: List[str] = typer.Option(
+        None,
+        "--extractor",
+        "-x",
+        help="Extractor to benchmark (repeatable, default: all)",
+    ),
+    runs: int = typer.Option(3, "--runs", "-r", help="Timed runs per file"),
+):
+    from rich.table import Table
+
+    from swe_szn.services import resume
+    from swe_szn.ui import rich
+
+    paths = sorted(corpus.glob("*.pdf")) if corpus.is_dir() else [corpus]
+    if not paths:
+        rich.console.print(f"[red]No PDFs found in {corpus}[/red]")
+        raise typer.Exit(1)
+
+    rows = resume.benchmark(paths, extractors or list(resume.EXTRACTORS), runs=runs)
+
+    table = Table(title="Resume Extractors", expand=True)
+    table.add_column("File", style="cyan")
+    table.add_column("Pages", justify="right")
+    table.add_column("Extractor")
+    table.add_column("Median", justify="right")
+    table.add_column("Chars", justify="right")
+    table.add_column("Fidelity", justify="right", style="green")
+    for row in rows:
+        fidelity = row["fidelity"]
+        table.add_row(
+            str(row["file"]),
+            str(row["pages"]),
+            str(row["extractor"]),
+            f"{row['median_ms']:.1f}ms",
+            str(row["chars"]),
+            "-" if fidelity is None else f"{fidelity:.1%}",
+        )
+    rich.console.print(table)
+    rich.console.print(
+        "[dim]fidelity is token F1 against <name>.txt next to each PDF[/dim]"
+    )
+
+
+@jd_app.command("clean")
+def jd_clean(
+    sources: List[str] = typer.Argument(
+        help="Job posting URLs or markdown files to clean"
+    ),
+    show: bool = typer.Option(False, "--show", "-s", help="Print the cleaned text"),
+):
+    from swe_szn.services import firecrawl
+    from swe_szn.ui import rich
+    from swe_szn.ui.jd import print_clean_reports
+
+    rows = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            cleaned, report = firecrawl.clean_job(
+                None, path.read_text(encoding="utf-8")
+            )
+        else:
+            cleaned, report = firecrawl.clean_job(source, firecrawl.scrape_job(source))
+        rows.append((source, report))
+        if show:
+            rich.console.rule(source)
+            rich.console.print(cleaned, markup=False, highlight=False)
+
+    print_clean_reports(rows)
+
+
 if __name__ == "__main__":
     app()
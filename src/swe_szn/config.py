@@ -3,24 +3,106 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from dotenv import load_dotenv
+DAY = 24 * 60 * 60
+MB = 1024 * 1024
 
-load_dotenv()
+# per-namespace (ttl seconds, max bytes); 0 disables the limit
+DEFAULT_CACHE_POLICIES = {
+    "firecrawl": (14 * DAY, 200 * MB),
+    "openai": (0, 500 * MB),
+    "resume": (0, 50 * MB),
+    "fingerprints": (0, 50 * MB),
+}
 
 
 class Settings:
     def __init__(self, environment: Optional[dict[str, str]] = None) -> None:
         env = environment or os.environ  # do not copy; reflect live env
+        self._env = env
         self.ai_provider: str = env.get("SWE_SZN_AI_PROVIDER", "openai").strip().lower()
         self.openai_api_key: Optional[str] = env.get("OPENAI_API_KEY")
         self.firecrawl_api_key: Optional[str] = env.get("FIRECRAWL_API_KEY")
         self.openai_model: str = env.get("OPENAI_MODEL", "gpt-4o-mini")
         self.codex_model: str = env.get("CODEX_MODEL", "gpt-5.4")
 
+        # shared HTTP connection pool for the async OpenAI client
+        self.openai_max_connections: int = int(env.get("OPENAI_MAX_CONNECTIONS", "20"))
+        self.openai_max_keepalive: int = int(env.get("OPENAI_MAX_KEEPALIVE", "10"))
+        self.openai_keepalive_expiry: float = float(
+            env.get("OPENAI_KEEPALIVE_EXPIRY", "30")
+        )
+
+        # client-side rate limits shared by every request in the process (0 = off);
+        # OpenAI's depend on the account tier, so by default they are left to
+        # 429s (retry-after) and the in-flight cap: OPENAI_MAX_CONNECTIONS is its
+        # ceiling, and it shrinks on 429s and grows back on successes
+        self.openai_rpm: int = int(env.get("OPENAI_RPM", "0"))
+        self.openai_tpm: int = int(env.get("OPENAI_TPM", "0"))
+        self.firecrawl_rpm: int = int(env.get("FIRECRAWL_RPM", "100"))
+        self.firecrawl_max_concurrency: int = int(
+            env.get("FIRECRAWL_MAX_CONCURRENCY", "5")
+        )
+        # analyze-jobs sends uncached postings through one Firecrawl batch scrape
+        # when there are at least this many (0 scrapes them one by one)
+        self.firecrawl_batch_min: int = int(env.get("SWE_SZN_FIRECRAWL_BATCH_MIN", "2"))
+        # seconds between batch status polls (the SDK's own default is 2)
+        self.firecrawl_poll_interval: float = float(
+            env.get("SWE_SZN_FIRECRAWL_POLL_INTERVAL", "2")
+        )
+
+        # retries of 429s, 5xx, timeouts and dropped connections, and the
+        # per-request timeouts (seconds) that bound a hung call
+        self.max_retries: int = int(env.get("SWE_SZN_MAX_RETRIES", "4"))
+        self.openai_timeout: float = float(env.get("OPENAI_TIMEOUT", "120"))
+        self.firecrawl_timeout: float = float(env.get("FIRECRAWL_TIMEOUT", "60"))
+
+        # JD + resume tokens per request; 0 uses the model's budget in models.MODELS
+        self.input_budget: int = int(env.get("SWE_SZN_INPUT_BUDGET", "0"))
+
+        # responses (server-side conversation state) or completions
+        self.chat_backend: str = (
+            env.get("SWE_SZN_CHAT_BACKEND", "responses").strip().lower()
+        )
+        # chat keeps the last N exchanges verbatim within a token budget and
+        # folds older ones into a summary written by a cheap model
+        self.chat_keep_turns: int = int(env.get("SWE_SZN_CHAT_KEEP_TURNS", "4"))
+        self.chat_history_tokens: int = int(
+            env.get("SWE_SZN_CHAT_HISTORY_TOKENS", "3000")
+        )
+        self.chat_summary_model: str = env.get(
+            "SWE_SZN_CHAT_SUMMARY_MODEL", "gpt-4.1-nano"
+        )
+
+        # warm `codex mcp-server` workers (0 runs one `codex exec` per call)
+        self.codex_workers: int = int(env.get("SWE_SZN_CODEX_WORKERS", "2"))
+        self.codex_timeout: float = float(env.get("SWE_SZN_CODEX_TIMEOUT", "600"))
+        self.codex_startup_timeout: float = float(
+            env.get("SWE_SZN_CODEX_STARTUP_TIMEOUT", "30")
+        )
+
+        # reuse the cached analysis of a posting at least this similar (MinHash
+        # estimate of shingle overlap) for the same resume; 0 disables
+        self.dedupe_threshold: float = float(env.get("SWE_SZN_DEDUPE_THRESHOLD", "0.9"))
+
+        # --triage: postings scoring below this locally never reach the LLM
+        self.triage_min_score: int = int(env.get("SWE_SZN_TRIAGE_MIN_SCORE", "40"))
+
+        # append every provider call to <cache>/usage.jsonl for `swe-szn usage`
+        self.usage_ledger: bool = bool(int(env.get("SWE_SZN_USAGE_LEDGER", "1")))
+
         # default cache under project ./cache unless overridden
         self.cache_root: Path = Path(env.get("SWE_SZN_CACHE_DIR", "cache")).resolve()
+        # resume PDF extraction backend and process pool size (1 = in-process;
+        # the pool only pays off for very long PDFs, see resume.MIN_PARALLEL_PAGES)
+        self.resume_extractor: str = env.get("SWE_SZN_RESUME_EXTRACTOR", "pypdf")
+        self.pdf_workers: int = int(env.get("SWE_SZN_PDF_WORKERS", "1"))
+
+        # sqlite (single file) or json (one file per entry)
+        self.cache_backend: str = (
+            env.get("SWE_SZN_CACHE_BACKEND", "sqlite").strip().lower()
+        )
 
     def require_openai_key(self) -> str:
         if not self.openai_api_key:
@@ -32,14 +114,38 @@ class Settings:
             raise RuntimeError("FIRECRAWL_API_KEY not set")
         return self.firecrawl_api_key
 
+    def cache_policy(self, namespace: str) -> Tuple[int, int]:
+        """(ttl seconds, max bytes) for a cache namespace, from
+        SWE_SZN_CACHE_TTL_<NS> and SWE_SZN_CACHE_MAX_BYTES_<NS>"""
+        ttl, max_bytes = DEFAULT_CACHE_POLICIES.get(namespace, (0, 0))
+        suffix = namespace.upper()
+        ttl = int(self._env.get(f"SWE_SZN_CACHE_TTL_{suffix}", ttl))
+        max_bytes = int(self._env.get(f"SWE_SZN_CACHE_MAX_BYTES_{suffix}", max_bytes))
+        return ttl, max_bytes
+
     def cache_dir(self, *parts: str) -> Path:
         p = self.cache_root.joinpath(*parts)
         p.mkdir(parents=True, exist_ok=True)
         return p
 
 
+_env_loaded = False
+
+
+def load_env(override: bool = False) -> None:
+    """read .env into os.environ; deferred so importing config stays cheap"""
+    global _env_loaded
+    if _env_loaded and not override:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv(override=override)
+    _env_loaded = True
+
+
 @lru_cache(maxsize=1)
 def settings() -> Settings:
+    load_env()
     return Settings()
 
 
@@ -103,5 +209,5 @@ def apply(updates: Dict[str, str]) -> None:
 
 
 def refresh() -> None:
-    load_dotenv(override=True)
+    load_env(override=True)
     settings.cache_clear()
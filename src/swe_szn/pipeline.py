@@ -0,0 +1,71 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from swe_szn import trace
+
+
+class Stage:
+    """a named unit of work that runs once all of its dependencies have finished
+
+    `fn` is called with the results of `deps` as keyword arguments
+    """
+
+    def __init__(
+        self, name: str, fn: Callable[..., Any], deps: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+def _check(stages: List[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    known = set(names)
+    for s in stages:
+        missing = [d for d in s.deps if d not in known]
+        if missing:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stages {missing}")
+
+
+def _run_stage(stage: Stage, kwargs: Dict[str, Any]) -> Any:
+    with trace.span(stage.name):
+        return stage.fn(**kwargs)
+
+
+def run_graph(
+    stages: List[Stage], *, max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """run stages as a dependency graph, independent stages run in parallel"""
+    _check(stages)
+    pending = {s.name: s for s in stages}
+    results: Dict[str, Any] = {}
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages)) as pool:
+        while pending or running:
+            ready = [s for s in pending.values() if all(d in results for d in s.deps)]
+            for s in ready:
+                del pending[s.name]
+                kwargs = {d: results[d] for d in s.deps}
+                # each stage runs in a copy of the caller's context, so spans
+                # opened inside nest under the caller's
+                ctx = contextvars.copy_context()
+                running[pool.submit(ctx.run, _run_stage, s, kwargs)] = s.name
+
+            if not running:
+                raise ValueError(f"Dependency cycle between stages {list(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                exc = fut.exception()
+                if exc is not None:
+                    for other in running:
+                        other.cancel()
+                    raise exc
+                results[name] = fut.result()
+
+    return results
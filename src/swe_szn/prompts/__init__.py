@@ -1,14 +1,113 @@
+import os
+import threading
 from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
+from swe_szn.config import load_env
+
 PROMPTS_DIR = Path(__file__).resolve().parent
 
+# placeholders every user_template must fill
+REQUIRED_FIELDS = {"job", "resume"}
+
+
+def _validate(path: Path, prompt: dict) -> dict:
+    """check a loaded prompt before it is ever formatted"""
+    if not isinstance(prompt, dict):
+        raise ValueError(f"Prompt {path} must be a YAML mapping")
+    for key in ("system", "user_template"):
+        if not isinstance(prompt.get(key), str):
+            raise ValueError(f"Prompt {path} is missing a `{key}` string")
+
+    try:
+        fields = {
+            name for _, name, _, _ in Formatter().parse(prompt["user_template"]) if name
+        }
+    except ValueError as exc:
+        raise ValueError(f"Prompt {path} has a malformed user_template: {exc}") from exc
+    missing = REQUIRED_FIELDS - fields
+    unknown = fields - REQUIRED_FIELDS
+    if missing or unknown:
+        raise ValueError(
+            f"Prompt {path} user_template must use exactly {{job}} and {{resume}}"
+            f" (missing: {sorted(missing)}, unknown: {sorted(unknown)})"
+        )
+    return prompt
+
+
+class PromptRegistry:
+    """loads prompt templates once and reloads a file only when its mtime changes
+
+    directories are searched in order, so user directories can override the
+    bundled prompts by name
+    """
+
+    def __init__(self, dirs: List[Path]) -> None:
+        self.dirs = [Path(d) for d in dirs]
+        self._lock = threading.Lock()
+        # name -> (path, mtime_ns, prompt)
+        self._cache: Dict[str, Tuple[Path, int, dict]] = {}
+
+    def _find(self, name: str) -> Optional[Path]:
+        for d in self.dirs:
+            for suffix in (".yml", ".yaml"):
+                path = d / f"{name}{suffix}"
+                if path.exists():
+                    return path
+        return None
+
+    def get(self, name: str) -> dict:
+        with self._lock:
+            hit = self._cache.get(name)
+            if hit is not None:
+                path, mtime, prompt = hit
+                try:
+                    if path.stat().st_mtime_ns == mtime:
+                        return prompt
+                except FileNotFoundError:
+                    pass
+
+            path = self._find(name)
+            if path is None:
+                raise FileNotFoundError(
+                    f"Prompt not found: {name} (searched {', '.join(map(str, self.dirs))})"
+                )
+            mtime = path.stat().st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                prompt = _validate(path, yaml.safe_load(f))
+            self._cache[name] = (path, mtime, prompt)
+            return prompt
+
+    def names(self) -> List[str]:
+        found = set()
+        for d in self.dirs:
+            if d.exists():
+                found.update(p.stem for p in d.glob("*.y*ml"))
+        return sorted(found)
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_source: Optional[str] = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> PromptRegistry:
+    """the shared registry; SWE_SZN_PROMPTS_DIR lists user prompt directories
+    (os.pathsep separated) searched before the bundled ones"""
+    global _registry, _registry_source
+    load_env()
+    user = os.environ.get("SWE_SZN_PROMPTS_DIR", "")
+    with _registry_lock:
+        if _registry is None or _registry_source != user:
+            dirs = [Path(d).expanduser().resolve() for d in user.split(os.pathsep) if d]
+            _registry = PromptRegistry(dirs + [PROMPTS_DIR])
+            _registry_source = user
+        return _registry
+
 
 def load_prompt(name: str) -> dict:
     """load a prompt YAML by name"""
-    path = PROMPTS_DIR / f"{name}.yml"
-    if not path.exists():
-        raise FileNotFoundError(f"Prompt not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return registry().get(name)
@@ -0,0 +1,240 @@
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from swe_szn.config import settings
+from swe_szn.services.openai.models import input_budget
+
+# sections are dropped lowest priority first once the inputs are over budget
+JOB_PRIORITIES: List[Tuple[int, Tuple[str, ...]]] = [
+    (
+        0,
+        (
+            "benefit",
+            "perk",
+            "compensation",
+            "salary",
+            "pay range",
+            "equal opportunity",
+            "eeo",
+            "diversity",
+            "accommodation",
+            "privacy",
+            "about us",
+            "about the company",
+            "who we are",
+            "our culture",
+            "life at",
+            "how to apply",
+            "legal",
+            "disclaimer",
+        ),
+    ),
+    (
+        3,
+        (
+            "requirement",
+            "qualification",
+            "must have",
+            "you have",
+            "you'll need",
+            "looking for",
+            "skill",
+            "experience",
+            "tech",
+            "stack",
+            "preferred",
+            "nice to have",
+            "bonus",
+        ),
+    ),
+    (
+        2,
+        (
+            "responsibilit",
+            "you'll do",
+            "you will do",
+            "the role",
+            "the job",
+            "position",
+            "day to day",
+            "duties",
+        ),
+    ),
+]
+
+RESUME_PRIORITIES: List[Tuple[int, Tuple[str, ...]]] = [
+    (0, ("reference", "interest", "hobbies", "activities")),
+    (3, ("experience", "employment", "work history", "skill", "project", "technical")),
+    (2, ("education", "summary", "objective", "award", "certification")),
+]
+
+DEFAULT_PRIORITY = 1
+INTRO_PRIORITY = 2  # text before the first heading (title, company, contact)
+
+# below this many tokens a partial section is not worth keeping
+MIN_PARTIAL_TOKENS = 32
+
+_HEADING = re.compile(
+    r"^\s{0,3}(?:"
+    r"#{1,6}\s+(?P<md>.+?)\s*#*"  # markdown heading
+    r"|\*\*(?P<bold>[^*]{2,80})\*\*:?"  # **Bold line**
+    r"|(?P<colon>[A-Z][\w &/,'()-]{2,60}):"  # Requirements:
+    r"|(?P<caps>[A-Z][A-Z &/,'-]{2,40})"  # EXPERIENCE
+    r")\s*$"
+)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Optional[Any]:
+    """tiktoken encoding for a model, None when tiktoken is not installed"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def tokenizer_name(model: str) -> str:
+    enc = _encoding(model)
+    return f"tiktoken/{enc.name}" if enc is not None else "chars/4"
+
+
+def count_tokens(text: str, model: str) -> int:
+    """exact with tiktoken, otherwise ~4 characters per token"""
+    if not text:
+        return 0
+    enc = _encoding(model)
+    if enc is None:
+        return math.ceil(len(text) / 4)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """cut text to at most max_tokens, backing off to a line or word boundary"""
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding(model)
+    if enc is None:
+        cut = text[: max_tokens * 4]
+    else:
+        tokens = enc.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        cut = enc.decode(tokens[:max_tokens])
+    if len(cut) >= len(text):
+        return text
+    for sep in ("\n", " "):
+        idx = cut.rfind(sep)
+        if idx > len(cut) * 0.8:
+            return cut[:idx].rstrip()
+    return cut
+
+
+def _priority(heading: str, table: List[Tuple[int, Tuple[str, ...]]]) -> int:
+    lower = heading.lower()
+    for priority, words in table:
+        if any(w in lower for w in words):
+            return priority
+    return DEFAULT_PRIORITY
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """(heading, text) pairs in document order; the heading line is part of text"""
+    sections: List[Tuple[str, str]] = []
+    heading = ""
+    lines: List[str] = []
+    for line in text.splitlines(keepends=True):
+        m = _HEADING.match(line.rstrip("\n"))
+        if m:
+            if lines:
+                sections.append((heading, "".join(lines)))
+            heading = next(g for g in m.groups() if g).strip()
+            lines = []
+        lines.append(line)
+    if lines:
+        sections.append((heading, "".join(lines)))
+    return sections
+
+
+def fit(
+    text: str,
+    budget: int,
+    model: str,
+    priorities: List[Tuple[int, Tuple[str, ...]]],
+) -> Tuple[str, List[str]]:
+    """keep the highest-priority sections of text within budget tokens
+
+    kept sections stay in document order; returns (text, dropped headings)
+    """
+    if count_tokens(text, model) <= budget:
+        return text, []
+
+    sections = split_sections(text)
+    sizes = [count_tokens(body, model) for _, body in sections]
+
+    def rank(i: int) -> Tuple[int, int]:
+        heading = sections[i][0]
+        priority = _priority(heading, priorities) if heading else INTRO_PRIORITY
+        return -priority, i
+
+    order = sorted(range(len(sections)), key=rank)
+
+    kept: Dict[int, str] = {}
+    left = budget
+    for i in order:
+        if sizes[i] <= left:
+            kept[i] = sections[i][1]
+            left -= sizes[i]
+        elif left >= MIN_PARTIAL_TOKENS:
+            kept[i] = truncate_tokens(sections[i][1], left, model) + "\n"
+            left = 0
+
+    dropped = [
+        sections[i][0] or "(intro)" for i in range(len(sections)) if i not in kept
+    ]
+    return "".join(kept[i] for i in sorted(kept)).rstrip() + "\n", dropped
+
+
+def allocate(
+    jd_markdown: str, resume_text: str, model: str, budget: Optional[int] = None
+) -> Tuple[str, str, Dict[str, Any]]:
+    """fit the JD and resume into the model's input budget
+
+    each side gets half the budget, and whatever one side does not need goes
+    to the other. returns (jd, resume, report) where report records the tokens
+    used for the `_meta` of a result
+    """
+    budget = budget or settings().input_budget or input_budget(model)
+    job_tokens = count_tokens(jd_markdown, model)
+    resume_tokens = count_tokens(resume_text, model)
+
+    half = budget // 2
+    if job_tokens + resume_tokens <= budget:
+        job_budget, resume_budget = job_tokens, resume_tokens
+    elif job_tokens <= half:
+        job_budget, resume_budget = job_tokens, budget - job_tokens
+    elif resume_tokens <= half:
+        job_budget, resume_budget = budget - resume_tokens, resume_tokens
+    else:
+        job_budget, resume_budget = budget - half, half
+
+    job, job_dropped = fit(jd_markdown, job_budget, model, JOB_PRIORITIES)
+    resume, resume_dropped = fit(resume_text, resume_budget, model, RESUME_PRIORITIES)
+
+    used_job = count_tokens(job, model)
+    used_resume = count_tokens(resume, model)
+    report = {
+        "budget": budget,
+        "tokenizer": tokenizer_name(model),
+        "job_tokens": used_job,
+        "resume_tokens": used_resume,
+        "used_tokens": used_job + used_resume,
+        "original_tokens": job_tokens + resume_tokens,
+        "dropped": {"job": job_dropped, "resume": resume_dropped},
+    }
+    return job, resume, report
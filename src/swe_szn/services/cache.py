@@ -1,9 +1,25 @@
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from swe_szn.config import settings
+
+# namespaces written by earlier versions as one JSON file per entry
+LEGACY_NAMESPACES = ("firecrawl", "openai")
+COUNTER_NAMES = ("hits", "misses", "writes", "evictions", "expirations")
+# keys per query when SqliteBackend.peek reads entries in bulk
+PEEK_CHUNK = 500
+# where JsonDirBackend files keep their creation time
+CREATED_FIELD = "_cache_created_at"
 
 
 def ensure_dir(path: Union[str, Path]) -> Path:
@@ -46,3 +62,625 @@ def strip_json_code_fence(content: str) -> str:
         if s.startswith("json"):
             s = s[4:].strip()
     return s
+
+
+class CacheBackend(ABC):
+    """key/value store for cache entries, grouped by namespace (firecrawl, openai)
+
+    every namespace has a TTL and max-bytes policy from settings: expired
+    entries read as misses, and writes evict least recently used entries
+    once the namespace is over its byte cap
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[tuple[str, str], int] = {}
+        self._counter_lock = threading.Lock()
+
+    def _count(self, namespace: str, name: str, n: int = 1) -> None:
+        with self._counter_lock:
+            k = (namespace, name)
+            self._counters[k] = self._counters.get(k, 0) + n
+
+    def _take_counters(self) -> Dict[tuple[str, str], int]:
+        with self._counter_lock:
+            counters, self._counters = self._counters, {}
+        return counters
+
+    def _expired(self, namespace: str, created_at: float) -> bool:
+        ttl, _ = settings().cache_policy(namespace)
+        return bool(ttl) and created_at < time.time() - ttl
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[dict[str, Any]]: ...
+
+    @abstractmethod
+    def peek(
+        self, namespace: str, keys: Iterable[str]
+    ) -> Iterator[tuple[str, dict[str, Any], float]]:
+        """(key, data, created_at) of unexpired entries among `keys`, for bulk
+        reads such as indexing: no hit/miss counts and no access-time update"""
+
+    @abstractmethod
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        data: dict[str, Any],
+        *,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        url: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ) -> None: ...
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None: ...
+
+    @abstractmethod
+    def keys(self, namespace: str) -> Iterator[str]: ...
+
+    @abstractmethod
+    def namespaces(self) -> list[str]: ...
+
+    @abstractmethod
+    def prune(self, namespace: Optional[str] = None) -> Dict[str, int]:
+        """drop expired entries and enforce byte caps, returns removed count per namespace"""
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> int: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """entries, bytes, age and hit/miss/eviction counters per namespace"""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonDirBackend(CacheBackend):
+    """one pretty-printed JSON file per entry, the original cache layout
+
+    with `namespaced=False` every entry lives directly under `root`. each file
+    keeps its creation time under CREATED_FIELD (dropped on read) and its mtime
+    is the last access, which eviction goes by. namespace sizes are scanned
+    once per process and then kept up to date, so a put only walks the
+    directory when it has to evict. counters only live for the process
+    """
+
+    def __init__(self, root: Union[str, Path], *, namespaced: bool = True) -> None:
+        super().__init__()
+        self.root = Path(root)
+        self.namespaced = namespaced
+        self._bytes: Dict[str, int] = {}
+
+    def _dir(self, namespace: str) -> Path:
+        return self.root / namespace if self.namespaced else self.root
+
+    def _files(self, namespace: str) -> list[os.DirEntry]:
+        d = self._dir(namespace)
+        if not d.exists():
+            return []
+        return [e for e in os.scandir(d) if e.name.endswith(".json")]
+
+    @staticmethod
+    def _created(path: Union[str, Path], data: Optional[dict[str, Any]]) -> float:
+        """stored creation time; files from before it was stored use mtime"""
+        created = (data or {}).get(CREATED_FIELD)
+        return created if created is not None else os.stat(path).st_mtime
+
+    def _grow(self, namespace: str, delta: int) -> None:
+        with self._counter_lock:
+            if namespace in self._bytes:
+                self._bytes[namespace] += delta
+
+    def _total(self, namespace: str) -> int:
+        with self._counter_lock:
+            total = self._bytes.get(namespace)
+        if total is None:
+            total = sum(e.stat().st_size for e in self._files(namespace))
+            with self._counter_lock:
+                self._bytes[namespace] = total
+        return total
+
+    def get(self, namespace: str, key: str) -> Optional[dict[str, Any]]:
+        path = self._dir(namespace) / f"{key}.json"
+        data = load_json(path)
+        if data is None or self._expired(namespace, self._created(path, data)):
+            self._count(namespace, "misses")
+            return None
+        self._count(namespace, "hits")
+        if data.pop(CREATED_FIELD, None) is not None:
+            # mtime is the access time; files without a stored creation time
+            # keep theirs, it is all they have to expire by
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return data
+
+    def peek(self, namespace, keys):
+        for key in keys:
+            path = self._dir(namespace) / f"{key}.json"
+            data = load_json(path)
+            if data is None:
+                continue
+            created = self._created(path, data)
+            if not self._expired(namespace, created):
+                data.pop(CREATED_FIELD, None)
+                yield key, data, created
+
+    def put(
+        self,
+        namespace,
+        key,
+        data,
+        *,
+        provider=None,
+        model=None,
+        url=None,
+        created_at=None,
+    ):
+        path = self._dir(namespace) / f"{key}.json"
+        try:
+            old = path.stat().st_size
+        except OSError:
+            old = 0
+        created = created_at if created_at is not None else time.time()
+        save_json(path, {**data, CREATED_FIELD: created})
+        self._count(namespace, "writes")
+        self._grow(namespace, path.stat().st_size - old)
+        self._evict(namespace)
+
+    def _evict(self, namespace: str) -> int:
+        _, max_bytes = settings().cache_policy(namespace)
+        if not max_bytes or self._total(namespace) <= max_bytes:
+            return 0
+        # least recently used first; the rescan also picks up other processes'
+        # writes
+        files = sorted(self._files(namespace), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in files)
+        removed = 0
+        for e in files:
+            if total <= max_bytes:
+                break
+            total -= e.stat().st_size
+            os.unlink(e.path)
+            removed += 1
+        with self._counter_lock:
+            self._bytes[namespace] = total
+        self._count(namespace, "evictions", removed)
+        return removed
+
+    def delete(self, namespace: str, key: str) -> None:
+        path = self._dir(namespace) / f"{key}.json"
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        path.unlink(missing_ok=True)
+        self._grow(namespace, -size)
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        for e in self._files(namespace):
+            yield e.name[: -len(".json")]
+
+    def namespaces(self) -> list[str]:
+        if not self.namespaced or not self.root.exists():
+            return []
+        return sorted(
+            e.name for e in os.scandir(self.root) if e.is_dir() and self._files(e.name)
+        )
+
+    def prune(self, namespace: Optional[str] = None) -> Dict[str, int]:
+        removed = {}
+        for ns in [namespace] if namespace else self.namespaces():
+            count = 0
+            for e in self._files(ns):
+                if self._expired(ns, self._created(e.path, load_json(e.path))):
+                    os.unlink(e.path)
+                    count += 1
+            self._count(ns, "expirations", count)
+            with self._counter_lock:
+                self._bytes.pop(ns, None)
+            removed[ns] = count + self._evict(ns)
+        return removed
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        count = 0
+        for ns in [namespace] if namespace else self.namespaces():
+            for e in self._files(ns):
+                os.unlink(e.path)
+                count += 1
+            with self._counter_lock:
+                self._bytes.pop(ns, None)
+        return count
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for ns in self.namespaces():
+            files = self._files(ns)
+            created = [self._created(e.path, load_json(e.path)) for e in files]
+            out[ns] = {
+                "entries": len(files),
+                "bytes": sum(e.stat().st_size for e in files),
+                "oldest": min(created, default=None),
+                "newest": max(created, default=None),
+                **{name: self._counters.get((ns, name), 0) for name in COUNTER_NAMES},
+            }
+        return out
+
+
+class SqliteBackend(CacheBackend):
+    """single-file SQLite store (WAL mode) indexed by key, provider, model, url and time"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        provider TEXT,
+        model TEXT,
+        url TEXT,
+        created_at REAL NOT NULL,
+        accessed_at REAL,
+        size INTEGER,
+        data TEXT NOT NULL,
+        PRIMARY KEY (namespace, key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_entries_provider_model
+        ON entries (namespace, provider, model);
+    CREATE INDEX IF NOT EXISTS idx_entries_url ON entries (url);
+    CREATE INDEX IF NOT EXISTS idx_entries_created ON entries (namespace, created_at);
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE IF NOT EXISTS counters (
+        namespace TEXT NOT NULL,
+        name TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (namespace, name)
+    );
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # reads only record access times, they are written back in bulk
+        self._touched: Dict[tuple[str, str], float] = {}
+        with self._write_lock:
+            conn = self._conn()
+            conn.executescript(self.SCHEMA)
+            self._upgrade(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_accessed"
+                " ON entries (namespace, accessed_at)"
+            )
+            conn.commit()
+
+    @staticmethod
+    def _upgrade(conn: sqlite3.Connection) -> None:
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+        if "accessed_at" not in cols:
+            conn.execute("ALTER TABLE entries ADD COLUMN accessed_at REAL")
+            conn.execute("UPDATE entries SET accessed_at = created_at")
+        if "size" not in cols:
+            conn.execute("ALTER TABLE entries ADD COLUMN size INTEGER")
+            conn.execute("UPDATE entries SET size = length(CAST(data AS BLOB))")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections are per-thread, batch workers each get their own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[dict[str, Any]]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT data, created_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            .fetchone()
+        )
+        if row is None or self._expired(namespace, row[1]):
+            self._count(namespace, "misses")
+            return None
+        try:
+            data = json.loads(row[0])
+        except Exception:
+            self._count(namespace, "misses")
+            return None
+        self._count(namespace, "hits")
+        with self._counter_lock:
+            self._touched[(namespace, key)] = time.time()
+        return data
+
+    def peek(self, namespace, keys):
+        keys = list(keys)
+        conn = self._conn()
+        # stay under sqlite's bound-parameter limit
+        for i in range(0, len(keys), PEEK_CHUNK):
+            chunk = keys[i : i + PEEK_CHUNK]
+            rows = conn.execute(
+                "SELECT key, data, created_at FROM entries WHERE namespace = ?"
+                f" AND key IN ({', '.join('?' * len(chunk))})",
+                (namespace, *chunk),
+            ).fetchall()
+            for key, payload, created_at in rows:
+                if self._expired(namespace, created_at):
+                    continue
+                try:
+                    data = json.loads(payload)
+                except Exception:
+                    continue
+                yield key, data, created_at
+
+    def put(
+        self,
+        namespace,
+        key,
+        data,
+        *,
+        provider=None,
+        model=None,
+        url=None,
+        created_at=None,
+    ):
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        self._count(namespace, "writes")
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (namespace, key, provider, model, url, created_at, accessed_at,"
+                " size, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    key,
+                    provider,
+                    model,
+                    url,
+                    created_at or now,
+                    created_at or now,
+                    len(payload.encode("utf-8")),
+                    payload,
+                ),
+            )
+            self._flush(conn)
+            self._evict(conn, namespace)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, namespace: str) -> int:
+        """drop least recently used entries until the namespace fits its cap"""
+        _, max_bytes = settings().cache_policy(namespace)
+        if not max_bytes:
+            return 0
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+            (namespace,),
+        ).fetchone()
+        if total <= max_bytes:
+            return 0
+        victims = []
+        rows = conn.execute(
+            "SELECT key, size FROM entries WHERE namespace = ?"
+            " ORDER BY accessed_at ASC",
+            (namespace,),
+        )
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            victims.append((namespace, key))
+            total -= size or 0
+        conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+        self._bump(conn, namespace, "evictions", len(victims))
+        return len(victims)
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, namespace: str, name: str, n: int) -> None:
+        if not n:
+            return
+        conn.execute(
+            "INSERT INTO counters (namespace, name, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (namespace, name) DO UPDATE SET value = value + excluded.value",
+            (namespace, name, n),
+        )
+
+    def _flush(self, conn: sqlite3.Connection) -> None:
+        with self._counter_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                [(ts, ns, key) for (ns, key), ts in touched.items()],
+            )
+        for (ns, name), n in self._take_counters().items():
+            self._bump(conn, ns, name, n)
+
+    def flush(self) -> None:
+        """write buffered access times and counters"""
+        with self._write_lock:
+            conn = self._conn()
+            self._flush(conn)
+            conn.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            conn.commit()
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        rows = self._conn().execute(
+            "SELECT key FROM entries WHERE namespace = ? ORDER BY created_at",
+            (namespace,),
+        )
+        for (key,) in rows.fetchall():
+            yield key
+
+    def namespaces(self) -> list[str]:
+        rows = self._conn().execute(
+            "SELECT DISTINCT namespace FROM entries ORDER BY namespace"
+        )
+        return [ns for (ns,) in rows.fetchall()]
+
+    def prune(self, namespace: Optional[str] = None) -> Dict[str, int]:
+        removed = {}
+        with self._write_lock:
+            conn = self._conn()
+            self._flush(conn)
+            for ns in [namespace] if namespace else self.namespaces():
+                ttl, _ = settings().cache_policy(ns)
+                count = 0
+                if ttl:
+                    count = conn.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND created_at < ?",
+                        (ns, time.time() - ttl),
+                    ).rowcount
+                    self._bump(conn, ns, "expirations", count)
+                removed[ns] = count + self._evict(conn, ns)
+            conn.commit()
+        return removed
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        with self._write_lock:
+            conn = self._conn()
+            self._flush(conn)
+            if namespace:
+                count = conn.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                ).rowcount
+                conn.execute("DELETE FROM counters WHERE namespace = ?", (namespace,))
+            else:
+                count = conn.execute("DELETE FROM entries").rowcount
+                conn.execute("DELETE FROM counters")
+            conn.commit()
+            conn.execute("VACUUM")
+        return count
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        self.flush()
+        conn = self._conn()
+        out: Dict[str, Dict[str, Any]] = {}
+        rows = conn.execute(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0),"
+            " MIN(created_at), MAX(created_at) FROM entries GROUP BY namespace"
+        )
+        for ns, entries, size, oldest, newest in rows.fetchall():
+            out[ns] = {
+                "entries": entries,
+                "bytes": size,
+                "oldest": oldest,
+                "newest": newest,
+            }
+        for ns, name, value in conn.execute(
+            "SELECT namespace, name, value FROM counters"
+        ).fetchall():
+            out.setdefault(
+                ns, {"entries": 0, "bytes": 0, "oldest": None, "newest": None}
+            )[name] = value
+        for ns in out.values():
+            for name in COUNTER_NAMES:
+                ns.setdefault(name, 0)
+        return out
+
+    def get_meta(self, name: str) -> Optional[str]:
+        row = (
+            self._conn()
+            .execute("SELECT value FROM meta WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                (name, value),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _entry_fields(namespace: str, data: dict[str, Any]) -> Dict[str, Any]:
+    """pull index columns out of a legacy JSON entry"""
+    if namespace == "firecrawl":
+        return {"url": data.get("url"), "created_at": data.get("timestamp")}
+    meta = data.get("_meta") or {}
+    return {
+        "provider": meta.get("provider"),
+        "model": meta.get("model"),
+        "url": meta.get("job_url"),
+    }
+
+
+def migrate_json(store: SqliteBackend, root: Union[str, Path]) -> int:
+    """import one-file-per-entry JSON caches under `root` into the SQLite store"""
+    count = 0
+    for namespace in LEGACY_NAMESPACES:
+        for path in sorted((Path(root) / namespace).glob("*.json")):
+            data = load_json(path)
+            if data is None:
+                continue
+            created = data.pop(CREATED_FIELD, None)
+            fields = _entry_fields(namespace, data)
+            fields["created_at"] = (
+                created or fields.get("created_at") or path.stat().st_mtime
+            )
+            store.put(namespace, path.stem, data, **fields)
+            count += 1
+    return count
+
+
+_stores: Dict[tuple, CacheBackend] = {}
+_stores_lock = threading.Lock()
+
+
+def _default_store() -> CacheBackend:
+    s = settings()
+    ident = (s.cache_backend, str(s.cache_root))
+    with _stores_lock:
+        store = _stores.get(ident)
+        if store is None:
+            if s.cache_backend == "json":
+                store = JsonDirBackend(s.cache_root)
+            else:
+                store = SqliteBackend(s.cache_root / "cache.sqlite3")
+                # one-time import of the old JSON files
+                if store.get_meta("json_migrated") is None:
+                    migrate_json(store, s.cache_root)
+                    store.set_meta("json_migrated", str(time.time()))
+            # persist buffered access times and hit/miss counters on exit
+            atexit.register(store.flush)
+            _stores[ident] = store
+        return store
+
+
+def open_store(cache_dir: Optional[Union[str, Path]] = None) -> CacheBackend:
+    """return the configured cache store, or a flat JSON store at `cache_dir`"""
+    if cache_dir is None:
+        return _default_store()
+    # one instance per directory, so its size is only scanned once
+    ident = ("dir", str(Path(cache_dir).resolve()))
+    with _stores_lock:
+        store = _stores.get(ident)
+        if store is None:
+            store = _stores[ident] = JsonDirBackend(cache_dir, namespaced=False)
+        return store
@@ -1,12 +1,20 @@
-import re
+import atexit
+import itertools
+import json
+import queue
 import subprocess
 import tempfile
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional
 
 from swe_szn.config import settings
 from swe_szn.prompts import load_prompt
+from swe_szn.services import budget, ledger
 
 
 def provider_name() -> str:
@@ -17,6 +25,9 @@ def default_model() -> str:
     return settings().codex_model
 
 
+_NOT_FOUND = "Codex CLI not found. Install it with `npm i -g @openai/codex` and sign in with your ChatGPT account."
+
+
 def _exec(prompt: str, *, model: Optional[str] = None) -> tuple[str, int]:
     use_model = model or default_model()
     cmd = ["codex", "exec", "--sandbox", "read-only", "--skip-git-repo-check"]
@@ -37,9 +48,7 @@ def _exec(prompt: str, *, model: Optional[str] = None) -> tuple[str, int]:
                 cwd=Path.cwd(),
             )
         except FileNotFoundError as exc:
-            raise RuntimeError(
-                "Codex CLI not found. Install it with `npm i -g @openai/codex` and sign in with your ChatGPT account."
-            ) from exc
+            raise RuntimeError(_NOT_FOUND) from exc
         except subprocess.CalledProcessError as exc:
             stderr = (exc.stderr or "").strip()
             stdout = (exc.stdout or "").strip()
@@ -54,6 +63,418 @@ def _exec(prompt: str, *, model: Optional[str] = None) -> tuple[str, int]:
         return fallback, elapsed
 
 
+class _Unavailable(Exception):
+    """the installed codex cannot run as a persistent worker"""
+
+
+class _Cancelled(Exception):
+    """the caller stopped reading, the codex session was killed"""
+
+
+class _Worker:
+    """one long-lived `codex mcp-server` process speaking JSON-RPC over stdio
+
+    each `tools/call` starts a fresh Codex session inside the warm process,
+    so the CLI startup and auth cost is paid once per worker, not per call
+    """
+
+    def __init__(self) -> None:
+        try:
+            self.proc = subprocess.Popen(
+                ["codex", "mcp-server"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+                cwd=Path.cwd(),
+            )
+        except FileNotFoundError as exc:
+            raise _Unavailable("codex not found") from exc
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._listeners: Dict[int, Callable[[dict], None]] = {}
+        threading.Thread(target=self._read, name="swe-szn-codex", daemon=True).start()
+
+        try:
+            self.request(
+                "initialize",
+                {
+                    "protocolVersion": "2025-06-18",
+                    "capabilities": {},
+                    "clientInfo": {"name": "swe-szn", "version": "0.1.0"},
+                },
+                timeout=settings().codex_startup_timeout,
+            )
+        except RuntimeError as exc:
+            self.close()
+            raise _Unavailable(str(exc)) from exc
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _send(self, message: dict) -> None:
+        with self._write_lock:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue  # stray log output
+            if "id" in message and "method" in message:
+                # server-initiated request (e.g. an approval prompt), never granted
+                self._send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message["id"],
+                        "error": {"code": -32601, "message": "not supported"},
+                    }
+                )
+            elif "id" in message:
+                with self._lock:
+                    fut = self._pending.pop(message["id"], None)
+                if fut is not None:
+                    fut.set_result(message)
+            elif message.get("method") == "codex/event":
+                params = message.get("params") or {}
+                request_id = (params.get("_meta") or {}).get("requestId")
+                listener = self._listeners.get(request_id)
+                if listener is not None:
+                    listener(params.get("msg") or {})
+
+        # process exited, fail whatever is still waiting
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_exception(RuntimeError("codex mcp-server exited"))
+
+    def request(
+        self,
+        method: str,
+        params: dict,
+        *,
+        timeout: float,
+        on_event: Optional[Callable[[dict], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> dict:
+        request_id = next(self._ids)
+        fut: Future = Future()
+        with self._lock:
+            self._pending[request_id] = fut
+        if on_event is not None:
+            self._listeners[request_id] = on_event
+        try:
+            try:
+                self._send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": method,
+                        "params": params,
+                    }
+                )
+            except (BrokenPipeError, ValueError) as exc:
+                raise RuntimeError("codex mcp-server exited") from exc
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if cancel is not None and cancel.is_set():
+                    self.close()  # session is mid-answer, never reuse this worker
+                    raise _Cancelled()
+                if remaining <= 0:
+                    self.close()  # state unknown, never reuse this worker
+                    raise RuntimeError(f"Codex request timed out after {timeout:g}s")
+                try:
+                    # poll so a cancel is noticed while the answer is running
+                    message = fut.result(
+                        timeout=min(remaining, 0.1) if cancel else remaining
+                    )
+                    break
+                except FutureTimeout:
+                    continue
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            self._listeners.pop(request_id, None)
+
+        if "error" in message:
+            error = message["error"] or {}
+            raise RuntimeError(f"Codex CLI request failed: {error.get('message')}")
+        return message.get("result") or {}
+
+    def close(self) -> None:
+        if self.alive():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+
+
+class _Pool:
+    """up to `size` warm workers, each handling one call at a time"""
+
+    def __init__(self, size: int) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+
+    @contextmanager
+    def worker(self) -> Iterator[_Worker]:
+        with self._slots:
+            with self._lock:
+                worker = None
+                while self._idle and worker is None:
+                    candidate = self._idle.pop()
+                    worker = candidate if candidate.alive() else None
+            if worker is None:
+                worker = _Worker()
+            try:
+                yield worker
+            finally:
+                if worker.alive():
+                    with self._lock:
+                        self._idle.append(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+_pool: Optional[_Pool] = None
+_pool_lock = threading.Lock()
+_mcp_unavailable = False
+
+
+def _get_pool() -> _Pool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _Pool(settings().codex_workers)
+            atexit.register(_pool.close)
+        return _pool
+
+
+def _call(
+    prompt: str,
+    *,
+    model: Optional[str] = None,
+    on_event: Optional[Callable[[dict], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> tuple[str, int]:
+    """run one prompt on a pooled `codex mcp-server` worker"""
+    arguments = {
+        "prompt": prompt,
+        "sandbox": "read-only",
+        "approval-policy": "never",
+        "cwd": str(Path.cwd()),
+    }
+    use_model = model or default_model()
+    if use_model:
+        arguments["model"] = use_model
+
+    with _get_pool().worker() as worker:
+        start_time = time.perf_counter()
+        result = worker.request(
+            "tools/call",
+            {"name": "codex", "arguments": arguments},
+            timeout=settings().codex_timeout,
+            on_event=on_event,
+            cancel=cancel,
+        )
+        elapsed = int((time.perf_counter() - start_time) * 1000)
+
+    text = "".join(
+        part.get("text", "")
+        for part in result.get("content") or []
+        if part.get("type") == "text"
+    ).strip()
+    if result.get("isError"):
+        raise RuntimeError(f"Codex CLI request failed: {text or 'unknown codex error'}")
+    return text, elapsed
+
+
+def _run(prompt: str, *, model: Optional[str] = None) -> tuple[str, int]:
+    """prefer a warm pooled worker, fall back to one `codex exec` per call"""
+    global _mcp_unavailable
+    if settings().codex_workers > 0 and not _mcp_unavailable:
+        try:
+            return _call(prompt, model=model)
+        except _Unavailable:
+            _mcp_unavailable = True
+    return _exec(prompt, model=model)
+
+
+def _event_text(event: dict) -> tuple[str, str]:
+    """("delta" | "message" | "", text) for one codex event, either an mcp /
+    legacy `{"msg": {...}}` event or a `codex exec --json` item event"""
+    msg = event.get("msg") if isinstance(event.get("msg"), dict) else event
+    kind = msg.get("type") or ""
+    if kind == "agent_message_delta":
+        return "delta", msg.get("delta") or ""
+    if kind == "agent_message":
+        return "message", msg.get("message") or ""
+    item = msg.get("item") if isinstance(msg.get("item"), dict) else {}
+    if kind == "item.completed" and item.get("type") == "agent_message":
+        return "message", item.get("text") or ""
+    if kind == "item.delta":
+        delta = msg.get("delta")
+        return "delta", (delta.get("text") if isinstance(delta, dict) else delta) or ""
+    return "", ""
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+    if proc.stdout is not None:
+        proc.stdout.close()
+
+
+def _stream_exec(
+    prompt: str, *, model: Optional[str] = None
+) -> Generator[str, None, tuple[str, int]]:
+    """`codex exec --json`, yielding answer deltas as the events arrive
+
+    closing the generator early kills the child process
+    """
+    use_model = model or default_model()
+    cmd = [
+        "codex",
+        "exec",
+        "--json",
+        "--sandbox",
+        "read-only",
+        "--skip-git-repo-check",
+    ]
+    if use_model:
+        cmd.extend(["--model", use_model])
+
+    with tempfile.TemporaryDirectory(prefix="swe-szn-codex-") as tmp_dir:
+        out_path = Path(tmp_dir) / "last-message.txt"
+        cmd.extend(["--output-last-message", str(out_path), prompt])
+
+        # stderr goes to a file so a chatty child can never block on a full pipe
+        with open(Path(tmp_dir) / "stderr.txt", "w+", encoding="utf-8") as err:
+            start_time = time.perf_counter()
+            try:
+                proc = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=err,
+                    text=True,
+                    encoding="utf-8",
+                    bufsize=1,
+                    cwd=Path.cwd(),
+                )
+            except FileNotFoundError as exc:
+                raise RuntimeError(_NOT_FOUND) from exc
+
+            parts: List[str] = []
+            message = ""
+            try:
+                for line in proc.stdout:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # banner or log output
+                    if not isinstance(event, dict):
+                        continue
+                    kind, text = _event_text(event)
+                    if kind == "delta" and text:
+                        parts.append(text)
+                        yield text
+                    elif kind == "message":
+                        message = text
+                proc.wait()
+            finally:
+                _kill(proc)
+
+            if proc.returncode != 0:
+                err.seek(0)
+                details = err.read().strip() or "unknown codex error"
+                raise RuntimeError(f"Codex CLI request failed: {details}")
+
+        elapsed = int((time.perf_counter() - start_time) * 1000)
+        if out_path.exists():
+            answer = out_path.read_text(encoding="utf-8").strip()
+        else:
+            answer = (message or "".join(parts)).strip()
+
+    if not parts and answer:
+        yield answer  # this codex emits no deltas, show the whole answer
+    return answer, elapsed
+
+
+def _stream_worker(
+    prompt: str, *, model: Optional[str] = None
+) -> Generator[str, None, tuple[str, int]]:
+    """`_call` on a background thread, yielding its agent_message_delta events
+
+    closing the generator early kills the worker running the session
+    """
+    events: queue.Queue = queue.Queue()
+    cancel = threading.Event()
+
+    def on_event(msg: dict) -> None:
+        kind, text = _event_text(msg)
+        if kind == "delta" and text:
+            events.put(("delta", text))
+
+    def target() -> None:
+        try:
+            result = _call(prompt, model=model, on_event=on_event, cancel=cancel)
+        except BaseException as exc:
+            events.put(("error", exc))
+        else:
+            events.put(("done", result))
+
+    thread = threading.Thread(target=target, name="swe-szn-codex-call", daemon=True)
+    thread.start()
+    streamed = False
+    try:
+        while True:
+            kind, value = events.get()
+            if kind == "error":
+                raise value
+            if kind == "done":
+                answer, elapsed = value
+                break
+            streamed = True
+            yield value
+    finally:
+        if thread.is_alive():
+            cancel.set()
+            thread.join(timeout=5)
+
+    if not streamed and answer:
+        yield answer
+    return answer, elapsed
+
+
+def _stream(
+    prompt: str, *, model: Optional[str] = None
+) -> Generator[str, None, tuple[str, int]]:
+    """`_run`, but yielding the answer while codex writes it"""
+    global _mcp_unavailable
+    if settings().codex_workers > 0 and not _mcp_unavailable:
+        try:
+            return (yield from _stream_worker(prompt, model=model))
+        except _Unavailable:
+            _mcp_unavailable = True
+    return (yield from _stream_exec(prompt, model=model))
+
+
 def compare_jd_vs_resume(
     jd_markdown: str,
     resume_text: str,
@@ -63,18 +484,20 @@ def compare_jd_vs_resume(
 ) -> Dict[str, Any]:
     prompt = load_prompt(prompt_name)
     system_prompt = prompt["system"]
-    user_prompt = prompt["user_template"].format(
-        job=jd_markdown[:12000], resume=resume_text[:12000]
+    job, resume, report = budget.allocate(
+        jd_markdown, resume_text, model or default_model()
     )
+    user_prompt = prompt["user_template"].format(job=job, resume=resume)
     combined_prompt = (
         f"System instructions:\n{system_prompt}\n\nUser request:\n{user_prompt}\n"
     )
-    content, elapsed = _exec(combined_prompt, model=model)
+    content, elapsed = _run(combined_prompt, model=model)
 
     return {
         "content": content,
         "elapsed": elapsed,
         "model": model or default_model(),
+        "input_budget": report,
     }
 
 
@@ -89,13 +512,16 @@ def chat_about_job_stream(
 ) -> Generator[str, None, Dict[str, Any]]:
     prompt = load_prompt(prompt_name)
     system_prompt = prompt["system"]
-    context_prompt = prompt["user_template"].format(
-        job=jd_markdown[:12000], resume=resume_text[:12000]
+    job, resume, report = budget.allocate(
+        jd_markdown, resume_text, model or default_model()
     )
+    context_prompt = prompt["user_template"].format(job=job, resume=resume)
 
     transcript_lines = []
     if history:
-        for message in history:
+        # codex has no cheap summary model, so only the recent exchanges are sent
+        keep = max(1, settings().chat_keep_turns) * 2
+        for message in history[-keep:]:
             role = message.get("role", "user").upper()
             content = message.get("content", "")
             transcript_lines.append(f"{role}:\n{content}")
@@ -110,15 +536,19 @@ def chat_about_job_stream(
         "Answer the most recent user question in Markdown."
     )
 
-    answer, elapsed = _exec(combined_prompt, model=model)
+    answer, elapsed = yield from _stream(combined_prompt, model=model)
+    ledger.record(
+        "chat",
+        provider=provider_name(),
+        model=model or default_model(),
+        prompt=prompt_name,
+        latency_ms=elapsed,
+    )
     updated_history = (history or []) + [
         {"role": "user", "content": question},
         {"role": "assistant", "content": answer},
     ]
 
-    for chunk in re.findall(r"\S+\s*|\n", answer):
-        yield chunk
-
     return {
         "answer": answer,
         "history": updated_history,
@@ -129,5 +559,6 @@ def chat_about_job_stream(
             "total_cost_usd": 0.0,
             "elapsed": elapsed,
             "provider": provider_name(),
+            "input_budget": report,
         },
     }
@@ -0,0 +1,129 @@
+import hashlib
+import random
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from swe_szn.services.cache import CacheBackend, hash_key, md5_digest
+
+NAMESPACE = "fingerprints"
+
+# words per shingle; 5 keeps reordered bullets similar but not boilerplate alone
+SHINGLE_WORDS = 5
+# 16 bands of 4 rows: postings >~0.6 similar share a band with high probability
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EE5)  # fixed, signatures must be stable across runs
+_PERMS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def group_key(provider: str, model: str, resume_text: str) -> str:
+    """analyses are only reused for the same provider, model and resume"""
+    return hash_key(provider, model, md5_digest(resume_text, limit=8000))
+
+
+def shingles(text: str) -> Set[int]:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    out = set()
+    for i in range(len(words) - SHINGLE_WORDS + 1):
+        gram = " ".join(words[i : i + SHINGLE_WORDS]).encode("utf-8")
+        digest = hashlib.blake2b(gram, digest_size=8).digest()
+        out.add(int.from_bytes(digest, "little") & _PRIME)
+    return out
+
+
+def signature(text: str) -> List[int]:
+    """MinHash of the posting's word shingles"""
+    hashes = shingles(text)
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _bands(sig: List[int]) -> List[str]:
+    return [
+        f"{i}:{hash_key(*map(str, sig[i * ROWS : (i + 1) * ROWS]))}"
+        for i in range(BANDS)
+    ]
+
+
+class _Index:
+    """LSH buckets over the fingerprints namespace, loaded once per store"""
+
+    def __init__(self, store: CacheBackend) -> None:
+        self.store = store
+        self.lock = threading.Lock()
+        self.signatures: Dict[str, List[int]] = {}
+        self.buckets: Dict[Tuple[str, str], Set[str]] = {}
+        # one bulk read; loading the index is not a cache hit on every
+        # fingerprint and must not refresh their LRU position
+        for key, entry, _ in store.peek(NAMESPACE, list(store.keys(NAMESPACE))):
+            if len(entry.get("signature") or []) == NUM_PERM:
+                self._add(key, entry["group"], entry["signature"])
+
+    def _add(self, key: str, group: str, sig: List[int]) -> None:
+        self.signatures[key] = sig
+        for band in _bands(sig):
+            self.buckets.setdefault((group, band), set()).add(key)
+
+    def add(self, key: str, group: str, sig: List[int], url: Optional[str]) -> None:
+        with self.lock:
+            self._add(key, group, sig)
+        self.store.put(
+            NAMESPACE, key, {"group": group, "signature": sig, "job_url": url}, url=url
+        )
+
+    def candidates(self, group: str, sig: List[int]) -> List[Tuple[float, str]]:
+        """(similarity, key) of indexed postings sharing a band, best first"""
+        with self.lock:
+            keys = set()
+            for band in _bands(sig):
+                keys |= self.buckets.get((group, band), set())
+            scored = [(similarity(sig, self.signatures[k]), k) for k in keys]
+        return sorted(scored, reverse=True)
+
+
+_indexes: Dict[int, _Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index(store: CacheBackend) -> _Index:
+    with _indexes_lock:
+        index = _indexes.get(id(store))
+        if index is None or index.store is not store:
+            index = _indexes[id(store)] = _Index(store)
+        return index
+
+
+def add(
+    store: CacheBackend,
+    key: str,
+    jd_markdown: str,
+    group: str,
+    *,
+    url: Optional[str] = None,
+) -> None:
+    """index the posting behind the cached analysis `key`"""
+    _index(store).add(key, group, signature(jd_markdown), url)
+
+
+def find(
+    store: CacheBackend, jd_markdown: str, group: str, threshold: float
+) -> List[Tuple[float, str]]:
+    """(similarity, key) of indexed postings at or above `threshold`, best first"""
+    return [
+        (score, key)
+        for score, key in _index(store).candidates(group, signature(jd_markdown))
+        if score >= threshold
+    ]
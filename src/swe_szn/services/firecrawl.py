@@ -1,12 +1,12 @@
+import threading
 import time
-from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from firecrawl import Firecrawl
-
+from swe_szn import trace
 from swe_szn.config import settings
-from swe_szn.services.cache import load_json, md5_digest, save_json
+from swe_szn.services import jd, ledger, ratelimit
+from swe_szn.services.cache import md5_digest, open_store
 
 
 def _normalize_url(url: str) -> str:
@@ -36,54 +36,289 @@ def _normalize_url(url: str) -> str:
         return url
 
 
-def scrape_job(
-    url: str, api_key: Optional[str] = None, cache_dir: Optional[str] = None
-) -> str:
-    """scrape a given url using Firecrawl"""
-    key = api_key or settings().require_firecrawl_key()
+# batch scrape jobs that are over
+BATCH_DONE = {"completed", "failed", "cancelled"}
 
-    # select cache directory
-    cache_path = Path(cache_dir) if cache_dir else settings().cache_dir("firecrawl")
+# one client (and HTTP session) per API key for the whole process
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
 
-    # normalize URL (strip tracking params) and generate cache key
-    normalized_url = _normalize_url(url)
-    url_hash = md5_digest(normalized_url)
-    cache_file = cache_path / f"{url_hash}.json"
-
-    # check if we have cached result
-    if cache_file.exists():
-        cached_data = load_json(cache_file)
-        if cached_data is not None:
-            print(f"Using cached result for {normalized_url}")
-            return cached_data.get("markdown", "")
-
-    # scrape fresh content
-    print(f"Scraping {normalized_url}...")
-    client = Firecrawl(api_key=key)
-    doc = client.scrape(
-        normalized_url,
-        formats=["markdown"],
-        only_main_content=True,
-    )
 
-    # extract markdown content
+def _client(api_key: str) -> Any:
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            from firecrawl import Firecrawl  # heavy SDK, only needed on a cache miss
+
+            client = _clients[api_key] = Firecrawl(api_key=api_key)
+        return client
+
+
+def _markdown(doc: Any) -> str:
     markdown = getattr(doc, "markdown", None)
     if not markdown and isinstance(doc, dict):
         markdown = doc.get("markdown", "")
+    return markdown or ""
+
 
-    markdown = markdown or ""
+def _source_url(doc: Any) -> Optional[str]:
+    """the url a batch document was requested as"""
+    meta = getattr(doc, "metadata", None)
+    if meta is None and isinstance(doc, dict):
+        meta = doc.get("metadata")
+    if isinstance(meta, dict):
+        return meta.get("sourceURL") or meta.get("source_url") or meta.get("url")
+    return getattr(meta, "source_url", None) or getattr(meta, "url", None)
 
-    # cache the result
+
+def _next_page(client: Any, url: str) -> Dict[str, Any]:
+    """a `next` page of batch results; the SDK only returns the first page, so
+    this goes through its v2 HTTP client (auth and base url included)"""
+    parts = urlsplit(url)
+    endpoint = parts.path + (f"?{parts.query}" if parts.query else "")
+    response = client.v2.http_client.get(endpoint)
+    response.raise_for_status()
+    body = response.json()
+    if not body.get("success", True):
+        raise RuntimeError(body.get("error") or "batch scrape page failed")
+    return body
+
+
+def _cache_markdown(store: Any, normalized_url: str, markdown: str) -> None:
     try:
         cache_data = {
             "url": normalized_url,
             "markdown": markdown,
             "timestamp": time.time(),
         }
-        save_json(cache_file, cache_data)
+        store.put(
+            "firecrawl", md5_digest(normalized_url), cache_data, url=normalized_url
+        )
         # TODO :: update prints
-        print(f"Cached result to {cache_file}")
+        print(f"Cached result for {normalized_url}")
     except Exception as e:
         print(f"Cache write error: {e}")
 
-    return markdown
+
+def _cached(store: Any, normalized_url: str) -> Optional[str]:
+    """cached markdown of a posting (recorded as a ledger hit), None on a miss"""
+    start_time = time.perf_counter()
+    cached_data = store.get("firecrawl", md5_digest(normalized_url))
+    if cached_data is None:
+        return None
+    print(f"Using cached result for {normalized_url}")
+    ledger.record(
+        "scrape",
+        provider="firecrawl",
+        latency_ms=(time.perf_counter() - start_time) * 1000,
+        cache="hit",
+    )
+    return cached_data.get("markdown", "")
+
+
+def scrape_job(
+    url: str, api_key: Optional[str] = None, cache_dir: Optional[str] = None
+) -> str:
+    """scrape a given url using Firecrawl"""
+    with trace.span("scrape_job", url=url) as span:
+        key = api_key or settings().require_firecrawl_key()
+
+        # select cache store (an explicit directory keeps the flat JSON layout)
+        store = open_store(cache_dir)
+
+        # normalize URL (strip tracking params); the cache is keyed by its hash
+        normalized_url = _normalize_url(url)
+
+        # check if we have cached result
+        cached = _cached(store, normalized_url)
+        span.set(cached=cached is not None)
+        if cached is not None:
+            return cached
+
+        # scrape fresh content
+        print(f"Scraping {normalized_url}...")
+        with trace.span("firecrawl.scrape"):
+            start_time = time.perf_counter()
+            try:
+                client = _client(key)
+                doc = ratelimit.call(
+                    "firecrawl",
+                    lambda: client.scrape(
+                        normalized_url,
+                        formats=["markdown"],
+                        only_main_content=True,
+                        timeout=int(settings().firecrawl_timeout * 1000),
+                    ),
+                    ledger_fields={"kind": "scrape"},
+                )
+            except Exception as e:
+                ledger.record(
+                    "scrape",
+                    provider="firecrawl",
+                    latency_ms=(time.perf_counter() - start_time) * 1000,
+                    error=type(e).__name__,
+                )
+                raise
+            ledger.record(
+                "scrape",
+                provider="firecrawl",
+                latency_ms=(time.perf_counter() - start_time) * 1000,
+            )
+
+        markdown = _markdown(doc)
+        _cache_markdown(store, normalized_url, markdown)
+        return markdown
+
+
+def scrape_jobs(
+    urls: List[str],
+    api_key: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    *,
+    on_scraped: Optional[Callable[[str, str], None]] = None,
+) -> Dict[str, str]:
+    """scrape many urls: cached postings come from the cache and the rest go
+    out as one Firecrawl batch scrape on a shared client
+
+    each posting is cached (and passed to `on_scraped(url, markdown)`) as soon
+    as a status poll returns it. returns markdown by url as given; urls the
+    batch could not scrape are left out, `scrape_job` them for the error
+    """
+    with trace.span("scrape_jobs", urls=len(urls)) as span:
+        store = open_store(cache_dir)
+        out: Dict[str, str] = {}
+        # normalized url -> the urls it was given as
+        pending: Dict[str, List[str]] = {}
+
+        def deliver(normalized_url: str, markdown: str) -> None:
+            for url in pending.pop(normalized_url):
+                out[url] = markdown
+                if on_scraped is not None:
+                    on_scraped(url, markdown)
+
+        for url in urls:
+            normalized_url = _normalize_url(url)
+            if normalized_url in pending:
+                pending[normalized_url].append(url)
+                continue
+            pending[normalized_url] = [url]
+            cached = _cached(store, normalized_url)
+            if cached is not None:
+                deliver(normalized_url, cached)
+        span.set(cached=len(out))
+        if not pending:
+            return out
+
+        client = _client(api_key or settings().require_firecrawl_key())
+        timeout = settings().firecrawl_timeout
+        print(f"Batch scraping {len(pending)} postings...")
+        with trace.span("firecrawl.batch_scrape", urls=len(pending)):
+            start_time = time.perf_counter()
+            try:
+                job = ratelimit.call(
+                    "firecrawl",
+                    lambda: client.start_batch_scrape(
+                        list(pending),
+                        formats=["markdown"],
+                        only_main_content=True,
+                        timeout=int(timeout * 1000),
+                    ),
+                    ledger_fields={"kind": "scrape"},
+                )
+            except Exception as e:
+                ledger.record(
+                    "scrape",
+                    provider="firecrawl",
+                    latency_ms=(time.perf_counter() - start_time) * 1000,
+                    error=type(e).__name__,
+                )
+                raise
+
+            def take(doc: Any) -> bool:
+                normalized_url = _normalize_url(_source_url(doc) or "")
+                if normalized_url not in pending:
+                    return False  # delivered by an earlier poll
+                markdown = _markdown(doc)
+                # postings overlap in the batch, so each one's latency is its
+                # time to come back
+                ledger.record(
+                    "scrape",
+                    provider="firecrawl",
+                    latency_ms=(time.perf_counter() - start_time) * 1000,
+                    batch=job.id,
+                )
+                _cache_markdown(store, normalized_url, markdown)
+                deliver(normalized_url, markdown)
+                return True
+
+            # status polls have their own (unmetered) limiter so they do not
+            # spend the scrape RPM budget
+            poll_fields = {"kind": "scrape", "provider": "firecrawl"}
+            last_progress = time.perf_counter()
+            while True:
+                status = ratelimit.call(
+                    "firecrawl-status",
+                    lambda: client.get_batch_scrape_status(job.id),
+                    ledger_fields=poll_fields,
+                )
+                arrived = sum(take(doc) for doc in status.data or [])
+                # results past the first response are paged through `next`
+                next_url = status.next
+                while pending and next_url:
+                    page = ratelimit.call(
+                        "firecrawl-status",
+                        lambda: _next_page(client, next_url),
+                        ledger_fields=poll_fields,
+                    )
+                    arrived += sum(take(doc) for doc in page.get("data") or [])
+                    next_url = page.get("next")
+                if not pending or status.status in BATCH_DONE:
+                    break
+                if arrived:
+                    last_progress = time.perf_counter()
+                elif time.perf_counter() - last_progress > timeout:
+                    # stalled; whatever is left gets scraped one by one
+                    try:
+                        client.cancel_batch_scrape(job.id)
+                    except Exception:
+                        pass
+                    break
+                time.sleep(settings().firecrawl_poll_interval)
+        span.set(scraped=len(out))
+        return out
+
+
+def clean_job(
+    url: Optional[str], markdown: str, cache_dir: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """clean a scraped posting, caching the result in the same firecrawl
+    entry as the raw markdown; pasted postings (no url) are just cleaned"""
+    if not url:
+        return jd.clean(markdown)
+
+    store = open_store(cache_dir)
+    normalized_url = _normalize_url(url)
+    url_hash = md5_digest(normalized_url)
+    # scrape_job already counted this lookup; peek so it is not a second hit
+    entry, created_at = None, None
+    for _, entry, created_at in store.peek("firecrawl", [url_hash]):
+        break
+
+    if (
+        entry is not None
+        and entry.get("markdown") == markdown
+        and (entry.get("clean_report") or {}).get("version") == jd.CLEANER_VERSION
+    ):
+        return entry["cleaned"], entry["clean_report"]
+
+    cleaned, report = jd.clean(markdown)
+    if entry is not None and entry.get("markdown") == markdown:
+        try:
+            entry.update(cleaned=cleaned, clean_report=report)
+            # keep the scrape's creation time so the entry still expires on schedule
+            store.put(
+                "firecrawl", url_hash, entry, url=normalized_url, created_at=created_at
+            )
+        except Exception as e:
+            print(f"Cache write error: {e}")
+    return cleaned, report
@@ -0,0 +1,169 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+from swe_szn.config import settings
+from swe_szn.services.budget import count_tokens, split_sections
+
+# bump when clean() output changes so cached cleanups are redone
+CLEANER_VERSION = "2"
+
+# section kinds by heading keyword, first match wins; boilerplate is dropped
+SECTION_KINDS: List[Tuple[str, Tuple[str, ...]]] = [
+    (
+        "boilerplate",
+        (
+            "equal opportunity",
+            "eeo",
+            "benefit",
+            "perk",
+            "privacy",
+            "cookie",
+            "accommodation",
+            "disclaimer",
+            "legal",
+            "how to apply",
+            "apply now",
+            "ready to apply",
+            "similar jobs",
+            "related jobs",
+            "more jobs",
+            "share this",
+        ),
+    ),
+    (
+        "requirements",
+        (
+            "requirement",
+            "qualification",
+            "must have",
+            "you have",
+            "looking for",
+            "skill",
+            "preferred",
+            "nice to have",
+        ),
+    ),
+    ("responsibilities", ("responsibilit", "you'll do", "you will do", "duties")),
+    ("company", ("about us", "about the company", "who we are", "our mission")),
+]
+
+_IMAGE = re.compile(r"!\[[^\]]*\]\((?:[^()]|\([^)]*\))*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\((?:[^()]|\([^)]*\))*\)")
+_LINK_DEF = re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$", re.M)
+_URL = re.compile(r"<?https?://[^\s>)]+>?")
+_HTML = re.compile(r"</?[a-zA-Z][^>\n]*>")
+
+# short lines that are navigation, buttons or banners
+_BOILERPLATE_LINE = re.compile(
+    r"^(?:apply(?: now| for this (?:job|position|role))?|share(?: this (?:job|role))?"
+    r"|save(?: job)?|sign (?:in|up)|log ?in|back to (?:jobs|search|results)"
+    r"|(?:view|see) all (?:jobs|openings)|skip to (?:main )?content"
+    r"|(?:accept|reject|allow) all(?: cookies)?|manage (?:cookies|preferences)"
+    r"|privacy policy|terms (?:of (?:use|service)|and conditions)|powered by \w+"
+    r"|create (?:a )?job alert|copyright.*|©.*|menu|close|search)$",
+    re.I,
+)
+# prose paragraphs that are legal or banner text wherever they appear; blocks
+# with headings or list items are content (a requirement may mention "equal
+# opportunity") and are judged by their section heading instead
+_BOILERPLATE_PARAGRAPH = re.compile(
+    r"equal (?:employment )?opportunity|without regard to (?:race|sex|age)"
+    r"|reasonable accommodation|e-verify|we use cookies|cookie (?:policy|settings)"
+    r"|by (?:clicking|continuing)",
+    re.I,
+)
+_STRUCTURED = re.compile(r"^\s*(?:#{1,6}\s|[-*+]\s|\d+[.)]\s)", re.M)
+_NAV_REST = re.compile(r"[\s|·•/,>-]*")
+_BULLET_ONLY = re.compile(r"^\s*(?:[-*+]|\d+[.)])?\s*$")
+_BLANKS = re.compile(r"\n{3,}")
+
+
+def classify(heading: str) -> str:
+    lower = heading.lower()
+    for kind, words in SECTION_KINDS:
+        if any(w in lower for w in words):
+            return kind
+    return "other"
+
+
+def _is_nav(line: str) -> bool:
+    """a line made only of links and separators (menus, breadcrumbs, footers)"""
+    if len(_LINK.findall(line)) < 2:
+        return False
+    return bool(_NAV_REST.fullmatch(_LINK.sub("", _IMAGE.sub("", line))))
+
+
+def _plain(line: str) -> str:
+    """line without markdown markup, lowercased, for matching and dedupe"""
+    return re.sub(r"[\W_]+", " ", line).strip().lower()
+
+
+def clean(markdown: str) -> Tuple[str, Dict[str, Any]]:
+    """strip links, images, boilerplate sections and repeated lines from a
+    scraped posting; deterministic, returns (text, report)"""
+    counts = {
+        "images": len(_IMAGE.findall(markdown)),
+        "links": len(_LINK.findall(markdown)),
+        "dropped_sections": [],
+        "boilerplate_lines": 0,
+        "duplicate_lines": 0,
+    }
+
+    lines = markdown.splitlines()
+    kept = [line for line in lines if not _is_nav(line)]
+    counts["boilerplate_lines"] += len(lines) - len(kept)
+
+    text = _IMAGE.sub("", "\n".join(kept))
+    text = _LINK.sub(r"\1", text)
+    text = _LINK_DEF.sub("", text)
+    text = _URL.sub("", text)
+    text = _HTML.sub("", text)
+
+    sections = []
+    for heading, body in split_sections(text):
+        if heading and classify(heading) == "boilerplate":
+            counts["dropped_sections"].append(heading)
+            continue
+        sections.append(body)
+    text = "".join(sections)
+
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        plain = _plain(line)
+        if not plain:
+            if _BULLET_ONLY.match(line):
+                line = ""
+            lines.append(line)
+            continue
+        if len(plain) <= 40 and _BOILERPLATE_LINE.match(plain):
+            counts["boilerplate_lines"] += 1
+            continue
+        if len(plain) >= 3 and plain in seen:
+            counts["duplicate_lines"] += 1
+            continue
+        seen.add(plain)
+        lines.append(line.rstrip())
+
+    paragraphs = []
+    for paragraph in "\n".join(lines).split("\n\n"):
+        if (
+            _BOILERPLATE_PARAGRAPH.search(paragraph)
+            and not _STRUCTURED.search(paragraph)
+            and len(paragraph) < 1500
+        ):
+            counts["boilerplate_lines"] += paragraph.count("\n") + 1
+            continue
+        paragraphs.append(paragraph)
+    text = _BLANKS.sub("\n\n", "\n\n".join(paragraphs)).strip() + "\n"
+
+    model = settings().openai_model
+    report = {
+        "version": CLEANER_VERSION,
+        "chars_before": len(markdown),
+        "chars_after": len(text),
+        "tokens_before": count_tokens(markdown, model),
+        "tokens_after": count_tokens(text, model),
+        **counts,
+    }
+    return text, report
@@ -0,0 +1,185 @@
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from swe_szn.config import settings
+
+LEDGER_FILE = "usage.jsonl"
+
+# what `usage --by` can group on
+GROUP_FIELDS = ("day", "model", "prompt", "provider", "kind", "cache")
+
+_lock = threading.Lock()
+
+
+def ledger_path() -> Path:
+    return settings().cache_root / LEDGER_FILE
+
+
+def record(
+    kind: str,
+    *,
+    provider: str,
+    model: Optional[str] = None,
+    prompt: Optional[str] = None,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_tokens: int = 0,
+    latency_ms: int = 0,
+    cache: str = "miss",
+    cost_usd: float = 0.0,
+    **extra: Any,
+) -> None:
+    """append one provider call (or cache hit standing in for one) to the ledger
+
+    `cache` is miss, hit or near_duplicate; `extra` holds per-kind fields such
+    as ttft_ms, backend or error (with retry=n for an attempt that was tried
+    again). a failing write never fails the call
+    """
+    if not settings().usage_ledger:
+        return
+    entry = {
+        "ts": round(time.time(), 3),
+        "kind": kind,
+        "provider": provider,
+        "model": model,
+        "prompt": prompt,
+        "input_tokens": input_tokens or 0,
+        "output_tokens": output_tokens or 0,
+        "cached_tokens": cached_tokens or 0,
+        "latency_ms": int(latency_ms or 0),
+        "cache": cache,
+        "cost_usd": round(cost_usd or 0.0, 6),
+        **extra,
+    }
+    line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+    path = ledger_path()
+    try:
+        with _lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # one O_APPEND write per entry, so processes sharing the ledger
+            # (parallel runs, analyze-jobs) never interleave lines
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+    except OSError:
+        pass
+
+
+def cached_tokens(usage: Any) -> int:
+    """prompt tokens served from OpenAI's prompt cache, from a Chat Completions
+    or Responses usage object (or its JSON)"""
+    if usage is None:
+        return 0
+    if isinstance(usage, dict):
+        details = usage.get("prompt_tokens_details") or usage.get(
+            "input_tokens_details"
+        )
+        return (details or {}).get("cached_tokens") or 0
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(
+        usage, "input_tokens_details", None
+    )
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+def read(since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """ledger entries at or after `since` (epoch seconds), oldest first"""
+    path = ledger_path()
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn line from a killed process
+            if since is None or entry.get("ts", 0) >= since:
+                yield entry
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """nearest-rank percentile, None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _group_value(entry: Dict[str, Any], field: str) -> str:
+    if field == "day":
+        return time.strftime("%Y-%m-%d", time.localtime(entry.get("ts", 0)))
+    return str(entry.get(field) or "-")
+
+
+def aggregate(
+    entries: Iterator[Dict[str, Any]], by: Sequence[str] = ("day",)
+) -> List[Dict[str, Any]]:
+    """one row per group with call counts, tokens, cost and latency
+
+    latency percentiles and throughput only count calls that reached the
+    provider; cache hits are near-instant and would hide the real numbers
+    """
+    for field in by:
+        if field not in GROUP_FIELDS:
+            raise ValueError(f"--by must be one of {', '.join(GROUP_FIELDS)}")
+
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for e in entries:
+        group = tuple(_group_value(e, f) for f in by)
+        row = groups.get(group)
+        if row is None:
+            row = groups[group] = {
+                **dict(zip(by, group)),
+                "calls": 0,
+                "cache_hits": 0,
+                "errors": 0,
+                "retries": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cached_tokens": 0,
+                "cost_usd": 0.0,
+                "_latencies": [],
+                "_ttfts": [],
+                "_output_ms": 0,
+            }
+        row["calls"] += 1
+        row["input_tokens"] += e.get("input_tokens", 0)
+        row["output_tokens"] += e.get("output_tokens", 0)
+        row["cached_tokens"] += e.get("cached_tokens", 0)
+        row["cost_usd"] += e.get("cost_usd", 0.0)
+        if e.get("retry"):
+            # a failed attempt that services.ratelimit tried again
+            row["retries"] += 1
+        elif e.get("error"):
+            row["errors"] += 1
+        elif e.get("cache", "miss") != "miss":
+            row["cache_hits"] += 1
+        else:
+            row["_latencies"].append(e.get("latency_ms", 0))
+            if e.get("ttft_ms") is not None:
+                row["_ttfts"].append(e["ttft_ms"])
+            if e.get("output_tokens"):
+                row["_output_ms"] += e.get("latency_ms", 0)
+
+    rows = []
+    for group in sorted(groups):
+        row = groups[group]
+        latencies = row.pop("_latencies")
+        ttfts = row.pop("_ttfts")
+        output_ms = row.pop("_output_ms")
+        row["cost_usd"] = round(row["cost_usd"], 6)
+        row["p50_ms"] = percentile(latencies, 50)
+        row["p95_ms"] = percentile(latencies, 95)
+        row["ttft_p50_ms"] = percentile(ttfts, 50)
+        # output tokens per second of provider time, the model's throughput
+        row["output_tokens_per_s"] = (
+            round(row["output_tokens"] / (output_ms / 1000), 1) if output_ms else None
+        )
+        rows.append(row)
+    return rows
@@ -1,7 +1,25 @@
-from .analysis import compare_jd_vs_resume
-from .chat import chat_about_job_stream
+from importlib import import_module
+from typing import Any
 
-__all__ = [
-    "compare_jd_vs_resume",
-    "chat_about_job_stream",
-]
+# public name -> submodule, imported on first access (PEP 562)
+_EXPORTS = {
+    "compare_jd_vs_resume": "analysis",
+    "compare_jd_vs_resume_async": "analysis",
+    "chat_about_job_stream": "chat",
+    "chat_about_job_stream_async": "chat",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
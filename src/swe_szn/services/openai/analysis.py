@@ -1,110 +1,93 @@
+import asyncio
 import json
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
+from swe_szn import trace
 from swe_szn.config import settings
 from swe_szn.prompts import load_prompt
-from swe_szn.services import codex
+from swe_szn.services import budget, codex, dedupe, ledger, rank, ratelimit
 from swe_szn.services.cache import (
-    ensure_dir,
+    CacheBackend,
     hash_key,
-    load_json,
     md5_digest,
-    save_json,
+    open_store,
     strip_json_code_fence,
 )
 
-from .client import get_client
+from .client import get_async_client, run_sync
 from .models import estimate_cost, supports_temperature
 
 
-def compare_jd_vs_resume(
-    jd_markdown: str,
-    resume_text: str,
-    model: Optional[str] = None,
-    *,
-    job_url: Optional[str] = None,
-    cache_dir: Optional[Union[str, Path]] = None,
-    force: bool = False,
-    prompt_name: str = "swe_intern",
-) -> Dict[str, Any]:
-    """compare JD vs resume using OpenAI with caching"""
-    provider = settings().ai_provider
-    use_model = model or (
-        settings().codex_model if provider == "codex" else settings().openai_model
-    )
-    client = None if provider == "codex" else get_client()
-
-    jd_digest = md5_digest(jd_markdown, limit=8000)
-    res_digest = md5_digest(resume_text, limit=8000)
-    key = hash_key(provider, use_model, job_url or "", jd_digest, res_digest)
+def _codex_cost(model: str) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "input_cost_usd": 0.0,
+        "output_cost_usd": 0.0,
+        "total_cost_usd": 0.0,
+        "pricing_per_1k": {},
+    }
 
-    cache_path = Path(cache_dir) if cache_dir else settings().cache_dir("openai")
-    ensure_dir(cache_path)
-    cache_file = cache_path / f"{key}.json"
-
-    if not force and cache_file.exists():
-        cached = load_json(cache_file)
-        if cached is not None:
-            return cached
 
+def _build_request(
+    jd_markdown: str, resume_text: str, model: str, prompt_name: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """chat completions kwargs for one analysis and its input budget report"""
     # load standard or user prompt
     PROMPT = load_prompt(prompt_name)
     SYSTEM_PROMPT = PROMPT["system"]
     USER_TEMPLATE = PROMPT["user_template"]
-    user_prompt = USER_TEMPLATE.format(
-        job=jd_markdown[:12000], resume=resume_text[:12000]
-    )
+    job, resume, report = budget.allocate(jd_markdown, resume_text, model)
+    user_prompt = USER_TEMPLATE.format(job=job, resume=resume)
 
-    if provider == "codex":
-        resp = codex.compare_jd_vs_resume(
-            jd_markdown=jd_markdown,
-            resume_text=resume_text,
-            model=model,
-            prompt_name=prompt_name,
-        )
-        elapsed = resp["elapsed"]
-        content = strip_json_code_fence(resp["content"] or "{}")
-        input_tokens = 0
-        output_tokens = 0
-        use_model = resp["model"]
-        cost_estimate = {
-            "model": use_model,
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "input_cost_usd": 0.0,
-            "output_cost_usd": 0.0,
-            "total_cost_usd": 0.0,
-            "pricing_per_1k": {},
-        }
-    else:
-        kwargs = {
-            "model": use_model,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            "response_format": {"type": "json_object"},
-        }
+    kwargs = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        "response_format": {"type": "json_object"},
+    }
 
-        if supports_temperature(use_model):
-            kwargs["temperature"] = 0.2
+    if supports_temperature(model):
+        kwargs["temperature"] = 0.2
 
-        start_time = time.perf_counter()
-        resp = client.chat.completions.create(**kwargs)
-        elapsed = int((time.perf_counter() - start_time) * 1000)
-        content = strip_json_code_fence(resp.choices[0].message.content or "{}")
+    return kwargs, report
 
-        input_tokens = resp.usage.prompt_tokens if resp.usage else 0
-        output_tokens = resp.usage.completion_tokens if resp.usage else 0
-        cost_estimate = estimate_cost(use_model, input_tokens, output_tokens)
 
-        print(
-            f"API Cost: ${cost_estimate['total_cost_usd']:.6f} "
-            f"({input_tokens} input + {output_tokens} output tokens)"
-        )
+def _cost_from_usage(model: str, usage: Any) -> Dict[str, Any]:
+    input_tokens = usage.prompt_tokens if usage else 0
+    output_tokens = usage.completion_tokens if usage else 0
+    cost_estimate = estimate_cost(model, input_tokens, output_tokens)
+
+    print(
+        f"API Cost: ${cost_estimate['total_cost_usd']:.6f} "
+        f"({input_tokens} input + {output_tokens} output tokens)"
+    )
+    return cost_estimate
 
+
+def _normalize(
+    content: str,
+    *,
+    key: str,
+    model: str,
+    provider: str,
+    job_url: Optional[str],
+    cost_estimate: Dict[str, Any],
+    elapsed: int,
+    store: CacheBackend,
+    input_budget: Optional[Dict[str, Any]] = None,
+    fingerprint: Optional[Tuple[str, str]] = None,
+    resume_digest: Optional[str] = None,
+) -> Dict[str, Any]:
+    """parse the model JSON into the result schema, cache and index it
+
+    `fingerprint` is (group, jd text) to index for near-duplicate lookups
+    """
     try:
         parsed = json.loads(content)
         parsed.setdefault("summary", "")
@@ -127,14 +110,21 @@ def compare_jd_vs_resume(
 
         parsed["_meta"] = {
             "key": key,
-            "model": use_model,
+            "model": model,
             "provider": provider,
             "job_url": job_url,
             "cost_estimate": cost_estimate,
             "elapsed": elapsed,
+            "input_budget": input_budget,
+            "resume_digest": resume_digest,
         }
         try:
-            save_json(cache_file, parsed)
+            store.put(
+                "openai", key, parsed, provider=provider, model=model, url=job_url
+            )
+            rank.record(store, key, parsed)
+            if fingerprint is not None:
+                dedupe.add(store, key, fingerprint[1], fingerprint[0], url=job_url)
         except Exception:
             pass
         return parsed
@@ -157,11 +147,274 @@ def compare_jd_vs_resume(
             },
             "_meta": {
                 "key": key,
-                "model": use_model,
+                "model": model,
                 "provider": provider,
                 "job_url": job_url,
                 "elapsed": elapsed,
+                "input_budget": input_budget,
+                "resume_digest": resume_digest,
             },
         }
 
         return fallback
+
+
+def _resolve(
+    jd_markdown: str,
+    resume_text: str,
+    model: Optional[str],
+    job_url: Optional[str],
+    cache_dir: Optional[Union[str, Path]],
+) -> tuple[str, str, str, CacheBackend]:
+    """pick provider/model and compute the cache key and store for a request"""
+    provider = settings().ai_provider
+    use_model = model or (
+        settings().codex_model if provider == "codex" else settings().openai_model
+    )
+
+    jd_digest = md5_digest(jd_markdown, limit=8000)
+    res_digest = md5_digest(resume_text, limit=8000)
+    key = hash_key(provider, use_model, job_url or "", jd_digest, res_digest)
+
+    return provider, use_model, key, open_store(cache_dir)
+
+
+def _fingerprint(
+    jd_markdown: str,
+    resume_text: str,
+    provider: str,
+    model: str,
+    cache_dir: Optional[Union[str, Path]],
+) -> Optional[Tuple[str, str]]:
+    """(group, jd text) for near-duplicate lookups, None when disabled
+
+    flat `cache_dir` stores hold a single namespace, so they are never indexed
+    """
+    if cache_dir is not None or settings().dedupe_threshold <= 0:
+        return None
+    return dedupe.group_key(provider, model, resume_text), jd_markdown
+
+
+def _near_duplicate(
+    store: CacheBackend,
+    fingerprint: Optional[Tuple[str, str]],
+    *,
+    key: str,
+    job_url: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """cached analysis of a near-identical posting (a mirror or repost),
+    re-keyed for this one"""
+    if fingerprint is None:
+        return None
+    group, jd_markdown = fingerprint
+    for similarity, near_key in dedupe.find(
+        store, jd_markdown, group, settings().dedupe_threshold
+    ):
+        cached = store.get("openai", near_key)
+        if cached is None:
+            continue  # evicted since it was indexed
+        meta = dict(cached.get("_meta") or {})
+        meta["near_duplicate"] = {
+            "key": near_key,
+            "job_url": meta.get("job_url"),
+            "similarity": round(similarity, 3),
+        }
+        meta.update(key=key, job_url=job_url)
+        result = {**cached, "_meta": meta}
+        try:
+            store.put(
+                "openai",
+                key,
+                result,
+                provider=meta.get("provider"),
+                model=meta.get("model"),
+                url=job_url,
+            )
+            rank.record(store, key, result)
+        except Exception:
+            pass
+        return result
+    return None
+
+
+def _record_hit(
+    result: Dict[str, Any],
+    cache: str,
+    prompt_name: str,
+    start_time: float,
+    *,
+    kind: str = "analysis",
+) -> None:
+    """ledger entry for an analysis served from the cache"""
+    meta = result.get("_meta") or {}
+    ledger.record(
+        kind,
+        provider=meta.get("provider") or settings().ai_provider,
+        model=meta.get("model"),
+        prompt=prompt_name,
+        latency_ms=int((time.perf_counter() - start_time) * 1000),
+        cache=cache,
+    )
+
+
+def _record_error(
+    exc: Exception, provider: str, model: str, prompt_name: str, start_time: float
+) -> None:
+    ledger.record(
+        "analysis",
+        provider=provider,
+        model=model,
+        prompt=prompt_name,
+        latency_ms=int((time.perf_counter() - start_time) * 1000),
+        error=type(exc).__name__,
+    )
+
+
+async def compare_jd_vs_resume_async(
+    jd_markdown: str,
+    resume_text: str,
+    model: Optional[str] = None,
+    *,
+    job_url: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    force: bool = False,
+    prompt_name: str = "swe_intern",
+) -> Dict[str, Any]:
+    """compare JD vs resume using the pooled async OpenAI client with caching"""
+    with trace.span("compare_jd_vs_resume", prompt=prompt_name) as span:
+        provider, use_model, key, store = _resolve(
+            jd_markdown, resume_text, model, job_url, cache_dir
+        )
+
+        fingerprint = _fingerprint(
+            jd_markdown, resume_text, provider, use_model, cache_dir
+        )
+        if not force:
+            with trace.span("cache.lookup") as lookup:
+                start_time = time.perf_counter()
+                cached, hit = store.get("openai", key), "hit"
+                if cached is None:
+                    cached, hit = (
+                        _near_duplicate(store, fingerprint, key=key, job_url=job_url),
+                        "near_duplicate",
+                    )
+                lookup.set(hit=cached is not None)
+            if cached is not None:
+                span.set(cached=True)
+                _record_hit(cached, hit, prompt_name, start_time)
+                return cached
+
+        start_time = time.perf_counter()
+        if provider == "codex":
+            with trace.span("llm.request", provider="codex"):
+                try:
+                    resp = await asyncio.to_thread(
+                        codex.compare_jd_vs_resume,
+                        jd_markdown=jd_markdown,
+                        resume_text=resume_text,
+                        model=model,
+                        prompt_name=prompt_name,
+                    )
+                except Exception as e:
+                    _record_error(e, provider, use_model, prompt_name, start_time)
+                    raise
+            elapsed = resp["elapsed"]
+            content = strip_json_code_fence(resp["content"] or "{}")
+            use_model = resp["model"]
+            cost_estimate = _codex_cost(use_model)
+            report = resp["input_budget"]
+            ledger.record(
+                "analysis",
+                provider=provider,
+                model=use_model,
+                prompt=prompt_name,
+                latency_ms=elapsed,
+            )
+        else:
+            with trace.span("prompt.build"):
+                kwargs, report = _build_request(
+                    jd_markdown, resume_text, use_model, prompt_name
+                )
+            with trace.span("openai.client"):
+                client = get_async_client()
+
+            with trace.span(
+                "llm.request", provider=provider, model=use_model
+            ) as request:
+                start_time = time.perf_counter()
+                estimate = ratelimit.estimate_tokens(kwargs["messages"])
+                try:
+                    resp = await ratelimit.call_async(
+                        "openai",
+                        lambda: client.chat.completions.create(**kwargs),
+                        tokens=estimate,
+                        ledger_fields={
+                            "kind": "analysis",
+                            "model": use_model,
+                            "prompt": prompt_name,
+                        },
+                    )
+                except Exception as e:
+                    _record_error(e, provider, use_model, prompt_name, start_time)
+                    raise
+                elapsed = int((time.perf_counter() - start_time) * 1000)
+                if resp.usage:
+                    ratelimit.limiter("openai").settle(
+                        estimate, resp.usage.total_tokens
+                    )
+                    request.set(
+                        input_tokens=resp.usage.prompt_tokens,
+                        output_tokens=resp.usage.completion_tokens,
+                    )
+            content = strip_json_code_fence(resp.choices[0].message.content or "{}")
+            cost_estimate = _cost_from_usage(use_model, resp.usage)
+            ledger.record(
+                "analysis",
+                provider=provider,
+                model=use_model,
+                prompt=prompt_name,
+                input_tokens=cost_estimate["input_tokens"],
+                output_tokens=cost_estimate["output_tokens"],
+                cached_tokens=ledger.cached_tokens(resp.usage),
+                latency_ms=elapsed,
+                cost_usd=cost_estimate["total_cost_usd"],
+            )
+
+        with trace.span("response.parse"):
+            return _normalize(
+                content,
+                key=key,
+                model=use_model,
+                provider=provider,
+                job_url=job_url,
+                cost_estimate=cost_estimate,
+                elapsed=elapsed,
+                store=store,
+                input_budget=report,
+                fingerprint=fingerprint,
+                resume_digest=rank.resume_digest(resume_text),
+            )
+
+
+def compare_jd_vs_resume(
+    jd_markdown: str,
+    resume_text: str,
+    model: Optional[str] = None,
+    *,
+    job_url: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    force: bool = False,
+    prompt_name: str = "swe_intern",
+) -> Dict[str, Any]:
+    """compare JD vs resume using OpenAI with caching"""
+    return run_sync(
+        compare_jd_vs_resume_async(
+            jd_markdown,
+            resume_text,
+            model,
+            job_url=job_url,
+            cache_dir=cache_dir,
+            force=force,
+            prompt_name=prompt_name,
+        )
+    )
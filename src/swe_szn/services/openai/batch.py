@@ -0,0 +1,283 @@
+import io
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from swe_szn.config import settings
+from swe_szn.services import ledger, rank
+from swe_szn.services.cache import strip_json_code_fence
+
+from .analysis import (
+    _build_request,
+    _fingerprint,
+    _near_duplicate,
+    _normalize,
+    _record_hit,
+    _resolve,
+)
+from .client import get_client
+from .models import estimate_cost
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_requests(
+    items: List[Dict[str, Any]],
+    *,
+    model: Optional[str] = None,
+    prompt_name: str = "swe_intern",
+    cache_dir: Optional[Union[str, Path]] = None,
+    force: bool = False,
+) -> tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, Dict], List[str]]:
+    """render analysis items into Batch API request lines
+
+    each item needs `jd_markdown`, `resume_text` and optionally `job_url`.
+    returns (request lines, pending requests by custom_id, cached results by key,
+    cache key of each item)
+    """
+    if settings().ai_provider == "codex":
+        raise RuntimeError(
+            "Batch API mode is unavailable when SWE_SZN_AI_PROVIDER=codex"
+        )
+
+    lines: List[Dict[str, Any]] = []
+    pending: Dict[str, Dict[str, Any]] = {}
+    cached: Dict[str, Dict] = {}
+    keys: List[str] = []
+
+    for item in items:
+        provider, use_model, key, store = _resolve(
+            item["jd_markdown"],
+            item["resume_text"],
+            model,
+            item.get("job_url"),
+            cache_dir,
+        )
+        keys.append(key)
+        if key in pending or key in cached:
+            continue
+        fingerprint = _fingerprint(
+            item["jd_markdown"], item["resume_text"], provider, use_model, cache_dir
+        )
+        if not force:
+            start_time = time.perf_counter()
+            hit, cache = store.get("openai", key), "hit"
+            if hit is None:
+                hit, cache = (
+                    _near_duplicate(
+                        store, fingerprint, key=key, job_url=item.get("job_url")
+                    ),
+                    "near_duplicate",
+                )
+            if hit is not None:
+                cached[key] = hit
+                _record_hit(hit, cache, prompt_name, start_time, kind="batch")
+                continue
+
+        body, report = _build_request(
+            item["jd_markdown"], item["resume_text"], use_model, prompt_name
+        )
+        lines.append(
+            {"custom_id": key, "method": "POST", "url": ENDPOINT, "body": body}
+        )
+        pending[key] = {
+            "key": key,
+            "model": use_model,
+            "provider": provider,
+            "job_url": item.get("job_url"),
+            "store": store,
+            "input_budget": report,
+            "fingerprint": fingerprint,
+            "resume_digest": rank.resume_digest(item["resume_text"]),
+            "prompt": prompt_name,
+        }
+
+    return lines, pending, cached, keys
+
+
+def write_requests(lines: List[Dict[str, Any]], path: Union[str, Path]) -> Path:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with open(p, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return p
+
+
+def submit(path: Union[str, Path], *, client=None) -> Any:
+    """upload a request file and create a batch for it"""
+    client = client or get_client()
+    with open(path, "rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    return client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=ENDPOINT,
+        completion_window="24h",
+        metadata={"source": "swe-szn"},
+    )
+
+
+def wait(
+    batch_id: str,
+    *,
+    client=None,
+    poll_interval: float = 30.0,
+    on_status: Optional[Callable[[Any], None]] = None,
+) -> Any:
+    """poll a batch until it reaches a terminal status"""
+    client = client or get_client()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if on_status is not None:
+            on_status(batch)
+        if batch.status in TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def _read_file(client, file_id: Optional[str]) -> List[Dict[str, Any]]:
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    rows = []
+    for line in io.StringIO(text):
+        line = line.strip()
+        if line:
+            rows.append(json.loads(line))
+    return rows
+
+
+def collect(
+    batch: Any, pending: Dict[str, Dict[str, Any]], *, client=None
+) -> tuple[Dict[str, Dict], Dict[str, str]]:
+    """parse batch output through the normal analysis path and cache it
+
+    returns (results by key, errors by key)
+    """
+    client = client or get_client()
+    results: Dict[str, Dict] = {}
+    errors: Dict[str, str] = {}
+
+    finished_at = batch.completed_at or batch.failed_at or batch.expired_at
+    elapsed = (
+        int((finished_at - batch.created_at) * 1000)
+        if finished_at and batch.created_at
+        else 0
+    )
+
+    for row in _read_file(client, batch.output_file_id):
+        key = row.get("custom_id")
+        req = pending.get(key)
+        if req is None:
+            continue
+        response = row.get("response") or {}
+        if row.get("error") or response.get("status_code", 200) >= 400:
+            errors[key] = json.dumps(row.get("error") or response.get("body"))
+            ledger.record(
+                "batch",
+                provider=req["provider"],
+                model=req["model"],
+                prompt=req["prompt"],
+                latency_ms=elapsed,
+                error=str(response.get("status_code") or "error"),
+            )
+            continue
+
+        body = response.get("body") or {}
+        content = ((body.get("choices") or [{}])[0].get("message") or {}).get("content")
+        usage = body.get("usage") or {}
+        cost_estimate = estimate_cost(
+            req["model"],
+            usage.get("prompt_tokens", 0),
+            usage.get("completion_tokens", 0),
+            batch=True,
+        )
+        # latency is the whole batch's turnaround, shared by its requests
+        ledger.record(
+            "batch",
+            provider=req["provider"],
+            model=req["model"],
+            prompt=req["prompt"],
+            input_tokens=cost_estimate["input_tokens"],
+            output_tokens=cost_estimate["output_tokens"],
+            cached_tokens=ledger.cached_tokens(usage),
+            latency_ms=elapsed,
+            cost_usd=cost_estimate["total_cost_usd"],
+        )
+        results[key] = _normalize(
+            strip_json_code_fence(content or "{}"),
+            key=key,
+            model=req["model"],
+            provider=req["provider"],
+            job_url=req["job_url"],
+            cost_estimate=cost_estimate,
+            elapsed=elapsed,
+            store=req["store"],
+            input_budget=req["input_budget"],
+            fingerprint=req["fingerprint"],
+            resume_digest=req["resume_digest"],
+        )
+
+    for row in _read_file(client, batch.error_file_id):
+        key = row.get("custom_id")
+        if key in pending and key not in results:
+            errors[key] = json.dumps(row.get("error") or row.get("response"))
+
+    # anything the batch never answered (expired, cancelled, failed)
+    for key in pending:
+        if key not in results and key not in errors:
+            errors[key] = f"batch {batch.status}"
+
+    return results, errors
+
+
+def run(
+    items: List[Dict[str, Any]],
+    *,
+    model: Optional[str] = None,
+    prompt_name: str = "swe_intern",
+    cache_dir: Optional[Union[str, Path]] = None,
+    force: bool = False,
+    client=None,
+    poll_interval: float = 30.0,
+    on_status: Optional[Callable[[Any], None]] = None,
+) -> List[Dict[str, Any]]:
+    """analyze items through the Batch API
+
+    returns one outcome per item: {"key", "result"} or {"key", "error"}
+    """
+    lines, pending, cached, keys = build_requests(
+        items,
+        model=model,
+        prompt_name=prompt_name,
+        cache_dir=cache_dir,
+        force=force,
+    )
+
+    results: Dict[str, Dict] = dict(cached)
+    errors: Dict[str, str] = {}
+    if lines:
+        client = client or get_client()
+        path = write_requests(
+            lines,
+            settings().cache_dir("batches") / f"requests_{int(time.time())}.jsonl",
+        )
+        created = submit(path, client=client)
+        batch = wait(
+            created.id,
+            client=client,
+            poll_interval=poll_interval,
+            on_status=on_status,
+        )
+        fresh, errors = collect(batch, pending, client=client)
+        results.update(fresh)
+
+    outcomes = []
+    for key in keys:
+        if key in results:
+            outcomes.append({"key": key, "result": results[key]})
+        else:
+            outcomes.append({"key": key, "error": errors.get(key, "missing result")})
+    return outcomes
@@ -1,46 +1,186 @@
+import asyncio
 import time
-from typing import Any, Dict, Generator, Optional
+from typing import Any, AsyncGenerator, Dict, Generator, Optional, Union
 
+from swe_szn import trace
 from swe_szn.config import settings
 from swe_szn.prompts import load_prompt
-from swe_szn.services import codex
+from swe_szn.services import budget, codex, ledger, ratelimit
 
-from .client import get_client
+from .client import get_async_client, run_sync
+from .history import compact, message_tokens
 from .models import estimate_cost, pricing, supports_temperature
 
 
-def chat_about_job_stream(
+class AsyncChatStream:
+    """async iterator over answer chunks, `result` is set once it is exhausted"""
+
+    def __init__(self, gen: AsyncGenerator[Union[str, dict], None]) -> None:
+        self._gen = gen
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __aiter__(self) -> "AsyncChatStream":
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self._gen.__anext__()
+        if isinstance(item, dict):
+            # the final item carries the answer/history/_meta payload
+            self.result = item
+            await self._gen.aclose()
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        await self._gen.aclose()
+
+
+def _step(gen: Generator[str, None, Any]) -> tuple[bool, Any]:
+    """advance a sync generator, returning (finished, chunk or return value)"""
+    try:
+        return False, next(gen)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def _codex_stream(question: str, **kwargs) -> AsyncGenerator[Any, None]:
+    gen = codex.chat_about_job_stream(question, **kwargs)
+    try:
+        while True:
+            finished, value = await asyncio.to_thread(_step, gen)
+            if finished:
+                yield value or {}
+                return
+            yield value
+    finally:
+        # stops the codex child when the consumer gives up early
+        try:
+            gen.close()
+        except ValueError:
+            pass  # still inside a step on the worker thread
+
+
+# set once the endpoint answers 404 for /responses (e.g. an older proxy)
+_responses_unsupported = False
+
+
+def _wire(messages: list) -> list:
+    """messages without our bookkeeping keys (response_id)"""
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
+
+
+async def _completions_text(
+    client: Any, use_model: str, messages: list, usage: Dict[str, Any]
+) -> AsyncGenerator[str, None]:
+    """Chat Completions transport, resends the whole conversation every turn"""
+    kwargs = {
+        "model": use_model,
+        "messages": _wire(messages),
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    if supports_temperature(use_model):
+        kwargs["temperature"] = 0.5
+
+    # only opening the stream is retried, a broken stream would repeat text
+    stream = await ratelimit.call_async(
+        "openai",
+        lambda: client.chat.completions.create(**kwargs),
+        tokens=ratelimit.estimate_tokens(kwargs["messages"]),
+        ledger_fields={"kind": "chat", "model": use_model, "backend": "completions"},
+    )
+    async for chunk in stream:
+        choice = (chunk.choices or [None])[0]
+        delta = getattr(choice, "delta", None)
+        if delta is not None:
+            content = getattr(delta, "content", None)
+            if content:
+                yield content
+
+        u = getattr(chunk, "usage", None)
+        if u:
+            usage["input_tokens"] = getattr(u, "prompt_tokens", 0) or 0
+            usage["output_tokens"] = getattr(u, "completion_tokens", 0) or 0
+            usage["cached_tokens"] = ledger.cached_tokens(u)
+
+
+async def _responses_text(
+    stream: Any, usage: Dict[str, Any]
+) -> AsyncGenerator[str, None]:
+    """Responses API transport, the server keeps the conversation"""
+    async for event in stream:
+        kind = getattr(event, "type", "")
+        if kind == "response.output_text.delta":
+            yield event.delta
+        elif kind == "response.created":
+            usage["response_id"] = event.response.id
+        elif kind == "response.completed":
+            u = event.response.usage
+            usage["response_id"] = event.response.id
+            usage["input_tokens"] = getattr(u, "input_tokens", 0) or 0
+            usage["output_tokens"] = getattr(u, "output_tokens", 0) or 0
+            usage["cached_tokens"] = ledger.cached_tokens(u)
+        elif kind in ("response.failed", "error"):
+            error = getattr(getattr(event, "response", None), "error", None) or event
+            raise RuntimeError(f"Responses API request failed: {error}")
+
+
+async def _open_responses(
+    client: Any, use_model: str, messages: list, previous_id: Optional[str]
+) -> Optional[Any]:
+    """start a Responses stream, None when the caller should fall back"""
+    global _responses_unsupported
+    import openai
+
+    kwargs: Dict[str, Any] = {"model": use_model, "stream": True}
+    if previous_id:
+        # the server already has everything up to the last answer
+        kwargs["previous_response_id"] = previous_id
+        kwargs["input"] = _wire(messages[-1:])
+    else:
+        kwargs["input"] = _wire(messages)
+    if supports_temperature(use_model):
+        kwargs["temperature"] = 0.5
+
+    try:
+        return await ratelimit.call_async(
+            "openai",
+            lambda: client.responses.create(**kwargs),
+            # the server still reads the stored conversation
+            tokens=ratelimit.estimate_tokens(messages),
+            ledger_fields={"kind": "chat", "model": use_model, "backend": "responses"},
+        )
+    except openai.NotFoundError:
+        if not previous_id:
+            _responses_unsupported = True
+        return None  # endpoint missing, or the stored response expired
+    except openai.BadRequestError:
+        if previous_id:
+            return None  # stale previous_response_id, resend the history
+        raise
+
+
+async def _openai_stream(
     question: str,
     *,
     jd_markdown: str,
     resume_text: str,
-    model: Optional[str] = None,
-    prompt_name: str = "swe_intern_chat",
-    history: Optional[list] = None,
-) -> Generator[str, None, Dict[str, Any]]:
-    """Stream answer tokens for a user question about the job/resume context"""
-    if settings().ai_provider == "codex":
-        result = yield from codex.chat_about_job_stream(
-            question,
-            jd_markdown=jd_markdown,
-            resume_text=resume_text,
-            model=model,
-            prompt_name=prompt_name,
-            history=history,
-        )
-        return result
-
+    model: Optional[str],
+    prompt_name: str,
+    history: Optional[list],
+) -> AsyncGenerator[Any, None]:
     use_model = model or settings().openai_model
-    client = get_client()
+    client = get_async_client()
 
+    report = None
     if history is None:
         # first time build initial context with system prompt and static content
-        PROMPT = load_prompt(prompt_name)
-        SYSTEM_PROMPT = PROMPT["system"]
-        USER_TEMPLATE = PROMPT["user_template"]
-        user_prompt = USER_TEMPLATE.format(
-            job=jd_markdown[:12000], resume=resume_text[:12000]
-        )
+        with trace.span("prompt.build"):
+            PROMPT = load_prompt(prompt_name)
+            SYSTEM_PROMPT = PROMPT["system"]
+            USER_TEMPLATE = PROMPT["user_template"]
+            job, resume, report = budget.allocate(jd_markdown, resume_text, use_model)
+            user_prompt = USER_TEMPLATE.format(job=job, resume=resume)
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
@@ -49,38 +189,36 @@ def chat_about_job_stream(
     else:
         messages = history + [{"role": "user", "content": question}]
 
-    kwargs = {
-        "model": use_model,
-        "messages": messages,
-        "stream": True,
-        "stream_options": {"include_usage": True},
-    }
-
-    if supports_temperature(use_model):
-        kwargs["temperature"] = 0.5
-
-    input_tokens = 0
-    output_tokens = 0
+    usage: Dict[str, Any] = {"input_tokens": 0, "output_tokens": 0}
     full_text = []
 
     start_time = time.perf_counter()
-    stream = client.chat.completions.create(**kwargs)
-    for chunk in stream:
-        choice = (chunk.choices or [None])[0]
-        delta = getattr(choice, "delta", None)
-        if delta is not None:
-            content = getattr(delta, "content", None)
-            if content:
-                full_text.append(content)
-                yield content
+    stream = None
+    sent = messages
+    if settings().chat_backend == "responses" and not _responses_unsupported:
+        previous_id = (history or [{}])[-1].get("response_id")
+        with trace.span("llm.request", backend="responses"):
+            stream = await _open_responses(client, use_model, messages, previous_id)
+            if stream is not None and previous_id:
+                sent = messages[-1:]
+            elif previous_id:
+                stream = await _open_responses(client, use_model, messages, None)
 
-        usage = getattr(chunk, "usage", None)
-        if usage:
-            input_tokens = getattr(usage, "prompt_tokens", input_tokens) or input_tokens
-            output_tokens = (
-                getattr(usage, "completion_tokens", output_tokens) or output_tokens
-            )
+    backend = "responses" if stream is not None else "completions"
+    chunks = (
+        _responses_text(stream, usage)
+        if stream is not None
+        else _completions_text(client, use_model, messages, usage)
+    )
+    first_at = None
+    async for content in chunks:
+        if first_at is None:
+            first_at = time.perf_counter()
+        full_text.append(content)
+        yield content
 
+    input_tokens = usage["input_tokens"]
+    output_tokens = usage["output_tokens"]
     total_text = "".join(full_text)
     elapsed = int((time.perf_counter() - start_time) * 1000)
 
@@ -95,17 +233,142 @@ def chat_about_job_stream(
             "pricing_per_1k": pricing(use_model),
         }
     )
-    updated_history = messages + [{"role": "assistant", "content": total_text}]
+    ledger.record(
+        "chat",
+        provider="openai",
+        model=use_model,
+        prompt=prompt_name,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cached_tokens=usage.get("cached_tokens", 0),
+        latency_ms=elapsed,
+        cost_usd=cost.get("total_cost_usd", 0.0),
+        ttft_ms=int((first_at - start_time) * 1000) if first_at else None,
+        backend=backend,
+    )
+    answer_msg = {"role": "assistant", "content": total_text}
+    if usage.get("response_id"):
+        answer_msg["response_id"] = usage["response_id"]
+    updated_history = messages + [answer_msg]
 
-    return {
+    # fold old turns into the running summary now, after the answer has been
+    # shown, so the next request starts small
+    summary_cost = None
+    try:
+        with trace.span("history.compact"):
+            updated_history, summary_cost = await compact(
+                updated_history, model=use_model
+            )
+    except Exception:
+        pass  # keep the full history, the next turn just sends more
+    summary_usd = (summary_cost or {}).get("total_cost_usd", 0.0)
+
+    yield {
         "answer": total_text,
         "history": updated_history,
         "_meta": {
             "model": use_model,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
-            "total_cost_usd": cost.get("total_cost_usd", 0.0),
+            "total_cost_usd": cost.get("total_cost_usd", 0.0) + summary_usd,
+            "summary_cost_usd": summary_usd,
+            "summarized": summary_cost is not None,
+            "sent_tokens": message_tokens(sent, use_model),
             "elapsed": elapsed,
             "provider": "openai",
+            "backend": backend,
+            "input_budget": report,
         },
     }
+
+
+def chat_about_job_stream_async(
+    question: str,
+    *,
+    jd_markdown: str,
+    resume_text: str,
+    model: Optional[str] = None,
+    prompt_name: str = "swe_intern_chat",
+    history: Optional[list] = None,
+) -> AsyncChatStream:
+    """async stream of answer tokens for a user question about the job/resume context"""
+    kwargs = {
+        "jd_markdown": jd_markdown,
+        "resume_text": resume_text,
+        "model": model,
+        "prompt_name": prompt_name,
+        "history": history,
+    }
+    if settings().ai_provider == "codex":
+        return AsyncChatStream(_codex_stream(question, **kwargs))
+    return AsyncChatStream(_openai_stream(question, **kwargs))
+
+
+def chat_about_job_stream(
+    question: str,
+    *,
+    jd_markdown: str,
+    resume_text: str,
+    model: Optional[str] = None,
+    prompt_name: str = "swe_intern_chat",
+    history: Optional[list] = None,
+) -> Generator[str, None, Dict[str, Any]]:
+    """Stream answer tokens for a user question about the job/resume context"""
+    provider = settings().ai_provider
+    with trace.span("chat_about_job_stream", provider=provider) as span:
+        if provider == "codex":
+            chunks = codex.chat_about_job_stream(
+                question,
+                jd_markdown=jd_markdown,
+                resume_text=resume_text,
+                model=model,
+                prompt_name=prompt_name,
+                history=history,
+            )
+        else:
+            chunks = _sync_stream(
+                chat_about_job_stream_async(
+                    question,
+                    jd_markdown=jd_markdown,
+                    resume_text=resume_text,
+                    model=model,
+                    prompt_name=prompt_name,
+                    history=history,
+                )
+            )
+        first = True
+        try:
+            while True:
+                chunk = next(chunks)
+                if first:
+                    trace.mark("first token")
+                    first = False
+                yield chunk
+        except StopIteration as done:
+            result = done.value or {}
+        finally:
+            chunks.close()
+        meta = result.get("_meta") or {}
+        span.set(
+            **{
+                k: meta[k]
+                for k in ("backend", "input_tokens", "output_tokens")
+                if meta.get(k)
+            }
+        )
+        return result
+
+
+def _sync_stream(stream: AsyncChatStream) -> Generator[str, None, Dict[str, Any]]:
+    """drive an AsyncChatStream from sync code on the shared background loop"""
+    try:
+        while True:
+            try:
+                chunk = run_sync(stream.__anext__())
+            except StopAsyncIteration:
+                break
+            yield chunk
+    finally:
+        if stream.result is None:
+            run_sync(stream.aclose())
+    return stream.result or {}
@@ -1,16 +1,135 @@
-from openai import OpenAI
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Coroutine, Optional, TypeVar
 
 from swe_szn.config import settings
 
+# the openai SDK (and httpx) are imported when a client is first built, so
+# cached runs never load them
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+T = TypeVar("T")
+
 client = None
 
+# one AsyncOpenAI (and connection pool) per event loop, httpx pools are loop-bound
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
 
-def get_client():
+# background loop that backs the sync wrappers so they share one pool
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _require_openai() -> None:
     if settings().ai_provider == "codex":
         raise RuntimeError(
             "OpenAI client is unavailable when SWE_SZN_AI_PROVIDER=codex"
         )
+
+
+def get_client():
+    _require_openai()
     global client
     if "client" not in globals() or client is None:
+        from openai import OpenAI
+
         client = OpenAI(api_key=settings().require_openai_key())
     return client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """return the pooled AsyncOpenAI client for the running event loop"""
+    _require_openai()
+    loop = asyncio.get_running_loop()
+    aclient = _async_clients.get(loop)
+    if aclient is None:
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        s = settings()
+        limits = httpx.Limits(
+            max_connections=s.openai_max_connections,
+            max_keepalive_connections=s.openai_max_keepalive,
+            keepalive_expiry=s.openai_keepalive_expiry,
+        )
+        # retries live in services.ratelimit, which shares backoff across
+        # requests; SDK retries on top would multiply the attempts
+        aclient = AsyncOpenAI(
+            api_key=s.require_openai_key(),
+            http_client=DefaultAsyncHttpxClient(limits=limits),
+            max_retries=0,
+            timeout=s.openai_timeout,
+        )
+        _async_clients[loop] = aclient
+    return aclient
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="swe-szn-openai", daemon=True
+            ).start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """run a coroutine on the shared background loop and wait for the result"""
+    loop = _background_loop()
+    try:
+        running: Any = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync called from the background event loop")
+    ctx = contextvars.copy_context()
+    done: "concurrent.futures.Future[T]" = concurrent.futures.Future()
+    tasks: list = []
+
+    def start() -> None:
+        task = loop.create_task(_in_context(ctx, coro))
+        task.add_done_callback(lambda t: _settle(t, done))
+        tasks.append(task)
+
+    loop.call_soon_threadsafe(start)
+    try:
+        return done.result()
+    except BaseException:
+        if not done.done():
+            # e.g. Ctrl+C while waiting: cancel the task and let it unwind
+            # before the caller cleans up (an async generator still inside a
+            # step cannot be closed); queued after start, so tasks is set
+            loop.call_soon_threadsafe(lambda: tasks[0].cancel())
+            try:
+                done.result()
+            except BaseException:
+                pass  # the interrupt is what the caller should see
+        raise
+
+
+def _settle(task: "asyncio.Task[T]", done: "concurrent.futures.Future[T]") -> None:
+    if task.cancelled():
+        done.cancel()
+    elif task.exception() is not None:
+        done.set_exception(task.exception())
+    else:
+        done.set_result(task.result())
+
+
+async def _in_context(ctx: contextvars.Context, coro: Coroutine[Any, Any, T]) -> T:
+    """run `coro` with the caller's context variables (e.g. the open trace span);
+    tasks on the background loop would otherwise start from the loop's"""
+    for var, value in ctx.items():
+        var.set(value)
+    return await coro
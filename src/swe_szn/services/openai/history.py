@@ -0,0 +1,138 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from swe_szn.config import settings
+from swe_szn.services import ledger, ratelimit
+from swe_szn.services.budget import count_tokens
+
+from .client import get_async_client
+from .models import estimate_cost, supports_temperature
+
+# system prompt + job/resume context, always sent verbatim
+PINNED = 2
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+# rough per-message overhead of the chat format
+MESSAGE_OVERHEAD = 4
+
+SUMMARY_SYSTEM = (
+    "You keep a running summary of a chat between a job seeker and a recruiting "
+    "assistant about one job posting and resume. Merge the new turns into the "
+    "current summary. Keep facts about the candidate, decisions, drafted text "
+    "the user may refer back to, and open questions. Drop pleasantries. "
+    "Plain text, under 200 words."
+)
+
+
+def message_tokens(messages: List[Dict[str, Any]], model: str) -> int:
+    return sum(
+        count_tokens(m.get("content") or "", model) + MESSAGE_OVERHEAD for m in messages
+    )
+
+
+def split(
+    history: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Optional[str], List[Dict[str, Any]]]:
+    """(pinned messages, running summary, verbatim turns)"""
+    pinned = history[:PINNED]
+    rest = history[PINNED:]
+    summary = None
+    if rest and rest[0].get("role") == "system":
+        content = rest[0].get("content") or ""
+        if content.startswith(SUMMARY_PREFIX):
+            summary = content[len(SUMMARY_PREFIX) :]
+            rest = rest[1:]
+    return pinned, summary, rest
+
+
+def join(
+    pinned: List[Dict[str, Any]],
+    summary: Optional[str],
+    turns: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    summary_msg = (
+        [{"role": "system", "content": SUMMARY_PREFIX + summary}] if summary else []
+    )
+    return pinned + summary_msg + turns
+
+
+def to_fold(turns: List[Dict[str, Any]], model: str) -> int:
+    """how many leading messages to fold into the summary
+
+    folding starts once there are twice SWE_SZN_CHAT_KEEP_TURNS exchanges or
+    the turns exceed SWE_SZN_CHAT_HISTORY_TOKENS, and keeps the last
+    SWE_SZN_CHAT_KEEP_TURNS verbatim (fewer if they alone are over budget, the
+    latest is always kept). folding in batches keeps summary calls rare and
+    lets a Responses API conversation chain for several turns in between
+    """
+    s = settings()
+    keep = max(1, s.chat_keep_turns) * 2
+    if len(turns) <= keep * 2 and message_tokens(turns, model) <= s.chat_history_tokens:
+        return 0
+    keep = min(len(turns), keep)
+    while keep > 2 and message_tokens(turns[-keep:], model) > s.chat_history_tokens:
+        keep -= 2
+    return len(turns) - keep
+
+
+def _transcript(turns: List[Dict[str, Any]]) -> str:
+    return "\n\n".join(
+        f"{(m.get('role') or 'user').upper()}:\n{m.get('content') or ''}" for m in turns
+    )
+
+
+async def compact(
+    history: List[Dict[str, Any]], *, model: str
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """fold old turns into the running summary with the cheap summary model
+
+    returns (history, cost of the summary call or None when nothing changed)
+    """
+    pinned, summary, turns = split(history)
+    n = to_fold(turns, model)
+    if n <= 0:
+        return history, None
+
+    summary_model = settings().chat_summary_model
+    kwargs: Dict[str, Any] = {
+        "model": summary_model,
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM},
+            {
+                "role": "user",
+                "content": f"Current summary:\n{summary or '(none)'}\n\n"
+                f"New turns:\n{_transcript(turns[:n])}",
+            },
+        ],
+    }
+    if supports_temperature(summary_model):
+        kwargs["temperature"] = 0.2
+
+    start_time = time.perf_counter()
+    client = get_async_client()
+    resp = await ratelimit.call_async(
+        "openai",
+        lambda: client.chat.completions.create(**kwargs),
+        tokens=ratelimit.estimate_tokens(kwargs["messages"]),
+        ledger_fields={"kind": "chat_summary", "model": summary_model},
+    )
+    elapsed = int((time.perf_counter() - start_time) * 1000)
+    new_summary = (resp.choices[0].message.content or "").strip() or summary
+    usage = resp.usage
+    cost = estimate_cost(
+        summary_model,
+        usage.prompt_tokens if usage else 0,
+        usage.completion_tokens if usage else 0,
+    )
+    ledger.record(
+        "chat_summary",
+        provider="openai",
+        model=summary_model,
+        input_tokens=cost["input_tokens"],
+        output_tokens=cost["output_tokens"],
+        cached_tokens=ledger.cached_tokens(usage),
+        latency_ms=elapsed,
+        cost_usd=cost["total_cost_usd"],
+    )
+    # the server-side conversation no longer matches, the next turn starts a new one
+    kept = [{k: v for k, v in m.items() if k != "response_id"} for m in turns[n:]]
+    return join(pinned, new_summary, kept), cost
@@ -1,8 +1,15 @@
 from typing import Dict, Union
 
+# Batch API requests are billed at half the synchronous price
+BATCH_DISCOUNT = 0.5
+
+# JD + resume tokens sent per request when a model sets no input_budget
+DEFAULT_INPUT_BUDGET = 6000
+
 MODELS = {
     # gpt-5 family
     "gpt-5": {
+        "input_budget": 8000,
         "temperature": False,
         "pricing": {
             "input": 0.00125,
@@ -12,6 +19,7 @@ MODELS = {
         "effort": "low",
     },
     "gpt-5-mini": {
+        "input_budget": 8000,
         "temperature": False,
         "pricing": {
             "input": 0.00025,
@@ -21,6 +29,7 @@ MODELS = {
         "effort": "low",
     },
     "gpt-5-nano": {
+        "input_budget": 6000,
         "temperature": False,
         "pricing": {
             "input": 0.00005,
@@ -31,6 +40,7 @@ MODELS = {
     },
     # gpt-4.1 family
     "gpt-4.1": {
+        "input_budget": 8000,
         "temperature": True,
         "pricing": {
             "input": 0.00300,
@@ -38,6 +48,7 @@ MODELS = {
         },
     },
     "gpt-4.1-mini": {
+        "input_budget": 8000,
         "temperature": True,
         "pricing": {
             "input": 0.00080,
@@ -45,6 +56,7 @@ MODELS = {
         },
     },
     "gpt-4.1-nano": {
+        "input_budget": 6000,
         "temperature": True,
         "pricing": {
             "input": 0.00020,
@@ -53,6 +65,7 @@ MODELS = {
     },
     # gpt-4o family
     "gpt-4o": {
+        "input_budget": 8000,
         "temperature": True,
         "pricing": {
             "input": 0.00250,
@@ -62,6 +75,7 @@ MODELS = {
         "effort": None,
     },
     "gpt-4o-mini": {
+        "input_budget": 6000,
         "temperature": True,
         "pricing": {
             "input": 0.00060,
@@ -83,13 +97,19 @@ def pricing(model: str) -> Dict[str, float]:
     return cfg.get("pricing", {})
 
 
+def input_budget(model: str) -> int:
+    cfg = MODELS.get(model) or {}
+    return int(cfg.get("input_budget", DEFAULT_INPUT_BUDGET))
+
+
 def estimate_cost(
-    model: str, input_tokens: int, output_tokens: int
+    model: str, input_tokens: int, output_tokens: int, *, batch: bool = False
 ) -> Dict[str, Union[float, str, dict]]:
     """Estimate the cost of an OpenAI API request"""
     model_pricing = pricing(model)
-    input_cost = (input_tokens / 1000) * model_pricing.get("input", 0.0)
-    output_cost = (output_tokens / 1000) * model_pricing.get("output", 0.0)
+    factor = BATCH_DISCOUNT if batch else 1.0
+    input_cost = (input_tokens / 1000) * model_pricing.get("input", 0.0) * factor
+    output_cost = (output_tokens / 1000) * model_pricing.get("output", 0.0) * factor
     total_cost = input_cost + output_cost
 
     return {
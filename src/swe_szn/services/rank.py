@@ -0,0 +1,221 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from swe_szn.config import settings
+from swe_szn.services.cache import CacheBackend, md5_digest, open_store
+
+SORT_FIELDS = (
+    "match_score",
+    "skills_match",
+    "experience_alignment",
+    "keyword_coverage",
+    "created_at",
+)
+# substring filters, case-insensitive
+FILTER_FIELDS = ("title", "company", "location", "season")
+
+
+def resume_digest(resume_text: str) -> str:
+    """the resume part of the analysis cache key"""
+    return md5_digest(resume_text, limit=8000)
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class AnalysisIndex:
+    """one row per cached analysis with its scores and job fields, so ranking
+    and filtering never open the cached JSON"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS analyses (
+        key TEXT PRIMARY KEY,
+        resume_digest TEXT,
+        provider TEXT,
+        model TEXT,
+        job_url TEXT,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        season TEXT,
+        match_score INTEGER,
+        skills_match INTEGER,
+        experience_alignment INTEGER,
+        keyword_coverage INTEGER,
+        created_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_analyses_resume_score
+        ON analyses (resume_digest, match_score DESC);
+    CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses (match_score DESC);
+    """
+    COLUMNS = (
+        "key",
+        "resume_digest",
+        "provider",
+        "model",
+        "job_url",
+        "title",
+        "company",
+        "location",
+        "season",
+        "match_score",
+        "skills_match",
+        "experience_alignment",
+        "keyword_coverage",
+        "created_at",
+    )
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            conn = self._conn()
+            conn.executescript(self.SCHEMA)
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(key: str, result: Dict[str, Any], created_at: float) -> Tuple:
+        job = result.get("job") or {}
+        meta = result.get("_meta") or {}
+        scores = result.get("scores") or {}
+        season = job.get("season")
+        return (
+            key,
+            meta.get("resume_digest"),
+            meta.get("provider"),
+            meta.get("model"),
+            job.get("url") or meta.get("job_url"),
+            job.get("title"),
+            job.get("company"),
+            job.get("location"),
+            season.get("time") if isinstance(season, dict) else season,
+            _int(result.get("match_score")),
+            _int(scores.get("skills_match")),
+            _int(scores.get("experience_alignment")),
+            _int(scores.get("keyword_coverage")),
+            created_at,
+        )
+
+    def _insert(self, conn: sqlite3.Connection, rows: List[Tuple]) -> None:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO analyses ({', '.join(self.COLUMNS)})"
+            f" VALUES ({', '.join('?' * len(self.COLUMNS))})",
+            rows,
+        )
+
+    def add(self, key: str, result: Dict[str, Any]) -> None:
+        with self._write_lock:
+            conn = self._conn()
+            self._insert(conn, [self._row(key, result, time.time())])
+            conn.commit()
+
+    def keys(self) -> set:
+        return {k for (k,) in self._conn().execute("SELECT key FROM analyses")}
+
+    def sync(self, store: CacheBackend) -> Tuple[int, int]:
+        """index analyses the store has that the index lacks and drop rows
+        for evicted entries; returns (added, removed)"""
+        indexed = self.keys()
+        cached = set(store.keys("openai"))
+        # a bulk read: backfilling is not a cache hit and must not refresh the
+        # entries' LRU position
+        rows = [
+            self._row(key, result, created_at)
+            for key, result, created_at in store.peek("openai", cached - indexed)
+        ]
+        gone = [(k,) for k in indexed - cached]
+        with self._write_lock:
+            conn = self._conn()
+            self._insert(conn, rows)
+            conn.executemany("DELETE FROM analyses WHERE key = ?", gone)
+            conn.commit()
+        return len(rows), len(gone)
+
+    def undigested(self) -> int:
+        """analyses cached before resume digests were recorded, which a
+        resume filter can never match"""
+        (count,) = (
+            self._conn()
+            .execute("SELECT COUNT(*) FROM analyses WHERE resume_digest IS NULL")
+            .fetchone()
+        )
+        return count
+
+    def query(
+        self,
+        *,
+        resume_digest: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        min_score: Optional[int] = None,
+        sort: str = "match_score",
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """top `limit` analyses, best first; a posting analyzed more than once
+        (another model or provider) is listed once, with its best run"""
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}")
+        where, params = [], []
+        if resume_digest is not None:
+            where.append("resume_digest = ?")
+            params.append(resume_digest)
+        for field, value in (filters or {}).items():
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"unknown filter {field!r}")
+            if value:
+                where.append(f"{field} LIKE ?")
+                params.append(f"%{value}%")
+        if min_score is not None:
+            where.append("match_score >= ?")
+            params.append(min_score)
+
+        # sqlite returns the other columns from the row holding the MAX()
+        sql = (
+            f"SELECT {', '.join(self.COLUMNS)}, MAX({sort}) AS best FROM analyses"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " GROUP BY COALESCE(job_url, key) ORDER BY best DESC, key LIMIT ?"
+        )
+        rows = self._conn().execute(sql, (*params, limit)).fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_index: Optional[AnalysisIndex] = None
+_index_lock = threading.Lock()
+
+
+def open_index() -> AnalysisIndex:
+    global _index
+    path = settings().cache_root / "index.sqlite3"
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = AnalysisIndex(path)
+        return _index
+
+
+def record(store: CacheBackend, key: str, result: Dict[str, Any]) -> None:
+    """index a freshly cached analysis; flat `cache_dir` stores are not indexed"""
+    if store is open_store():
+        open_index().add(key, result)
@@ -0,0 +1,371 @@
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from swe_szn.config import settings
+from swe_szn.services import ledger
+
+T = TypeVar("T")
+
+# seconds of RPM/TPM budget that may be spent at once
+BURST_SECONDS = 10
+# full-jitter exponential backoff: a random wait up to BASE * 2**attempt, capped
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+# how often coroutines re-check for a free slot
+POLL_INTERVAL = 0.05
+# rough answer size charged against TPM before the real usage is known
+OUTPUT_TOKENS_ESTIMATE = 1000
+
+_RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """`rate` units per second, up to `capacity` banked
+
+    callers reserve units up front and are told how long to wait for them, so
+    one bucket serves worker threads and coroutines alike
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # a request bigger than the bucket still goes, once it is full
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """give back (or, when negative, charge) units after the fact"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveLimit:
+    """AIMD cap on requests in flight: one more after a window of successes,
+    halved on a rate limit"""
+
+    def __init__(self, maximum: int, minimum: int = 1) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = self.maximum
+        self.active = 0
+        self._credit = 0.0
+        # requests started before the last cut do not cut again, so a burst
+        # of 429s from one overload halves the limit once
+        self._cut_at = 0.0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.active >= self.limit:
+                return False
+            self.active += 1
+            return True
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    async def acquire_async(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def release(self, started: float, *, ok: bool, rate_limited: bool) -> None:
+        with self._cond:
+            if rate_limited and started >= self._cut_at:
+                self.limit = max(self.minimum, min(self.limit, self.active) // 2)
+                self._cut_at = time.monotonic()
+                self._credit = 0.0
+            elif ok and self.limit < self.maximum:
+                self._credit += 1 / self.limit
+                if self._credit >= 1:
+                    self.limit += 1
+                    self._credit = 0.0
+            self.active -= 1
+            self._cond.notify_all()
+
+
+class Limiter:
+    """shared RPM/TPM budget, in-flight cap and retry-after pause of one provider"""
+
+    def __init__(self, name: str, *, rpm: int, tpm: int, max_in_flight: int) -> None:
+        self.name = name
+        self.requests = TokenBucket(rpm / 60, rpm / 60 * BURST_SECONDS) if rpm else None
+        self.tokens = TokenBucket(tpm / 60, tpm / 60 * BURST_SECONDS) if tpm else None
+        self.in_flight = AdaptiveLimit(max_in_flight)
+        self._paused_until = 0.0
+
+    def delay(self, tokens: int = 0) -> float:
+        """reserve one request (and `tokens`), returning the wait before sending"""
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if tokens and self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """hold every caller back, e.g. for a 429's retry-after"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """correct the TPM bucket once the real token count is known"""
+        if self.tokens is not None and actual:
+            self.tokens.refund(estimated - actual)
+
+
+_limiters: Dict[str, Limiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter(provider: str) -> Limiter:
+    with _limiters_lock:
+        lim = _limiters.get(provider)
+        if lim is None:
+            s = settings()
+            if provider == "openai":
+                lim = Limiter(
+                    provider,
+                    rpm=s.openai_rpm,
+                    tpm=s.openai_tpm,
+                    max_in_flight=s.openai_max_connections,
+                )
+            elif provider == "firecrawl":
+                lim = Limiter(
+                    provider,
+                    rpm=s.firecrawl_rpm,
+                    tpm=0,
+                    max_in_flight=s.firecrawl_max_concurrency,
+                )
+            elif provider == "firecrawl-status":
+                # batch status polls do not count against the scrape RPM
+                lim = Limiter(
+                    provider,
+                    rpm=0,
+                    tpm=0,
+                    max_in_flight=s.firecrawl_max_concurrency,
+                )
+            else:
+                raise ValueError(f"no rate limits for provider {provider!r}")
+            _limiters[provider] = lim
+        return lim
+
+
+def in_flight() -> Dict[str, Tuple[int, int]]:
+    """(active, limit) of every provider used so far"""
+    with _limiters_lock:
+        return {
+            name: (lim.in_flight.active, lim.in_flight.limit)
+            for name, lim in _limiters.items()
+        }
+
+
+def estimate_tokens(messages: list) -> int:
+    """chars/4 of the prompt plus a typical answer, for TPM budgeting"""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + OUTPUT_TOKENS_ESTIMATE
+
+
+# --- retries ---
+
+_listener: contextvars.ContextVar[Optional[Callable[[Dict[str, Any]], None]]] = (
+    contextvars.ContextVar("swe_szn_retry_listener", default=None)
+)
+
+
+@contextmanager
+def listen(fn: Callable[[Dict[str, Any]], None]) -> Iterator[None]:
+    """call `fn` with each wait (throttle or retry) of calls made in this context,
+    e.g. to show it in a progress UI; dicts have provider, reason, delay,
+    attempt and message"""
+    token = _listener.set(fn)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def _notify(info: Dict[str, Any]) -> None:
+    fn = _listener.get()
+    if fn is not None:
+        try:
+            fn(info)
+        except Exception:
+            pass  # a UI callback never fails the request
+
+
+def _status(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """seconds from retry-after-ms / retry-after (delta or HTTP date)"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(exc: BaseException) -> Optional[str]:
+    """why `exc` is worth retrying (e.g. "429", "503", "timeout"), None if not"""
+    if getattr(exc, "code", None) == "insufficient_quota":
+        return None  # a 429 that no amount of waiting fixes
+    status = _status(exc)
+    if status is not None:
+        return str(status) if status in _RETRY_STATUSES else None
+    name = type(exc).__name__.lower()
+    if isinstance(exc, TimeoutError) or "timeout" in name:
+        return "timeout"
+    if isinstance(exc, ConnectionError) or "connection" in name:
+        return "connection"
+    return None
+
+
+def _backoff(exc: BaseException, attempt: int) -> float:
+    jitter = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+    after = _retry_after(exc)
+    return max(after, jitter) if after is not None else jitter
+
+
+class _Attempts:
+    """bookkeeping shared by `call` and `call_async`"""
+
+    def __init__(self, provider: str, tokens: int, fields: Dict[str, Any]) -> None:
+        self.limiter = limiter(provider)
+        self.provider = provider
+        self.tokens = tokens
+        self.fields = fields
+        self.retries = settings().max_retries
+        self.started = 0.0
+
+    def throttle(self) -> float:
+        wait = self.limiter.delay(self.tokens)
+        if wait >= 1:
+            _notify(
+                {
+                    "provider": self.provider,
+                    "reason": "throttled",
+                    "delay": wait,
+                    "attempt": 0,
+                    "message": f"waiting {wait:.0f}s for {self.provider} rate limits",
+                }
+            )
+        return wait
+
+    def succeeded(self) -> None:
+        self.limiter.in_flight.release(self.started, ok=True, rate_limited=False)
+
+    def failed(self, exc: BaseException, attempt: int) -> float:
+        """back-off before the next attempt; re-raises when `exc` is final"""
+        reason = classify(exc)
+        self.limiter.in_flight.release(
+            self.started, ok=False, rate_limited=reason == "429"
+        )
+        if self.limiter.tokens is not None:
+            self.limiter.tokens.refund(self.tokens)
+        if reason is None or attempt >= self.retries:
+            raise exc
+        delay = _backoff(exc, attempt)
+        if reason == "429":
+            self.limiter.pause(delay)
+        ledger.record(
+            **{"kind": "request", "provider": self.provider, **self.fields},
+            latency_ms=int((time.monotonic() - self.started) * 1000),
+            error=type(exc).__name__,
+            retry=attempt + 1,
+            status=reason,
+        )
+        _notify(
+            {
+                "provider": self.provider,
+                "reason": reason,
+                "delay": delay,
+                "attempt": attempt + 1,
+                "message": f"{self.provider} {reason}, retry {attempt + 1}/"
+                f"{self.retries} in {delay:.1f}s",
+            }
+        )
+        return delay
+
+
+def call(
+    provider: str,
+    fn: Callable[[], T],
+    *,
+    tokens: int = 0,
+    ledger_fields: Optional[Dict[str, Any]] = None,
+) -> T:
+    """run `fn` within the provider's rate limits, retrying 429s, 5xx, timeouts
+    and dropped connections with jittered backoff (honoring retry-after);
+    `ledger_fields` (kind, model, prompt) label the retries in the usage ledger
+    """
+    attempts = _Attempts(provider, tokens, ledger_fields or {})
+    attempt = 0
+    while True:
+        attempts.limiter.in_flight.acquire()
+        time.sleep(attempts.throttle())
+        attempts.started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as exc:
+            time.sleep(attempts.failed(exc, attempt))
+            attempt += 1
+            continue
+        attempts.succeeded()
+        return result
+
+
+async def call_async(
+    provider: str,
+    fn: Callable[[], Awaitable[T]],
+    *,
+    tokens: int = 0,
+    ledger_fields: Optional[Dict[str, Any]] = None,
+) -> T:
+    """`call` for coroutines; `fn` makes a fresh awaitable per attempt"""
+    attempts = _Attempts(provider, tokens, ledger_fields or {})
+    attempt = 0
+    while True:
+        await attempts.limiter.in_flight.acquire_async()
+        await asyncio.sleep(attempts.throttle())
+        attempts.started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as exc:
+            await asyncio.sleep(attempts.failed(exc, attempt))
+            attempt += 1
+            continue
+        attempts.succeeded()
+        return result
@@ -1,14 +1,159 @@
+import hashlib
+import importlib.metadata
+import multiprocessing
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
 
-from pypdf import PdfReader
+from swe_szn import trace
+from swe_szn.config import settings
+from swe_szn.services.cache import hash_key, md5_digest, open_store
 
+# bump when parse_pdf output changes so cached text is re-extracted; read from
+# package metadata so cache lookups do not have to import pypdf
+EXTRACTOR_VERSION = f"pypdf-{importlib.metadata.version('pypdf')}/3"
+
+# fan out over processes only when a document has at least this many pages:
+# a cold spawn pool costs ~0.5s before the first page, pypdf takes ~10ms a
+# page, so even 4 real cores only come out ahead around 75 pages
+MIN_PARALLEL_PAGES = 80
+
+# page extractors, selected with SWE_SZN_RESUME_EXTRACTOR
+EXTRACTORS: Dict[str, Callable] = {
+    "pypdf": lambda page: page.extract_text() or "",
+    "pypdf-layout": lambda page: page.extract_text(extraction_mode="layout") or "",
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _extractor(name: Optional[str]) -> str:
+    name = name or settings().resume_extractor
+    if name not in EXTRACTORS:
+        raise ValueError(
+            f"Unknown resume extractor {name!r} (expected one of {sorted(EXTRACTORS)})"
+        )
+    return name
+
+
+def _extract_pages(path: str, extractor: str, start: int, stop: int) -> List[str]:
+    """extract pages [start, stop) of a PDF, runs inside pool workers"""
+    from pypdf import PdfReader
 
-def parse_pdf(path: str) -> str:
     reader = PdfReader(path)
-    text = []
-    for page in reader.pages:
-        text.append(page.extract_text() or "")
-    return " ".join(" ".join(text).split())
+    fn = EXTRACTORS[extractor]
+    return [fn(reader.pages[i]) for i in range(start, stop)]
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: callers may already have network/worker threads
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def parse_pdf(path: str, *, extractor: Optional[str] = None) -> str:
+    from pypdf import PdfReader
+
+    name = _extractor(extractor)
+    workers = settings().pdf_workers
+    reader = PdfReader(path)
+    n = len(reader.pages)
+
+    if n < MIN_PARALLEL_PAGES or workers <= 1:
+        fn = EXTRACTORS[name]
+        text = [fn(page) for page in reader.pages]
+    else:
+        # contiguous page ranges per worker, joined back in page order
+        size = -(-n // min(workers, n))
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_extract_pages, path, name, i, min(i + size, n))
+            for i in range(0, n, size)
+        ]
+        text = [page for fut in futures for page in fut.result()]
+
+    return _tidy(text)
+
+
+def _tidy(pages: List[str]) -> str:
+    """collapse runs of spaces within lines and drop blank lines, keeping the
+    line breaks: headings on their own line are what budget.split_sections
+    uses to keep skills and experience ahead of the rest"""
+    lines = (" ".join(line.split()) for page in pages for line in page.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def content_hash(path: Path) -> str:
+    """sha256 of the file, reusing the last hash while mtime and size are unchanged"""
+    st = path.stat()
+    store = open_store()
+    stat_key = md5_digest(str(path.resolve()))
+    seen = store.get("resume_stat", stat_key)
+    if (
+        seen is not None
+        and seen.get("mtime_ns") == st.st_mtime_ns
+        and seen.get("size") == st.st_size
+    ):
+        return seen["sha256"]
+
+    digest = _sha256(path)
+    store.put(
+        "resume_stat",
+        stat_key,
+        {
+            "path": str(path.resolve()),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+        },
+    )
+    return digest
+
+
+def parse_pdf_cached(path: Path, *, extractor: Optional[str] = None) -> str:
+    """parse a PDF once per (content hash, extractor, extractor version)"""
+    name = _extractor(extractor)
+    store = open_store()
+    digest = content_hash(path)
+    key = hash_key(digest, name, EXTRACTOR_VERSION)
+
+    cached = store.get("resume", key)
+    if cached is not None:
+        return cached.get("text", "")
+
+    with trace.span("parse_pdf", extractor=name):
+        text = parse_pdf(str(path), extractor=name)
+    store.put(
+        "resume",
+        key,
+        {
+            "text": text,
+            "sha256": digest,
+            "extractor": name,
+            "extractor_version": EXTRACTOR_VERSION,
+            "timestamp": time.time(),
+        },
+        url=str(path.resolve()),
+    )
+    return text
 
 
 def parse_resume(path: str) -> str:
@@ -16,9 +161,60 @@ def parse_resume(path: str) -> str:
     if not p.exists():
         raise FileNotFoundError(f"Resume not found: {path}")
 
-    if p.suffix.lower() == ".pdf":
-        return parse_pdf(str(p))
-    elif p.suffix.lower() == ".txt":
-        return p.read_text(encoding="utf-8", errors="ignore")
-    else:
-        raise ValueError("Resume must be .pdf or .txt")
+    with trace.span("parse_resume", path=p.name):
+        if p.suffix.lower() == ".pdf":
+            return parse_pdf_cached(p)
+        elif p.suffix.lower() == ".txt":
+            return p.read_text(encoding="utf-8", errors="ignore")
+        else:
+            raise ValueError("Resume must be .pdf or .txt")
+
+
+def _fidelity(text: str, reference: str) -> float:
+    """token-level F1 between extracted text and a reference transcript"""
+    got = Counter(text.lower().split())
+    want = Counter(reference.lower().split())
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def benchmark(
+    paths: List[Path], extractors: List[str], *, runs: int = 3
+) -> List[Dict[str, object]]:
+    """time each extractor on each PDF (uncached) and score it against `<name>.txt`"""
+    from pypdf import PdfReader
+
+    rows = []
+    for path in paths:
+        reference_path = path.with_suffix(".txt")
+        reference = (
+            reference_path.read_text(encoding="utf-8", errors="ignore")
+            if reference_path.exists()
+            else None
+        )
+        pages = len(PdfReader(str(path)).pages)
+        for name in extractors:
+            _extractor(name)
+            timings = []
+            text = ""
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                text = parse_pdf(str(path), extractor=name)
+                timings.append((time.perf_counter() - start) * 1000)
+            rows.append(
+                {
+                    "file": path.name,
+                    "pages": pages,
+                    "extractor": name,
+                    "median_ms": statistics.median(timings),
+                    "chars": len(text),
+                    "fidelity": (
+                        _fidelity(text, reference) if reference is not None else None
+                    ),
+                }
+            )
+    return rows
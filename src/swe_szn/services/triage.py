@@ -0,0 +1,320 @@
+import math
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from swe_szn.services.budget import split_sections
+from swe_szn.services.cache import hash_key, md5_digest
+
+# canonical skill -> spellings found in postings and resumes; ambiguous words
+# (go, r, c, spring, rest, excel, lambda, react, js) are only matched in
+# unambiguous forms
+SKILLS: Dict[str, Tuple[str, ...]] = {
+    "Python": ("python",),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "ecmascript"),
+    "TypeScript": ("typescript",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    "C": ("c/c++", "ansi c", "c programming"),
+    "Go": ("golang", "go lang"),
+    "Rust": ("rust",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("swift",),
+    "Scala": ("scala",),
+    "Ruby": ("ruby",),
+    "PHP": ("php",),
+    "R": ("r programming", "rstudio"),
+    "MATLAB": ("matlab",),
+    "SQL": ("sql",),
+    "Bash": ("bash", "shell scripting"),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "sass", "tailwind"),
+    "React": ("react.js", "reactjs"),
+    "React Native": ("react native",),
+    "Angular": ("angular", "angularjs"),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "Next.js": ("next.js", "nextjs"),
+    "Node.js": ("node.js", "nodejs"),
+    "Express": ("express.js", "expressjs"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring Boot": ("spring boot", "spring framework"),
+    "Rails": ("rails", "ruby on rails"),
+    ".NET": (".net", "asp.net", "dotnet"),
+    "GraphQL": ("graphql",),
+    "REST APIs": ("restful", "rest api", "rest apis"),
+    "gRPC": ("grpc",),
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MySQL": ("mysql",),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "DynamoDB": ("dynamodb",),
+    "Elasticsearch": ("elasticsearch", "opensearch"),
+    "Kafka": ("kafka",),
+    "RabbitMQ": ("rabbitmq",),
+    "Spark": ("spark", "pyspark"),
+    "Hadoop": ("hadoop",),
+    "Airflow": ("airflow",),
+    "dbt": ("dbt",),
+    "Snowflake": ("snowflake",),
+    "AWS": ("aws", "amazon web services", "ec2", "s3", "aws lambda"),
+    "GCP": ("gcp", "google cloud"),
+    "Azure": ("azure",),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "CI/CD": ("ci/cd", "continuous integration", "github actions", "jenkins"),
+    "Linux": ("linux", "unix"),
+    "Git": ("git", "github", "gitlab"),
+    "Microservices": ("microservices", "microservice"),
+    "Distributed Systems": ("distributed systems", "distributed system"),
+    "Machine Learning": ("machine learning", "ml"),
+    "Deep Learning": ("deep learning", "neural networks"),
+    "PyTorch": ("pytorch",),
+    "TensorFlow": ("tensorflow",),
+    "scikit-learn": ("scikit-learn", "sklearn"),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "LLMs": ("llm", "llms", "large language models"),
+    "NLP": ("nlp", "natural language processing"),
+    "Computer Vision": ("computer vision", "opencv"),
+    "Data Structures": ("data structures",),
+    "Algorithms": ("algorithms",),
+    "Object-Oriented Design": ("object-oriented", "object oriented", "oop"),
+    "Unit Testing": ("unit testing", "unit tests", "pytest", "junit", "jest"),
+    "Agile": ("agile", "scrum"),
+    "iOS": ("ios",),
+    "Android": ("android",),
+    "Figma": ("figma",),
+    "Tableau": ("tableau",),
+    "Excel": ("microsoft excel", "ms excel"),
+}
+
+# spellings that are only a skill when capitalized as one ("React", not "react
+# to incidents"; "JS", not the "js" of "Node.js"); matched case-sensitively
+CASED_SKILLS: Dict[str, Tuple[str, ...]] = {
+    "React": ("React",),
+    "JavaScript": ("JS",),
+}
+
+# headings whose skills are nice-to-have rather than required
+PREFERRED_HEADINGS = ("prefer", "nice to have", "bonus", "plus", "desired")
+
+# weight of skill coverage vs. overall text similarity in the score
+SKILL_WEIGHT = 0.75
+# tf-idf cosine counted as full marks; a resume rarely overlaps a posting more
+COSINE_FULL = 0.3
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the"
+    " their this to we will with you your".split()
+)
+
+
+class _Automaton:
+    """Aho-Corasick matcher over lowercase patterns, one pass per text"""
+
+    def __init__(self, patterns: Dict[str, str]) -> None:
+        # state 0 is the root; goto, fail and output are indexed by state
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[str, int]]] = [[]]
+        for pattern, label in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((label, len(pattern)))
+
+        # failure links breadth first; depth-1 states fail to the root
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[str, int]]:
+        """(label, start) of every whole-word match"""
+        found = []
+        state = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for label, length in out[state]:
+                start = i - length + 1
+                if _boundary(text, start - 1) and _boundary(text, i + 1):
+                    found.append((label, start))
+        return found
+
+
+def _boundary(text: str, i: int) -> bool:
+    # '+' and '#' belong to a word (c++, c#), '.' does not ("python.")
+    return i < 0 or i >= len(text) or not (text[i].isalnum() or text[i] in "+#")
+
+
+_matcher: Optional[_Automaton] = None
+
+
+def _skills_matcher() -> _Automaton:
+    global _matcher
+    if _matcher is None:
+        _matcher = _Automaton(
+            {alias: skill for skill, aliases in SKILLS.items() for alias in aliases}
+        )
+    return _matcher
+
+
+def _cased_skills(text: str) -> Set[str]:
+    # a handful of spellings: str.find beats another pass of the automaton
+    found = set()
+    for skill, aliases in CASED_SKILLS.items():
+        for alias in aliases:
+            i = text.find(alias)
+            while i != -1:
+                if _boundary(text, i - 1) and _boundary(text, i + len(alias)):
+                    found.add(skill)
+                    break
+                i = text.find(alias, i + 1)
+    return found
+
+
+def find_skills(text: str) -> Set[str]:
+    found = {label for label, _ in _skills_matcher().find(text.lower())}
+    return found | _cased_skills(text)
+
+
+def _job_skills(jd_markdown: str) -> Dict[str, str]:
+    """skill -> must_have | preferred, by the heading it appears under"""
+    found: Dict[str, str] = {}
+    for heading, body in split_sections(jd_markdown):
+        lower = (heading or "").lower()
+        priority = (
+            "preferred" if any(w in lower for w in PREFERRED_HEADINGS) else "must_have"
+        )
+        for skill in find_skills(body):
+            if found.get(skill) != "must_have":
+                found[skill] = priority
+    return found
+
+
+def _terms(text: str) -> Counter:
+    return Counter(t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS)
+
+
+def _cosines(resume_text: str, jd_texts: Sequence[str]) -> List[float]:
+    """tf-idf cosine of the resume against every posting, idf over the postings"""
+    docs = [_terms(t) for t in jd_texts]
+    query = _terms(resume_text)
+    n = len(docs) + 1
+    df: Counter = Counter(query.keys())
+    for doc in docs:
+        df.update(doc.keys())
+    idf = {t: math.log((1 + n) / (1 + c)) + 1 for t, c in df.items()}
+
+    def vector(terms: Counter) -> Dict[str, float]:
+        return {t: (1 + math.log(c)) * idf[t] for t, c in terms.items()}
+
+    q = vector(query)
+    q_norm = math.sqrt(sum(w * w for w in q.values())) or 1.0
+    out = []
+    for doc in docs:
+        d = vector(doc)
+        d_norm = math.sqrt(sum(w * w for w in d.values())) or 1.0
+        dot = sum(w * q[t] for t, w in d.items() if t in q)
+        out.append(dot / (q_norm * d_norm))
+    return out
+
+
+def score_many(resume_text: str, jd_texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """local, deterministic analysis of each posting against the resume
+
+    results follow the LLM analysis schema (scores, keywords.matched/missing)
+    so they render and export the same way; no API calls are made
+    """
+    start_time = time.perf_counter()
+    have = find_skills(resume_text)
+    cosines = _cosines(resume_text, jd_texts)
+    results = []
+    for jd_markdown, cosine in zip(jd_texts, cosines):
+        wanted = _job_skills(jd_markdown)
+        # must-haves count double
+        weights = {s: 2 if p == "must_have" else 1 for s, p in wanted.items()}
+        total = sum(weights.values())
+        coverage = (
+            sum(w for s, w in weights.items() if s in have) / total if total else None
+        )
+        text_score = min(1.0, cosine / COSINE_FULL)
+        score = (
+            SKILL_WEIGHT * coverage + (1 - SKILL_WEIGHT) * text_score
+            if coverage is not None
+            else text_score
+        )
+
+        matched = sorted(s for s in wanted if s in have)
+        missing = [
+            {"token": s, "priority": p}
+            for s, p in sorted(wanted.items(), key=lambda kv: (kv[1], kv[0]))
+            if s not in have
+        ]
+        results.append(
+            {
+                "summary": (
+                    f"Local triage: {len(matched)}/{len(wanted)} skills from the "
+                    f"posting found in the resume, text similarity {cosine:.2f}."
+                ),
+                "match_score": round(score * 100),
+                "scores": {
+                    "skills_match": round((coverage or 0) * 100),
+                    "experience_alignment": 0,
+                    "keyword_coverage": round(text_score * 100),
+                },
+                "strong_matches": [],
+                "gaps": [],
+                "keywords": {"matched": matched, "missing": missing, "quick_wins": []},
+            }
+        )
+
+    elapsed = int((time.perf_counter() - start_time) * 1000)
+    res_digest = md5_digest(resume_text, limit=8000)
+    for result, jd_markdown in zip(results, jd_texts):
+        result["_meta"] = {
+            # built like the analysis cache key, so exports get a stable name
+            "key": hash_key(
+                "triage", "local", md5_digest(jd_markdown, limit=8000), res_digest
+            ),
+            "model": "local",
+            "provider": "triage",
+            "cost_estimate": {"total_cost_usd": 0.0},
+            "elapsed": elapsed,
+        }
+    return results
+
+
+def score(resume_text: str, jd_markdown: str) -> Dict[str, Any]:
+    return score_many(resume_text, [jd_markdown])[0]
+
+
+def outcome(pre: Dict[str, Any], min_score: int) -> Dict[str, Any]:
+    """what goes in result["_meta"]["triage"]"""
+    return {
+        "score": pre["match_score"],
+        "min_score": min_score,
+        "skipped": pre["match_score"] < min_score,
+    }
@@ -0,0 +1,238 @@
+import contextvars
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+EXPORT_FORMATS = ("chrome", "otlp")
+
+# spans cost one attribute lookup while no trace is recording, so the stages
+# stay instrumented all the time and --profile only has to start a trace
+
+
+class Span:
+    """one timed stage; `parent` is the span that was open when it started"""
+
+    __slots__ = ("id", "name", "parent", "start", "end", "tid", "attrs", "marks")
+
+    def __init__(self, id: int, name: str, parent: Optional["Span"], attrs) -> None:
+        self.id = id
+        self.name = name
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.tid = threading.get_ident()
+        self.attrs: Dict[str, Any] = attrs
+        self.marks: List[Tuple[str, float]] = []
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+
+class _NoSpan:
+    """what `span` yields while nothing is recording"""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Trace:
+    """finished spans of one run, in the order they ended"""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter()
+        # wall clock at `origin`, for exports that want absolute times
+        self.epoch = time.time()
+        self.threads: Dict[int, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _open(self, name: str, parent: Optional[Span], attrs) -> Span:
+        with self._lock:
+            s = Span(next(self._ids), name, parent, attrs)
+            self.threads.setdefault(s.tid, threading.current_thread().name)
+        return s
+
+    def _close(self, s: Span) -> None:
+        s.end = time.perf_counter()
+        with self._lock:
+            self.spans.append(s)
+
+    def _us(self, t: float) -> int:
+        return int((t - self.origin) * 1_000_000)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """Trace Event Format, opens in chrome://tracing and ui.perfetto.dev"""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self.threads.items()
+        ]
+        for s in sorted(self.spans, key=lambda s: s.start):
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": "swe-szn",
+                    "ph": "X",
+                    "ts": self._us(s.start),
+                    "dur": self._us(s.end) - self._us(s.start),
+                    "pid": pid,
+                    "tid": s.tid,
+                    "args": {k: _plain(v) for k, v in s.attrs.items()},
+                }
+            )
+            for name, at in s.marks:
+                events.append(
+                    {
+                        "name": name,
+                        "cat": "swe-szn",
+                        "ph": "i",
+                        "s": "t",
+                        "ts": self._us(at),
+                        "pid": pid,
+                        "tid": s.tid,
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON (ExportTraceServiceRequest), for an OpenTelemetry collector"""
+        trace_id = os.urandom(16).hex()
+        salt = os.urandom(4).hex()
+
+        def span_id(s: Span) -> str:
+            return f"{salt}{s.id:08x}"
+
+        def nanos(t: float) -> str:
+            return str(int((self.epoch + t - self.origin) * 1_000_000_000))
+
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start):
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": span_id(s),
+                    "parentSpanId": span_id(s.parent) if s.parent else "",
+                    "name": s.name,
+                    "kind": 1,  # SPAN_KIND_INTERNAL
+                    "startTimeUnixNano": nanos(s.start),
+                    "endTimeUnixNano": nanos(s.end),
+                    "attributes": [
+                        {"key": k, "value": _otlp_value(v)} for k, v in s.attrs.items()
+                    ],
+                    "events": [
+                        {"name": name, "timeUnixNano": nanos(at)}
+                        for name, at in s.marks
+                    ],
+                }
+            )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": "swe-szn"}}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "swe_szn.trace"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+    def write(self, path: Union[str, Path], fmt: str = "chrome") -> Path:
+        """export as `chrome` (Trace Event Format) or `otlp` JSON"""
+        import json
+
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        data = self.to_chrome() if fmt == "chrome" else self.to_otlp()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        return path
+
+
+def _plain(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_trace: Optional[Trace] = None
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "swe_szn_span", default=None
+)
+
+
+def start() -> Trace:
+    """start recording spans, replacing any trace already recording"""
+    global _trace
+    _trace = Trace()
+    return _trace
+
+
+def current() -> Optional[Trace]:
+    return _trace
+
+
+def stop() -> Optional[Trace]:
+    global _trace
+    trace, _trace = _trace, None
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """time the block as `name`, nested under the span open in this context
+
+    yields the span (or a stand-in while nothing records) so the block can
+    `.set()` attributes it only learns on the way, e.g. whether it hit the cache
+    """
+    trace = _trace
+    if trace is None:
+        yield _NO_SPAN
+        return
+    parent = _current.get()
+    s = trace._open(name, parent, attrs)
+    _current.set(s)
+    try:
+        yield s
+    finally:
+        trace._close(s)
+        # set, not reset(token): a generator may close the span from another
+        # context than the one it was opened in
+        _current.set(parent)
+
+
+def mark(name: str) -> None:
+    """note a point in time (e.g. the first streamed token) on the open span"""
+    s = _current.get()
+    if _trace is not None and s is not None:
+        s.marks.append((name, time.perf_counter()))
@@ -0,0 +1,67 @@
+import time
+from typing import Optional
+
+from rich.table import Table
+
+from swe_szn.config import settings
+from swe_szn.ui import rich as ui
+
+
+def _bytes(n: int) -> str:
+    size = float(n or 0)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.3g} {unit}"
+        size /= 1024
+    return f"{size:.3g} GB"
+
+
+def _age(ts: Optional[float]) -> str:
+    if not ts:
+        return "-"
+    secs = max(0, time.time() - ts)
+    if secs < 3600:
+        return f"{secs / 60:.0f}m"
+    if secs < 86400:
+        return f"{secs / 3600:.1f}h"
+    return f"{secs / 86400:.1f}d"
+
+
+def _policy(namespace: str) -> str:
+    ttl, max_bytes = settings().cache_policy(namespace)
+    cap = f"≤{_bytes(max_bytes)}" if max_bytes else "no cap"
+    expiry = _age(time.time() - ttl) if ttl else "no ttl"
+    return f"{cap}, {expiry}"
+
+
+def print_stats(stats: dict) -> None:
+    table = Table(title="Cache Stats", expand=True)
+    table.add_column("Namespace", style="cyan", no_wrap=True)
+    table.add_column("Entries", justify="right", no_wrap=True)
+    table.add_column("Size", justify="right", no_wrap=True)
+    table.add_column("Policy", style="dim", no_wrap=True)
+    table.add_column("Oldest", justify="right", no_wrap=True)
+    table.add_column("Hits", justify="right", style="green", no_wrap=True)
+    table.add_column("Misses", justify="right", style="yellow", no_wrap=True)
+    table.add_column("Hit %", justify="right", no_wrap=True)
+    table.add_column("Evicted", justify="right", style="red", no_wrap=True)
+
+    for ns, st in sorted(stats.items()):
+        lookups = st["hits"] + st["misses"]
+        rate = f"{st['hits'] / lookups:.0%}" if lookups else "-"
+        table.add_row(
+            ns,
+            str(st["entries"]),
+            _bytes(st["bytes"]),
+            _policy(ns),
+            _age(st["oldest"]),
+            str(st["hits"]),
+            str(st["misses"]),
+            rate,
+            str(st["evictions"] + st["expirations"]),
+        )
+
+    ui.console.print(table)
+    ui.console.print(
+        f"[dim]backend: {settings().cache_backend} • {settings().cache_root}[/dim]"
+    )
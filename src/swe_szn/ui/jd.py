@@ -0,0 +1,33 @@
+from typing import List, Tuple
+
+from rich.table import Table
+
+from swe_szn.ui import rich as ui
+
+
+def _reduction(before: int, after: int) -> str:
+    return f"-{1 - after / before:.0%}" if before else "-"
+
+
+def print_clean_reports(rows: List[Tuple[str, dict]]) -> None:
+    table = Table(title="JD Cleanup", expand=True)
+    table.add_column("Posting", style="cyan", overflow="fold")
+    table.add_column("Chars", justify="right", no_wrap=True)
+    table.add_column("Tokens", justify="right", no_wrap=True)
+    table.add_column("Saved", justify="right", style="green", no_wrap=True)
+    table.add_column("Dropped sections", style="dim")
+    table.add_column("Lines removed", justify="right", no_wrap=True)
+    table.add_column("Links/images", justify="right", no_wrap=True)
+
+    for source, report in rows:
+        table.add_row(
+            source,
+            f"{report['chars_before']:,} → {report['chars_after']:,}",
+            f"{report['tokens_before']:,} → {report['tokens_after']:,}",
+            _reduction(report["tokens_before"], report["tokens_after"]),
+            ", ".join(report["dropped_sections"]) or "-",
+            str(report["duplicate_lines"] + report["boilerplate_lines"]),
+            f"{report['links']}/{report['images']}",
+        )
+
+    ui.console.print(table)
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List
+
+from rich.table import Table
+
+from swe_szn.ui import rich as ui
+
+
+def print_ranking(rows: List[Dict[str, Any]], *, sort: str) -> None:
+    table = Table(title=f"Top {len(rows)} jobs by {sort}", expand=True)
+    table.add_column("#", justify="right", style="dim", no_wrap=True)
+    table.add_column("Score", justify="right", style="green", no_wrap=True)
+    table.add_column("S/E/K", justify="right", style="dim", no_wrap=True)
+    table.add_column("Role", style="cyan", overflow="fold", ratio=3)
+    table.add_column("Company", overflow="fold", ratio=2)
+    table.add_column("Location", overflow="fold", ratio=1)
+    table.add_column("Season", overflow="fold", ratio=2)
+
+    for i, row in enumerate(rows, 1):
+        url = row["job_url"] or ""
+        role = row["title"] or url or row["key"]
+        table.add_row(
+            str(i),
+            str(row["match_score"]),
+            f"{row['skills_match']}/{row['experience_alignment']}"
+            f"/{row['keyword_coverage']}",
+            f"[link={url}]{role}[/link]" if url else role,
+            row["company"] or "-",
+            row["location"] or "-",
+            row["season"] or "-",
+        )
+
+    ui.console.print(table)
+    ui.console.print(
+        "[dim]S/E/K: skills match / experience alignment / keyword coverage[/dim]"
+    )
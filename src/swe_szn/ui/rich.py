@@ -8,6 +8,8 @@ from rich.style import StyleType
 from rich.table import Table
 from rich.text import Text
 
+from swe_szn import trace
+
 console = Console()
 
 # --- constants ---
@@ -269,6 +271,29 @@ def _panel_cost(result: dict):
         cost_text = f"${total_cost:.4f}"
     table.add_row("Cost", cost_text)
 
+    budget = meta.get("input_budget") or {}
+    if budget:
+        input_text = f"{budget['used_tokens']}/{budget['budget']} tokens"
+        if budget["used_tokens"] < budget["original_tokens"]:
+            input_text += f" (from {budget['original_tokens']})"
+        table.add_row("Input", input_text)
+
+    clean = meta.get("jd_clean") or {}
+    if clean.get("tokens_before"):
+        saved = 1 - clean["tokens_after"] / clean["tokens_before"]
+        table.add_row(
+            "JD",
+            f"{clean['tokens_before']} → {clean['tokens_after']} tokens (-{saved:.0%})",
+        )
+
+    near = meta.get("near_duplicate") or {}
+    if near:
+        source = near.get("job_url") or near.get("key", "")
+        table.add_row(
+            "Reused",
+            f"{near['similarity']:.0%} match of {source} (--force to re-run)",
+        )
+
     model = meta.get("model", "unknown")
     table.add_row("Model", model)
 
@@ -289,39 +314,40 @@ def _panel_cost(result: dict):
 
 
 def print_overview(result: dict):
-    left_items = [
-        _panel_job(result),
-        _panel_scores(result),
-    ]
-    kws_panel = _panel_keywords(result)
-    if kws_panel is not None:
-        left_items.append(kws_panel)
-    left_group = Group(*left_items, _panel_cost(result))
-
-    right_items = []
-    summary_panel = _panel_summary(result)
-    if summary_panel is not None:
-        right_items.append(summary_panel)
-
-    strengths_gaps_table = _panel_strengths_gaps(result)
-    right_items.append(strengths_gaps_table)
-
-    quick_wins_panel = _panel_quick_wins(result)
-    if quick_wins_panel is not None:
-        right_items.append(quick_wins_panel)
-
-    right_group = Group(*right_items)
-
-    app = side_by_side(
-        left=left_group,
-        right=right_group,
-        total_width=console.size.width,
-        gap=PANEL_GAP,
-        divider=PANEL_DIVIDER,
-        left_border_style="blue",
-        right_border_style="cyan",
-        min_left_width=40,
-        min_right_width=40,
-    )
+    with trace.span("print_overview"):
+        left_items = [
+            _panel_job(result),
+            _panel_scores(result),
+        ]
+        kws_panel = _panel_keywords(result)
+        if kws_panel is not None:
+            left_items.append(kws_panel)
+        left_group = Group(*left_items, _panel_cost(result))
+
+        right_items = []
+        summary_panel = _panel_summary(result)
+        if summary_panel is not None:
+            right_items.append(summary_panel)
+
+        strengths_gaps_table = _panel_strengths_gaps(result)
+        right_items.append(strengths_gaps_table)
+
+        quick_wins_panel = _panel_quick_wins(result)
+        if quick_wins_panel is not None:
+            right_items.append(quick_wins_panel)
+
+        right_group = Group(*right_items)
+
+        app = side_by_side(
+            left=left_group,
+            right=right_group,
+            total_width=console.size.width,
+            gap=PANEL_GAP,
+            divider=PANEL_DIVIDER,
+            left_border_style="blue",
+            right_border_style="cyan",
+            min_left_width=40,
+            min_right_width=40,
+        )
 
-    console.print(app)
+        console.print(app)
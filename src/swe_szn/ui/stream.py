@@ -0,0 +1,121 @@
+import threading
+from typing import Dict, List
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.markdown import Markdown
+from rich.segment import Segment
+
+FENCE = "```"
+
+# rich already starts these with a blank line (the gap before the block)
+_GAPPED_OPENERS = {
+    "bullet_list_open",
+    "ordered_list_open",
+    "blockquote_open",
+    "table_open",
+}
+
+
+class _Block:
+    """a finished markdown block, parsed once and rendered once per width"""
+
+    def __init__(self, text: str) -> None:
+        self.markdown = Markdown(text)
+        self.gapped = _gapped(self.markdown)
+        self._lines: Dict[int, List[List[Segment]]] = {}
+
+    def lines(self, console: Console, options: ConsoleOptions) -> List[List[Segment]]:
+        width = options.max_width
+        lines = self._lines.get(width)
+        if lines is None:
+            lines = console.render_lines(self.markdown, options, pad=False)
+            self._lines = {width: lines}  # only the current width is worth keeping
+        return lines
+
+
+def _gapped(markdown: Markdown) -> bool:
+    return bool(markdown.parsed) and markdown.parsed[0].type in _GAPPED_OPENERS
+
+
+def _fence_lines(text: str) -> int:
+    """count code fence lines in text that starts at the beginning of a line"""
+    count = 1 if text.startswith(FENCE) else 0
+    return count + text.count("\n" + FENCE)
+
+
+class StreamingMarkdown:
+    """markdown renderable for streamed answers
+
+    chunks are appended to one buffer; whenever a block is finished (a blank
+    line outside a code fence) it is parsed and rendered once and cached, so
+    each refresh only re-parses the trailing unfinished block. feed() is cheap
+    and safe to call between Live refresh ticks
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._chunks: List[str] = []
+        self._blocks: List[_Block] = []
+        self._tail = ""
+        self._scan_from = 0  # tail offset already searched for block breaks
+        self._fences = 0  # fence lines in tail[:_scan_from]
+
+    @property
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        with self._lock:
+            self._chunks.append(chunk)
+            self._tail += chunk
+            self._commit()
+
+    def finish(self) -> None:
+        """treat the trailing text as a finished block"""
+        with self._lock:
+            if self._tail.strip():
+                self._blocks.append(_Block(self._tail))
+            self._tail = ""
+            self._scan_from = 0
+            self._fences = 0
+
+    def _commit(self) -> None:
+        while True:
+            idx = self._tail.find("\n\n", self._scan_from)
+            if idx == -1:
+                return
+            self._fences += _fence_lines(self._tail[self._scan_from : idx])
+            self._scan_from = idx + 2
+            if self._fences % 2:
+                continue  # blank line inside a code block
+            block = self._tail[:idx]
+            if block.strip():
+                self._blocks.append(_Block(block))
+            self._tail = self._tail[idx + 2 :]
+            self._scan_from = 0
+            self._fences = 0
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        with self._lock:
+            blocks = list(self._blocks)
+            tail = self._tail
+
+        # same spacing as rendering the whole answer as one Markdown
+        new_line = Segment.line()
+        for i, block in enumerate(blocks):
+            if i and not block.gapped:
+                yield new_line
+            for line in block.lines(console, options):
+                yield from line
+                yield new_line
+
+        if tail.strip():
+            markdown = Markdown(tail)
+            if blocks and not _gapped(markdown):
+                yield new_line
+            yield markdown
@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional
+
+from rich.table import Table
+
+from swe_szn.trace import Span
+from swe_szn.ui import rich as ui
+
+TIMELINE_WIDTH = 40
+
+
+def _ms(seconds: float) -> str:
+    ms = seconds * 1000
+    return f"{ms:.0f}ms" if ms < 1000 else f"{ms / 1000:.2f}s"
+
+
+def _tree(spans: List[Span]) -> List[tuple]:
+    """(depth, span) in call order, children right under their parent"""
+    ids = {s.id for s in spans}
+    children: Dict[Optional[int], List[Span]] = {}
+    for s in spans:
+        parent = s.parent.id if s.parent is not None and s.parent.id in ids else None
+        children.setdefault(parent, []).append(s)
+
+    out = []
+
+    def walk(parent: Optional[int], depth: int) -> None:
+        for s in sorted(children.get(parent, []), key=lambda s: s.start):
+            out.append((depth, s))
+            walk(s.id, depth + 1)
+
+    walk(None, 0)
+    return out
+
+
+def _timeline(s: Span, t0: float, total: float) -> str:
+    scale = TIMELINE_WIDTH / total if total > 0 else 0
+    lead = min(TIMELINE_WIDTH - 1, int((s.start - t0) * scale))
+    length = max(1, min(TIMELINE_WIDTH - lead, round(s.duration * scale)))
+    return "[dim]" + "░" * lead + "[/dim]" + "█" * length
+
+
+def print_waterfall(spans: List[Span], *, title: str = "Profile") -> None:
+    """one row per span, indented under its parent, on a shared time axis"""
+    if not spans:
+        return
+    t0 = min(s.start for s in spans)
+    total = max(s.start + s.duration for s in spans) - t0
+
+    table = Table(title=f"{title} ({_ms(total)})")
+    table.add_column("Span", style="cyan", no_wrap=True)
+    table.add_column("Start", justify="right", style="dim", no_wrap=True)
+    table.add_column("Time", justify="right", style="green", no_wrap=True)
+    table.add_column("Timeline", no_wrap=True, width=TIMELINE_WIDTH)
+    table.add_column("Details", style="dim", overflow="fold")
+
+    for depth, s in _tree(spans):
+        details = [f"{k}={v}" for k, v in s.attrs.items()]
+        details += [f"{name} +{_ms(at - s.start)}" for name, at in s.marks]
+        table.add_row(
+            "  " * depth + s.name,
+            f"+{_ms(s.start - t0)}",
+            _ms(s.duration),
+            _timeline(s, t0, total),
+            " ".join(details),
+        )
+
+    ui.console.print(table)
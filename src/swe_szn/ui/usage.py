@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from rich.table import Table
+
+from swe_szn.ui import rich as ui
+
+
+def _ms(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.0f}ms" if value < 1000 else f"{value / 1000:.1f}s"
+
+
+def _tokens(value: int) -> str:
+    return f"{value / 1000:.1f}k" if value >= 10_000 else str(value)
+
+
+def print_usage(rows: List[Dict[str, Any]], *, by: Sequence[str], title: str) -> None:
+    table = Table(title=title, expand=True)
+    for field in by:
+        table.add_column(field.capitalize(), style="cyan", overflow="fold")
+    table.add_column("Calls", justify="right", no_wrap=True)
+    table.add_column("Cached", justify="right", style="dim", no_wrap=True)
+    table.add_column("Errors", justify="right", style="red", no_wrap=True)
+    table.add_column("Retries", justify="right", style="yellow", no_wrap=True)
+    table.add_column("In → Out tok", justify="right", no_wrap=True)
+    table.add_column("Prompt cache", justify="right", style="dim", no_wrap=True)
+    table.add_column("Cost", justify="right", style="green", no_wrap=True)
+    table.add_column("p50", justify="right", no_wrap=True)
+    table.add_column("p95", justify="right", no_wrap=True)
+    table.add_column("TTFT", justify="right", style="dim", no_wrap=True)
+    table.add_column("Out tok/s", justify="right", style="magenta", no_wrap=True)
+
+    totals = {"calls": 0, "cost_usd": 0.0}
+    for row in rows:
+        totals["calls"] += row["calls"]
+        totals["cost_usd"] += row["cost_usd"]
+        hits = row["cache_hits"]
+        table.add_row(
+            *(row[field] for field in by),
+            str(row["calls"]),
+            f"{hits / row['calls']:.0%}" if hits else "-",
+            str(row["errors"] or "-"),
+            str(row.get("retries") or "-"),
+            f"{_tokens(row['input_tokens'])} → {_tokens(row['output_tokens'])}",
+            (
+                f"{row['cached_tokens'] / row['input_tokens']:.0%}"
+                if row["cached_tokens"] and row["input_tokens"]
+                else "-"
+            ),
+            f"${row['cost_usd']:.4f}",
+            _ms(row["p50_ms"]),
+            _ms(row["p95_ms"]),
+            _ms(row["ttft_p50_ms"]),
+            (
+                f"{row['output_tokens_per_s']:.0f}"
+                if row["output_tokens_per_s"] is not None
+                else "-"
+            ),
+        )
+
+    ui.console.print(table)
+    ui.console.print(
+        f"[dim]{totals['calls']} calls, ${totals['cost_usd']:.4f} total. Latency and"
+        " throughput count provider calls only (not cache hits); batch latency is"
+        " the whole batch's turnaround.[/dim]"
+    )
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services.cache import CacheBackend, JsonDirBackend, SqliteBackend
+
+
+@pytest.fixture
+def capped(monkeypatch):
+    """a 1-day TTL and a byte cap of about three entries on `ns`"""
+    monkeypatch.setenv("SWE_SZN_CACHE_TTL_NS", "86400")
+    monkeypatch.setenv("SWE_SZN_CACHE_MAX_BYTES_NS", str(3 * 1100))
+    settings.cache_clear()
+    yield
+    settings.cache_clear()
+
+
+def _entry(i: int) -> dict:
+    return {"i": i, "pad": "x" * 1000}
+
+
+def test_json_backend_evicts_least_recently_used(tmp_path, capped):
+    store = JsonDirBackend(tmp_path)
+    for i in range(3):
+        store.put("ns", f"k{i}", _entry(i))
+        # mtime resolution; make the access order unambiguous
+        os.utime(tmp_path / "ns" / f"k{i}.json", (time.time() - 10 + i,) * 2)
+
+    assert store.get("ns", "k0") == _entry(0)  # k0 is now the most recent
+    store.put("ns", "k3", _entry(3))
+
+    assert sorted(store.keys("ns")) == ["k0", "k2", "k3"]
+    assert store.stats()["ns"]["evictions"] == 1
+
+
+def test_json_backend_expires_by_stored_creation_time(tmp_path, capped):
+    store = JsonDirBackend(tmp_path)
+    store.put("ns", "old", _entry(0), created_at=time.time() - 2 * 86400)
+
+    # reading does not refresh the creation time, only the access time
+    assert store.get("ns", "old") is None
+    store.put("ns", "new", _entry(1))
+    assert store.get("ns", "new") == _entry(1)
+
+
+def test_json_backend_tracks_namespace_bytes(tmp_path, capped):
+    store = JsonDirBackend(tmp_path)
+    for i in range(3):
+        store.put("ns", f"k{i}", _entry(i))
+    store.put("ns", "k1", {"i": 1})  # overwrite with a smaller entry
+    store.delete("ns", "k2")
+
+    on_disk = sum(e.stat().st_size for e in os.scandir(tmp_path / "ns"))
+    assert store._total("ns") == on_disk
+
+
+def test_backend_missing_a_method_fails_when_created(tmp_path):
+    class NoPeek(JsonDirBackend):
+        peek = CacheBackend.peek
+
+    with pytest.raises(TypeError, match="peek"):
+        NoPeek(tmp_path)
+    # both shipped backends implement the whole interface
+    JsonDirBackend(tmp_path)
+    SqliteBackend(tmp_path / "cache.db").close()
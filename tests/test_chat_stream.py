@@ -0,0 +1,48 @@
+import asyncio
+import signal
+import threading
+
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services.openai import chat
+
+
+@pytest.fixture
+def openai_provider(monkeypatch):
+    monkeypatch.setenv("SWE_SZN_AI_PROVIDER", "openai")
+    settings.cache_clear()
+    yield
+    settings.cache_clear()
+
+
+def _interrupt_main(after: float) -> None:
+    """deliver a real SIGINT to the main thread, like Ctrl+C"""
+    main = threading.main_thread().ident
+    threading.Timer(after, signal.pthread_kill, (main, signal.SIGINT)).start()
+
+
+def test_ctrl_c_cancels_openai_answer_mid_stream(monkeypatch, openai_provider):
+    state = {"cancelled": False, "closed": False}
+
+    async def slow_answer(question, **kwargs):
+        try:
+            yield "first "
+            await asyncio.sleep(30)
+            yield "never"
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(chat, "_openai_stream", slow_answer)
+    gen = chat.chat_about_job_stream("q", jd_markdown="jd", resume_text="resume")
+    assert next(gen) == "first "
+
+    _interrupt_main(0.2)
+    # the interrupt, not "aclose(): asynchronous generator is already running"
+    with pytest.raises(KeyboardInterrupt):
+        next(gen)
+    gen.close()
+    assert state == {"cancelled": True, "closed": True}
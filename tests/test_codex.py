@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services import codex
+
+FAKES = Path(__file__).resolve().parents[1] / "benchmarks" / "fakes" / "bin"
+JD = "# Backend Intern\n\n## Requirements\n\n- Python\n- Kubernetes"
+RESUME = "Software engineering student. Python, PostgreSQL, Redis, Docker."
+
+
+@pytest.fixture
+def fake_codex(monkeypatch):
+    """the fake `codex` first on PATH, a fresh pool, and a record of workers"""
+    monkeypatch.setenv("PATH", f"{FAKES}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_CODEX_STARTUP_MS", "0")
+    monkeypatch.setenv("FAKE_CODEX_TTFT_MS", "0")
+    monkeypatch.setenv("FAKE_CODEX_TPS", "10000")
+    settings.cache_clear()
+    monkeypatch.setattr(codex, "_pool", None)
+    monkeypatch.setattr(codex, "_mcp_unavailable", False)
+
+    started = []
+
+    class Worker(codex._Worker):
+        def __init__(self):
+            super().__init__()
+            started.append(self)
+
+    monkeypatch.setattr(codex, "_Worker", Worker)
+    yield started
+    if codex._pool is not None:
+        codex._pool.close()
+    for worker in started:
+        worker.close()
+    settings.cache_clear()
+
+
+def _no_exec(prompt, *, model=None):
+    raise AssertionError("fell back to `codex exec`")
+
+
+def test_pooled_worker_returns_an_analysis(fake_codex, monkeypatch):
+    monkeypatch.setattr(codex, "_exec", _no_exec)
+    result = codex.compare_jd_vs_resume(JD, RESUME)
+
+    assert json.loads(result["content"])["match_score"] == 70
+    assert len(fake_codex) == 1
+    assert codex._pool._idle == fake_codex  # kept warm for the next call
+
+
+def test_concurrent_calls_use_two_workers(fake_codex, monkeypatch):
+    monkeypatch.setenv("SWE_SZN_CODEX_WORKERS", "2")
+    # long enough that the second call starts while the first is running
+    monkeypatch.setenv("FAKE_CODEX_TTFT_MS", "500")
+    settings.cache_clear()
+    monkeypatch.setattr(codex, "_exec", _no_exec)
+
+    answers = []
+    threads = [
+        threading.Thread(target=lambda: answers.append(codex._run("hello")))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(answers) == 2
+    assert len({w.proc.pid for w in fake_codex}) == 2
+    assert sorted(codex._pool._idle, key=id) == sorted(fake_codex, key=id)
+
+
+def test_timed_out_worker_is_killed_and_not_reused(fake_codex, monkeypatch):
+    monkeypatch.setenv("SWE_SZN_CODEX_TIMEOUT", "0.3")
+    monkeypatch.setenv("FAKE_CODEX_TTFT_MS", "5000")
+    settings.cache_clear()
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        codex._run("hello")
+    slow = fake_codex[0]
+    assert not slow.alive()
+    assert codex._pool._idle == []
+
+    monkeypatch.setenv("SWE_SZN_CODEX_TIMEOUT", "30")
+    monkeypatch.setenv("FAKE_CODEX_TTFT_MS", "0")
+    settings.cache_clear()
+    answer, _ = codex._run("hello")
+
+    assert answer.startswith("Lead with")
+    assert fake_codex[1] is not slow and fake_codex[1].alive()
+    assert codex._pool._idle == [fake_codex[1]]
+
+
+def test_zero_workers_fall_back_to_exec(fake_codex, monkeypatch):
+    monkeypatch.setenv("SWE_SZN_CODEX_WORKERS", "0")
+    settings.cache_clear()
+
+    result = codex.compare_jd_vs_resume(JD, RESUME)
+
+    assert json.loads(result["content"])["match_score"] == 70
+    assert fake_codex == [] and codex._pool is None
@@ -0,0 +1,17 @@
+from swe_szn.services import dedupe
+from swe_szn.services.cache import SqliteBackend
+
+POSTING = " ".join(f"word{i}" for i in range(200))
+
+
+def test_index_loads_fingerprints_without_counting_hits(tmp_path):
+    store = SqliteBackend(tmp_path / "cache.sqlite3")
+    dedupe.add(store, "a1", POSTING, "g")
+    store.flush()
+
+    # a fresh index over the same store, as in the next run
+    matches = dedupe._Index(store).candidates("g", dedupe.signature(POSTING))
+
+    assert [key for _, key in matches] == ["a1"]
+    stats = store.stats()[dedupe.NAMESPACE]
+    assert (stats["hits"], stats["misses"]) == (0, 0)
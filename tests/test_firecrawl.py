@@ -0,0 +1,127 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services import firecrawl, ratelimit
+
+URLS = [f"https://jobs.example/{i}" for i in range(5)]
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class PagedBatch:
+    """a batch that is done on the first poll, with results two per page"""
+
+    def __init__(self):
+        # the real Firecrawl client only has http_client on its v2 proxy
+        self.v2 = SimpleNamespace(
+            http_client=SimpleNamespace(
+                api_url="https://api.firecrawl.dev", get=self._get
+            )
+        )
+        self.polls = 0
+        self.pages = []
+
+    def _page(self, skip):
+        docs = [
+            {"markdown": f"posting {url}", "metadata": {"sourceURL": url}}
+            for url in URLS[skip : skip + 2]
+        ]
+        more = None
+        if skip + 2 < len(URLS):
+            more = f"https://api.firecrawl.dev/v2/batch/scrape/b1?skip={skip + 2}"
+        return docs, more
+
+    def start_batch_scrape(self, urls, **kwargs):
+        return SimpleNamespace(id="b1")
+
+    def get_batch_scrape_status(self, job_id):
+        self.polls += 1
+        docs, more = self._page(0)
+        return SimpleNamespace(status="completed", data=docs, next=more)
+
+    def _get(self, endpoint):
+        self.pages.append(endpoint)
+        docs, more = self._page(int(endpoint.rsplit("=", 1)[1]))
+        return _Response({"success": True, "data": docs, "next": more})
+
+
+@pytest.fixture
+def firecrawl_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "fc-test")
+    monkeypatch.setenv("SWE_SZN_CACHE_DIR", str(tmp_path / "cache"))
+    # a one-request scrape budget: a metered status poll would wait ~10s
+    monkeypatch.setenv("FIRECRAWL_RPM", "6")
+    settings.cache_clear()
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    client = PagedBatch()
+    monkeypatch.setattr(firecrawl, "_clients", {"fc-test": client})
+    yield client
+    settings.cache_clear()
+
+
+def test_scrape_jobs_follows_next_pages(firecrawl_env, tmp_path):
+    start = time.monotonic()
+    out = firecrawl.scrape_jobs(URLS, cache_dir=tmp_path / "scrapes")
+
+    assert out == {url: f"posting {url}" for url in URLS}
+    assert firecrawl_env.pages == [
+        "/v2/batch/scrape/b1?skip=2",
+        "/v2/batch/scrape/b1?skip=4",
+    ]
+    # the poll and both pages did not wait on the scrape RPM budget
+    assert time.monotonic() - start < 2
+
+
+def test_next_page_goes_through_the_real_sdk_client(monkeypatch):
+    from firecrawl import Firecrawl
+    from firecrawl.v2.utils import http_client
+
+    seen = {}
+
+    def get(url, headers=None, timeout=None):
+        seen.update(url=url, auth=headers["Authorization"])
+        return _Response({"success": True, "data": [], "next": None})
+
+    monkeypatch.setattr(http_client.requests, "get", get)
+    page = firecrawl._next_page(
+        Firecrawl(api_key="fc-test"),
+        "https://api.firecrawl.dev/v2/batch/scrape/abc?skip=8",
+    )
+
+    assert page == {"success": True, "data": [], "next": None}
+    assert seen == {
+        "url": "https://api.firecrawl.dev/v2/batch/scrape/abc?skip=8",
+        "auth": "Bearer fc-test",
+    }
+
+
+def test_cached_scrape_and_clean_count_one_hit(firecrawl_env, tmp_path):
+    from swe_szn.services.cache import md5_digest, open_store
+
+    url = URLS[0]
+    store = open_store(tmp_path / "scrapes")
+    store.put(
+        "firecrawl",
+        md5_digest(url),
+        {"url": url, "markdown": "## Requirements\n- Python"},
+    )
+
+    markdown = firecrawl.scrape_job(url, cache_dir=tmp_path / "scrapes")
+    firecrawl.clean_job(url, markdown, cache_dir=tmp_path / "scrapes")
+    firecrawl.clean_job(url, markdown, cache_dir=tmp_path / "scrapes")
+
+    assert store._take_counters()[("firecrawl", "hits")] == 1
@@ -0,0 +1,28 @@
+from swe_szn.services import jd
+
+POSTING = """# Software Engineer Intern
+
+## Requirements
+- Python and SQL in production
+- Build tools that ensure equal opportunity in hiring
+- By clicking through our internal dashboards, spot data quality issues
+- Experience with reasonable accommodation workflows is a plus
+
+We are an equal opportunity employer and consider all applicants without
+regard to race, sex or age.
+"""
+
+
+def test_requirement_bullets_survive_boilerplate_phrases():
+    cleaned, _ = jd.clean(POSTING)
+    assert "## Requirements" in cleaned
+    assert "- Python and SQL in production" in cleaned
+    assert "- Build tools that ensure equal opportunity in hiring" in cleaned
+    assert "- By clicking through our internal dashboards" in cleaned
+    assert "reasonable accommodation workflows" in cleaned
+
+
+def test_eeo_prose_paragraph_is_dropped():
+    cleaned, report = jd.clean(POSTING)
+    assert "equal opportunity employer" not in cleaned
+    assert report["boilerplate_lines"] >= 2
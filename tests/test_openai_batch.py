@@ -0,0 +1,76 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services.openai import batch
+
+STUB = Path(__file__).resolve().parents[1] / "benchmarks" / "fakes" / "openai_stub.py"
+RESUME = "Software engineering student. Python, PostgreSQL, Redis, Docker."
+
+
+def _load_stub():
+    spec = importlib.util.spec_from_file_location("openai_stub", STUB)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _posting(seed: int) -> str:
+    rng = random.Random(seed)
+    words = "design build ship python kafka redis review deploy data apis".split()
+    bullets = [" ".join(rng.choice(words) for _ in range(12)) for _ in range(8)]
+    return f"# Intern {seed}\n\n## Requirements\n\n" + "\n".join(
+        f"- {b}" for b in bullets
+    )
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    module = _load_stub()
+    server = module.serve(module.StubConfig(batch_ms=50, batch_error_every=3))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+    monkeypatch.setenv("SWE_SZN_AI_PROVIDER", "openai")
+    monkeypatch.setenv("SWE_SZN_CACHE_DIR", str(tmp_path / "cache"))
+    settings.cache_clear()
+    from openai import OpenAI
+
+    yield OpenAI(api_key="sk-test", base_url=base_url, max_retries=0)
+    server.shutdown()
+    settings.cache_clear()
+
+
+def test_submit_wait_collect_reads_output_and_error_files(stub, tmp_path):
+    items = [
+        {
+            "jd_markdown": _posting(i),
+            "resume_text": RESUME,
+            "job_url": f"https://jobs.example/{i}",
+        }
+        for i in range(3)
+    ]
+    lines, pending, cached, keys = batch.build_requests(items, cache_dir=tmp_path)
+    assert (len(lines), cached) == (3, {})
+
+    created = batch.submit(
+        batch.write_requests(lines, tmp_path / "in.jsonl"), client=stub
+    )
+    done = batch.wait(created.id, client=stub, poll_interval=0.02)
+    results, errors = batch.collect(done, pending, client=stub)
+
+    assert done.status == "completed"
+    assert done.error_file_id is not None
+    # the stub sends every third line to the error file
+    assert set(results) == set(keys[:2])
+    assert all(r["match_score"] == 72 for r in results.values())
+    assert set(errors) == {keys[2]}
+    assert "Invalid request" in errors[keys[2]]
+
+    # answered postings are cached; only the failed one would go out again
+    lines, pending, cached, _ = batch.build_requests(items, cache_dir=tmp_path)
+    assert set(cached) == set(keys[:2])
+    assert [line["custom_id"] for line in lines] == [keys[2]]
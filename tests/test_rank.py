@@ -0,0 +1,37 @@
+import time
+
+from swe_szn.services.cache import SqliteBackend
+from swe_szn.services.rank import AnalysisIndex
+
+
+def _analysis(score: int, digest=None) -> dict:
+    return {
+        "match_score": score,
+        "job": {"url": f"https://jobs.example/{score}", "title": "Intern"},
+        "_meta": {"resume_digest": digest} if digest else {},
+    }
+
+
+def test_sync_backfills_without_touching_the_cache(tmp_path):
+    store = SqliteBackend(tmp_path / "cache.sqlite3")
+    created = time.time() - 3600
+    store.put("openai", "old", _analysis(70), created_at=created)
+    store.put("openai", "new", _analysis(90, digest="d1"))
+    store.flush()
+    index = AnalysisIndex(tmp_path / "index.sqlite3")
+
+    assert index.sync(store) == (2, 0)
+
+    stats = store.stats()["openai"]
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+    (accessed,) = (
+        store._conn()
+        .execute("SELECT accessed_at FROM entries WHERE key = 'old'")
+        .fetchone()
+    )
+    assert accessed == created
+    rows = {row["key"]: row for row in index.query()}
+    assert rows["old"]["created_at"] == created
+    # analyses from before the digest was recorded never match a resume
+    assert [row["key"] for row in index.query(resume_digest="d1")] == ["new"]
+    assert index.undigested() == 1
@@ -0,0 +1,136 @@
+import time
+from email.utils import formatdate
+
+import httpx
+import openai
+import pytest
+
+from swe_szn.config import settings
+from swe_szn.services import ratelimit
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(status: int, headers=None, body=None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    return openai.APIStatusError("error", response=response, body=body)
+
+
+class Clock:
+    """stands in for `time` in ratelimit: sleeping moves the clock forward"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """two retries, no ledger writes, fresh limiters and a fake clock"""
+    monkeypatch.setenv("SWE_SZN_MAX_RETRIES", "2")
+    monkeypatch.setenv("SWE_SZN_USAGE_LEDGER", "0")
+    settings.cache_clear()
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    fake = Clock()
+    monkeypatch.setattr(ratelimit, "time", fake)
+    yield fake
+    settings.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "exc, reason",
+    [
+        (_status_error(429), "429"),
+        (_status_error(429, body={"code": "insufficient_quota"}), None),
+        (_status_error(503), "503"),
+        (_status_error(400), None),
+        (openai.APITimeoutError(request=REQUEST), "timeout"),
+        (openai.APIConnectionError(request=REQUEST), "connection"),
+        (TimeoutError(), "timeout"),
+        (ConnectionResetError(), "connection"),
+        (ValueError("bad json"), None),
+    ],
+)
+def test_classify(exc, reason):
+    assert ratelimit.classify(exc) == reason
+
+
+@pytest.mark.parametrize(
+    "headers, seconds",
+    [
+        ({"retry-after-ms": "1500", "retry-after": "9"}, 1.5),
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after": "http-date"}, 30.0),
+        ({"retry-after": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_forms(headers, seconds):
+    if headers.get("retry-after") == "http-date":
+        headers = {"retry-after": formatdate(time.time() + seconds, usegmt=True)}
+    after = ratelimit._retry_after(_status_error(429, headers=headers))
+    if seconds is None:
+        assert after is None
+    else:
+        # HTTP dates only have whole seconds
+        assert after == pytest.approx(seconds, abs=1.5)
+
+
+def test_adaptive_limit_halves_once_per_burst_then_grows_back():
+    lim = ratelimit.AdaptiveLimit(8)
+    started = time.monotonic()
+    for _ in range(8):
+        lim.acquire()
+
+    # every request of the overloaded burst comes back rate limited
+    for _ in range(8):
+        lim.release(started, ok=False, rate_limited=True)
+    assert lim.limit == 4
+
+    # four successes at limit 4, then five at limit 5
+    for _ in range(9):
+        lim.acquire()
+        lim.release(time.monotonic(), ok=True, rate_limited=False)
+    assert lim.limit == 6
+
+    # a later 429 cuts again, from the one request actually in flight
+    lim.acquire()
+    lim.release(time.monotonic(), ok=False, rate_limited=True)
+    assert lim.limit == 1
+
+
+def test_call_waits_at_least_retry_after(clock):
+    errors = [_status_error(429, headers={"retry-after": "20"}) for _ in range(2)]
+
+    def fn():
+        if errors:
+            raise errors.pop()
+        return "ok"
+
+    assert ratelimit.call("openai", fn) == "ok"
+    # full jitter is at most 1s and 2s here, so retry-after wins both times
+    assert [s for s in clock.sleeps if s] == [20.0, 20.0]
+    assert clock.now == 1040.0
+
+
+def test_call_gives_up_after_max_retries(clock):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise _status_error(503)
+
+    with pytest.raises(openai.APIStatusError):
+        ratelimit.call("openai", fn)
+    assert len(calls) == 3  # the first try and SWE_SZN_MAX_RETRIES=2 retries
+    assert ratelimit.limiter("openai").in_flight.active == 0
@@ -0,0 +1,13 @@
+from swe_szn.services import budget, resume
+
+PAGES = [
+    "Jane  Doe\njane@example.com\n\nEXPERIENCE\nPayments   service in Python\n",
+    "EDUCATION\nBSc Computer Science\n\nSKILLS\nPython, Go, SQL\n",
+]
+
+
+def test_pdf_text_keeps_lines_so_resume_sections_are_found():
+    text = resume._tidy(PAGES)
+    assert "Payments service in Python" in text
+    headings = [heading for heading, _ in budget.split_sections(text)]
+    assert headings == ["", "EXPERIENCE", "EDUCATION", "SKILLS"]
@@ -0,0 +1,46 @@
+import pytest
+
+from swe_szn.services.triage import find_skills
+
+
+@pytest.mark.parametrize(
+    "text, skills",
+    [
+        ("Node.js and Express.js services", {"Node.js", "Express"}),
+        ("react to incidents on call", set()),
+        ("write lambda functions in Python", {"Python"}),
+        ("AWS Lambda and DynamoDB", {"AWS", "DynamoDB"}),
+        ("Built UIs in React and TypeScript", {"React", "TypeScript"}),
+        ("Reactor pattern, ReactJS", {"React"}),
+        ("JS, HTML and CSS", {"JavaScript", "HTML", "CSS"}),
+    ],
+)
+def test_ambiguous_aliases_need_an_unambiguous_form(text, skills):
+    assert find_skills(text) == skills
+
+
+def test_skipped_result_exports_to_markdown(monkeypatch, tmp_path):
+    """`analyze-job --triage --export md` on a posting triage skips"""
+    from typer.testing import CliRunner
+
+    from swe_szn import analyze
+    from swe_szn.cli import app
+    from swe_szn.services import triage
+
+    def run(url, resume_path, *, triage_min, **kwargs):
+        pre = triage.score("Python, SQL", "## Requirements\nRust, Kubernetes, Go")
+        pre["_meta"]["triage"] = triage.outcome(pre, triage_min)
+        return pre
+
+    monkeypatch.setattr(analyze, "run", run)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "resume.pdf").write_bytes(b"")
+    result = CliRunner().invoke(
+        app,
+        ["analyze-job", "resume.pdf", "https://jobs.example/1", "--triage-min", "90"]
+        + ["--export", "md"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "skipped the LLM analysis" in result.output
+    assert len(list((tmp_path / "outputs").glob("analysis_*.md"))) == 1